@@ -0,0 +1,278 @@
+"""
+Local stand-in for the Safe Transaction Service, implementing the endpoints used by `TransactionService`:
+ - GET /api/v1/safes/<address>/balances/
+ - GET and POST /api/v1/safes/<address>/multisig-transactions/
+ - GET and POST /api/v1/safes/<address>/delegates/, DELETE /api/v1/safes/<address>/delegates/<delegate>/
+
+Latency and errors can be injected, so clients can be benchmarked and tested without using the real service.
+
+Usage: python -m benchmarks.fake_transaction_service --port 8000 --latency 0.05 --error-rate 0.01
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Collection, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+SAFES_PATH_REGEX = re.compile(r'^/api/v1/safes/(?P<address>0x[0-9a-fA-F]{40})/(?P<resource>balances|'
+                              r'multisig-transactions|delegates)/(?:(?P<delegate>0x[0-9a-fA-F]{40})/)?$')
+
+
+class FakeTransactionServiceState:
+    """
+    In memory data of the fake service. Safes are created on first use with `number_transactions` executed
+    transactions and `number_tokens` ERC20 balances
+    """
+    def __init__(self, number_transactions: int = 50, number_tokens: int = 10):
+        self.number_transactions = number_transactions
+        self.number_tokens = number_tokens
+        self.lock = threading.Lock()
+        self.transactions: Dict[str, List[Dict[str, Any]]] = {}
+        self.delegates: Dict[str, List[Dict[str, Any]]] = {}
+
+    @staticmethod
+    def build_address(seed: str) -> str:
+        return '0x' + hashlib.sha256(seed.encode()).hexdigest()[:40]
+
+    def get_transactions(self, safe_address: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            if safe_address not in self.transactions:
+                self.transactions[safe_address] = [
+                    {
+                        'safe': safe_address,
+                        'to': self.build_address(f'to-{nonce}'),
+                        'value': str(nonce),
+                        'data': None,
+                        'operation': 0,
+                        'nonce': nonce,
+                        'submissionDate': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(1600000000 + nonce * 60)),
+                        'transactionHash': '0x' + hashlib.sha256(f'{safe_address}{nonce}'.encode()).hexdigest(),
+                        'safeTxHash': '0x' + hashlib.sha256(f'safe-tx-{safe_address}{nonce}'.encode()).hexdigest(),
+                        'isExecuted': True,
+                        'isSuccessful': True,
+                        'dataDecoded': None,
+                    } for nonce in reversed(range(self.number_transactions))
+                ]
+            return self.transactions[safe_address]
+
+    def add_transaction(self, safe_address: str, data: Dict[str, Any]):
+        transactions = self.get_transactions(safe_address)
+        with self.lock:
+            transactions.insert(0, {
+                'safe': safe_address,
+                'to': data['to'],
+                'value': str(data['value']),
+                'data': data.get('data'),
+                'operation': data['operation'],
+                'nonce': data['nonce'],
+                'submissionDate': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'transactionHash': None,
+                'safeTxHash': data['contractTransactionHash'],
+                'isExecuted': False,
+                'isSuccessful': None,
+                'dataDecoded': None,
+            })
+
+    def get_balances(self, safe_address: str) -> List[Dict[str, Any]]:
+        balances = [{'tokenAddress': None, 'token': None, 'balance': str(10 ** 18)}]
+        for i in range(self.number_tokens):
+            balances.append({
+                'tokenAddress': self.build_address(f'token-{i}'),
+                'token': {'name': f'Token {i}', 'symbol': f'TK{i}', 'decimals': 18},
+                'balance': str((i + 1) * 10 ** 18),
+            })
+        return balances
+
+    def get_delegates(self, safe_address: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            return self.delegates.setdefault(safe_address, [])
+
+
+class FakeTransactionServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, as the real service
+    server: 'FakeTransactionServiceServer'
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def send_json(self, status_code: int, data: Optional[Any] = None):
+        body = json.dumps(data).encode() if data is not None else b''
+        etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+        if status_code == 200 and self.headers.get('If-None-Match') == etag:
+            status_code, body = 304, b''
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status_code in (200, 304):
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def inject_faults(self) -> bool:
+        """
+        :return: `True` if an error was sent and the request must not be processed
+        """
+        server = self.server
+        with server.lock:
+            request_number = server.requests_received
+            server.requests_received += 1
+            latency = max(0., server.random.gauss(server.latency, server.latency_stddev)) if server.latency else 0.
+            rate_limited = bool(server.rate_limit_rate) and server.random.random() < server.rate_limit_rate
+            failed = (request_number in server.error_requests
+                      or (bool(server.error_rate) and server.random.random() < server.error_rate))
+        if latency:
+            time.sleep(latency)
+        if rate_limited:
+            self.send_json(429, {'detail': 'Request was throttled'})
+            return True
+        if failed:
+            self.send_json(503, {'detail': 'Service unavailable'})
+            return True
+        return False
+
+    def parse_path(self) -> Tuple[Optional[re.Match], Dict[str, List[str]]]:
+        parsed_url = urlparse(self.path)
+        return SAFES_PATH_REGEX.match(parsed_url.path), parse_qs(parsed_url.query)
+
+    def do_GET(self):
+        self.read_json()
+        if self.inject_faults():
+            return
+        match, query = self.parse_path()
+        if not match or match.group('delegate'):
+            return self.send_json(404, {'detail': 'Not found'})
+
+        safe_address, resource = match.group('address'), match.group('resource')
+        state = self.server.state
+        if resource == 'balances':
+            return self.send_json(200, state.get_balances(safe_address))
+        elif resource == 'delegates':
+            delegates = state.get_delegates(safe_address)
+            return self.send_json(200, {'count': len(delegates), 'next': None, 'previous': None,
+                                        'results': delegates})
+        else:
+            transactions = state.get_transactions(safe_address)
+            offset = int(query.get('offset', ['0'])[0])
+            limit = int(query.get('limit', [str(self.server.page_size)])[0])
+            next_url = None
+            if offset + limit < len(transactions):
+                next_url = (f'http://{self.headers["Host"]}/api/v1/safes/{safe_address}/multisig-transactions/'
+                            f'?limit={limit}&offset={offset + limit}')
+            return self.send_json(200, {'count': len(transactions), 'next': next_url, 'previous': None,
+                                        'results': transactions[offset:offset + limit]})
+
+    def do_POST(self):
+        data = self.read_json()
+        if self.inject_faults():
+            return
+        match, _ = self.parse_path()
+        if not match or match.group('delegate') or match.group('resource') == 'balances':
+            return self.send_json(404, {'detail': 'Not found'})
+
+        safe_address, resource = match.group('address'), match.group('resource')
+        if resource == 'delegates':
+            delegates = self.server.state.get_delegates(safe_address)
+            with self.server.state.lock:
+                delegates.append({'safe': safe_address, 'delegate': data['delegate'],
+                                  'delegator': self.server.state.build_address(data['signature']),
+                                  'label': data['label']})
+        else:
+            self.server.state.add_transaction(safe_address, data)
+        return self.send_json(201)
+
+    def do_DELETE(self):
+        self.read_json()
+        if self.inject_faults():
+            return
+        match, _ = self.parse_path()
+        if not match or match.group('resource') != 'delegates' or not match.group('delegate'):
+            return self.send_json(404, {'detail': 'Not found'})
+
+        delegates = self.server.state.get_delegates(match.group('address'))
+        with self.server.state.lock:
+            delegates[:] = [delegate for delegate in delegates if delegate['delegate'] != match.group('delegate')]
+        return self.send_json(204)
+
+
+class FakeTransactionServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0., latency_stddev: float = 0.,
+                 error_rate: float = 0., rate_limit_rate: float = 0., page_size: int = 20,
+                 state: Optional[FakeTransactionServiceState] = None, seed: Optional[int] = None,
+                 error_requests: Collection[int] = ()):
+        """
+        :param host:
+        :param port: `0` to use a random free port
+        :param latency: Mean latency in seconds added to every request
+        :param latency_stddev: Standard deviation of the latency
+        :param error_rate: Ratio of requests answered with `503`
+        :param rate_limit_rate: Ratio of requests answered with `429`
+        :param page_size: Default page size for `multisig-transactions`
+        :param state:
+        :param seed: Seed for latencies and injected errors, so runs can be reproduced
+        :param error_requests: Numbers of the requests (starting on `0`) answered with `503`, whatever the
+            `error_rate`
+        """
+        super().__init__((host, port), FakeTransactionServiceHandler)
+        self.latency = latency
+        self.latency_stddev = latency_stddev
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.page_size = page_size
+        self.state = state or FakeTransactionServiceState()
+        self.random = random.Random(seed)
+        self.error_requests = set(error_requests)
+        self.requests_received = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'FakeTransactionServiceServer':
+        """
+        Serve on a daemon thread
+        """
+        threading.Thread(target=self.serve_forever, name='fake-transaction-service', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fake Safe Transaction Service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0., help='Mean latency in seconds')
+    parser.add_argument('--latency-stddev', type=float, default=0.)
+    parser.add_argument('--error-rate', type=float, default=0., help='Ratio of 503 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0., help='Ratio of 429 responses')
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--transactions', type=int, default=50, help='Transactions for every Safe')
+    parser.add_argument('--tokens', type=int, default=10, help='Token balances for every Safe')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for latencies and errors')
+    args = parser.parse_args()
+
+    server = FakeTransactionServiceServer(args.host, args.port, latency=args.latency,
+                                          latency_stddev=args.latency_stddev, error_rate=args.error_rate,
+                                          rate_limit_rate=args.rate_limit_rate, page_size=args.page_size,
+                                          state=FakeTransactionServiceState(args.transactions, args.tokens),
+                                          seed=args.seed)
+    print(f'Fake Safe Transaction Service listening on {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,110 @@
+"""
+Measure the per-keystroke latency of the prompt without a terminal: typed sessions are replayed one character at a
+time, and for every keystroke the line is lexed (`--renders` times, as the prompt renders again on completions,
+cursor moves and toolbar updates), completions are retrieved and the bottom toolbar is built. Cached data
+(owners, tokens and loaded accounts) grows with `--cached-values` to check latency stays flat.
+
+Lexer is measured with and without its line cache, the rest of the pipeline is the same for both.
+
+Usage: python -m benchmarks.keystroke_benchmark --sessions 20 --cached-values 100 --renders 3
+"""
+import argparse
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+from eth_account import Account
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+from prompt_toolkit.formatted_text import to_formatted_text
+from prompt_toolkit.lexers import PygmentsLexer
+
+from safe_cli.safe_cli_info import SafeCliInfo
+from safe_cli.safe_cli_prompt import SafeCli
+from safe_cli.safe_completer import ArgumentSuggestions, SafeCompleter
+from safe_cli.safe_lexer import SafeLexer
+
+BENCHMARK_SAFE_ADDRESS = '0x7552Ed65a45E27740a15B8D5415E90d8ca64C109'
+
+
+class NoCacheSafeLexer(SafeLexer):
+    def __init__(self, **options):
+        super().__init__(cache_size=0, **options)
+
+
+def build_sessions(number_sessions: int, owners: List[str], token_addresses: List[str]) -> List[str]:
+    sessions = []
+    for i in range(number_sessions):
+        owner = owners[i % len(owners)]
+        token_address = token_addresses[i % len(token_addresses)]
+        sessions.extend([
+            f'remove_owner {owner} --threshold 1',
+            f'send_erc20 {Account.create().address} {token_address} 1000000000000000000 --safe-nonce {i}',
+            f'approve_hash 0x{"ab" * 32} {owner}',
+            f'send_ether safe-{i}.eth 123',
+            'get_owners',
+        ])
+    return sessions
+
+
+def replay(sessions: List[str], lexer: PygmentsLexer, completer: SafeCompleter, toolbar_owner: SimpleNamespace,
+           renders: int) -> Dict[str, List[float]]:
+    """
+    :return: Latencies in seconds of every keystroke, for every step of the pipeline and the `total`
+    """
+    latencies = {'lexer': [], 'completer': [], 'toolbar': [], 'total': []}
+    complete_event = CompleteEvent(text_inserted=True)
+    for session in sessions:
+        for position in range(1, len(session) + 1):
+            document = Document(session[:position])
+            start = time.perf_counter()
+            for _ in range(renders):
+                lexer.lex_document(document)(0)
+            lexed = time.perf_counter()
+            list(completer.get_completions(document, complete_event))
+            completed = time.perf_counter()
+            to_formatted_text(SafeCli.get_bottom_toolbar(toolbar_owner))
+            end = time.perf_counter()
+            for step, latency in (('lexer', lexed - start), ('completer', completed - lexed),
+                                  ('toolbar', end - completed), ('total', end - start)):
+                latencies[step].append(latency)
+    return latencies
+
+
+def print_latencies(name: str, latencies: List[float]):
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    print(f'{name:<36} keystrokes={len(latencies):<7} p50={percentiles[49] * 1000:>7.3f}ms '
+          f'p99={percentiles[98] * 1000:>7.3f}ms max={max(latencies) * 1000:>7.3f}ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark safe-cli per-keystroke latency')
+    parser.add_argument('--sessions', type=int, default=20, help='Every session is 5 typed commands')
+    parser.add_argument('--cached-values', type=int, default=100,
+                        help='Number of owners, tokens and loaded accounts suggested by the completer')
+    parser.add_argument('--renders', type=int, default=3, help='Times the line is lexed for every keystroke')
+    args = parser.parse_args()
+
+    owners = [Account.create().address for _ in range(args.cached_values)]
+    token_addresses = [Account.create().address for _ in range(args.cached_values)]
+    accounts = {Account.create() for _ in range(args.cached_values)}
+    completer = SafeCompleter({
+        'owners': ArgumentSuggestions(lambda: owners),
+        'token_addresses': ArgumentSuggestions(lambda: token_addresses),
+        'accounts': ArgumentSuggestions(lambda: accounts, to_text=lambda account: account.address),
+    })
+    snapshot = SafeCliInfo(BENCHMARK_SAFE_ADDRESS, 5, 2, owners, BENCHMARK_SAFE_ADDRESS, [],
+                           BENCHMARK_SAFE_ADDRESS, BENCHMARK_SAFE_ADDRESS, 1, '1.3.0', block_number=1)
+    toolbar_owner = SimpleNamespace(network_name='MAINNET', safe_cli_info_watcher=SimpleNamespace(snapshot=snapshot),
+                                    bottom_toolbar=None)
+    sessions = build_sessions(args.sessions, owners, token_addresses)
+
+    for name, lexer_class in (('lexer without cache', NoCacheSafeLexer), ('lexer with line cache', SafeLexer)):
+        latencies = replay(sessions, PygmentsLexer(lexer_class), completer, toolbar_owner, args.renders)
+        for step, step_latencies in latencies.items():
+            print_latencies(f'{name} - {step}', step_latencies)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Measure the time to first prompt of safe-cli: importing the modules, building `SafeCli` and printing the startup
+information (`SafeCli.print_startup_info`). `eager` builds every dependency of the operator like it was done on
+`__init__` before they were lazy, so both can be compared against the same node.
+
+Entry points are measured without node, parsing the arguments and exiting, together with the modules taking
+longer to import (`-X importtime`). With `--check`, exit code is 1 if an entry point goes over its budget.
+
+Usage: python -m benchmarks.startup_benchmark [<safe_address> <node_url>] --runs 5 [--check]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, List, Tuple
+
+EAGER_DEPENDENCIES = ('ethereum_client', 'ens', 'network', 'etherscan', 'safe_relay_service', 'safe_tx_service',
+                      'safe', 'safe_contract', 'safe_contract_1_1_0')
+
+
+# Milliseconds for the median run. Entry points must not import web3, gnosis-py or prompt_toolkit to parse arguments
+ENTRY_POINT_BUDGETS = {
+    ('safe_cli.py', '--help'): 400,
+    ('safe_daemon.py', '--help'): 150,
+    ('safe_creator.py', '--help'): 400,
+}
+IMPORTED_MODULE = 'safe_cli.safe_cli_prompt'  # Every module needed by the prompt
+
+
+def measure(function: Callable[[], None], runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_import(module: str, runs: int) -> List[float]:
+    """
+    Every run uses a new interpreter, as modules are cached after the first import
+    """
+    return measure(lambda: subprocess.run([sys.executable, '-c', f'import {module}'], check=True), runs)
+
+
+def measure_entry_point(argv: Tuple[str, ...], runs: int) -> List[float]:
+    return measure(lambda: subprocess.run([sys.executable, *argv], check=True, stdout=subprocess.DEVNULL), runs)
+
+
+def get_import_times(module: str) -> List[Tuple[str, int, int]]:
+    """
+    :param module:
+    :return: List of module name, self and cumulative import time in microseconds, slowest first
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], check=True,
+                             stderr=subprocess.PIPE, text=True)
+    import_times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative_time, name = line[len('import time:'):].split('|')
+        import_times.append((name.strip(), int(self_time), int(cumulative_time)))
+    return sorted(import_times, key=lambda import_time: import_time[1], reverse=True)
+
+
+def print_timings(name: str, timings: List[float]):
+    print(f'{name:<32} median={statistics.median(timings) * 1000:>9.1f}ms '
+          f'min={min(timings) * 1000:>9.1f}ms max={max(timings) * 1000:>9.1f}ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark safe-cli startup')
+    parser.add_argument('safe_address', nargs='?')
+    parser.add_argument('node_url', nargs='?')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--check', action='store_true', help='Fail if an entry point goes over its budget')
+    args = parser.parse_args()
+
+    print_timings('python startup', measure_import('sys', args.runs))
+    over_budget = []
+    for argv, budget in ENTRY_POINT_BUDGETS.items():
+        timings = measure_entry_point(argv, args.runs)
+        print_timings(' '.join(argv), timings)
+        if statistics.median(timings) * 1000 > budget:
+            over_budget.append(f'{" ".join(argv)} is over its budget of {budget}ms')
+
+    print_timings(f'import {IMPORTED_MODULE}', measure_import(IMPORTED_MODULE, args.runs))
+    print(f'Slowest modules importing {IMPORTED_MODULE} (self time):')
+    for name, self_time, cumulative_time in get_import_times(IMPORTED_MODULE)[:10]:
+        print(f'    {name:<48} self={self_time / 1000:>7.1f}ms cumulative={cumulative_time / 1000:>7.1f}ms')
+
+    for message in over_budget:
+        print(message, file=sys.stderr)
+    if args.check and over_budget:
+        sys.exit(1)
+    if not args.node_url:
+        return
+
+    from prompt_toolkit.application import create_app_session
+    from prompt_toolkit.input import DummyInput
+    from prompt_toolkit.output import DummyOutput
+
+    from safe_cli.safe_cli_prompt import SafeCli
+
+    def startup(eager: bool):
+        # Same path as the prompt until it's shown: banner, Safe information, ens domain, urls of the services and
+        # Etherscan and the version check. Output is discarded, the terminal is not measured
+        with create_app_session(input=DummyInput(), output=DummyOutput()):
+            safe_cli = SafeCli(args.safe_address, args.node_url)
+            if eager:
+                for dependency in EAGER_DEPENDENCIES:
+                    getattr(safe_cli.safe_operator, dependency)
+            safe_cli.print_startup_info()
+            safe_cli.safe_cli_info_watcher.stop()
+
+    print_timings('first prompt (lazy)', measure(lambda: startup(False), args.runs))
+    print_timings('first prompt (eager)', measure(lambda: startup(True), args.runs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Load generation for the Safe Transaction Service clients. A `FakeTransactionServiceServer` is started (unless
+`--url` is provided) and `TransactionService` is driven by N concurrent clients, reporting requests/sec and
+p50/p99 latencies for every scenario. `SafeTxServiceOperator` commands are benchmarked too if `--node-url` and
+`--safe-address` are provided, as the operator needs a node to load the Safe.
+
+Usage: python -m benchmarks.transaction_service_benchmark --clients 16 --requests 50 --latency 0.02
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from gnosis.eth.ethereum_client import EthereumNetwork
+
+from safe_cli.api.gnosis_transaction import TransactionService
+
+from .fake_transaction_service import FakeTransactionServiceServer
+
+BENCHMARK_SAFE_ADDRESS = '0x7552Ed65a45E27740a15B8D5415E90d8ca64C109'
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    clients: int
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: List[float]
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.
+
+    def percentile(self, percentile: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.
+        return statistics.quantiles(self.latencies, n=100, method='inclusive')[percentile - 1]
+
+    def __str__(self):
+        return (f'{self.name:<24} clients={self.clients:<4} requests={self.requests:<6} errors={self.errors:<4} '
+                f'req/s={self.requests_per_second:>9.1f} p50={self.percentile(50) * 1000:>8.2f}ms '
+                f'p99={self.percentile(99) * 1000:>8.2f}ms')
+
+
+def run_benchmark(name: str, operation: Callable[[int], None], clients: int, requests: int) -> BenchmarkResult:
+    """
+    :param name: Scenario name
+    :param operation: Called with the number of the client for every request
+    :param clients: Number of concurrent clients (threads)
+    :param requests: Requests done by every client
+    :return: BenchmarkResult
+    """
+    def client(client_number: int) -> List[Optional[float]]:
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                operation(client_number)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                latencies.append(None)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(client, range(clients)))
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [latency for latencies in results for latency in latencies]
+    successful_latencies = sorted(latency for latency in all_latencies if latency is not None)
+    return BenchmarkResult(name, clients, len(all_latencies), len(all_latencies) - len(successful_latencies),
+                           elapsed, successful_latencies)
+
+
+def get_transaction_service_scenarios(base_url: str, safe_address: str) -> Dict[str, Callable[[int], None]]:
+    transaction_service = TransactionService(EthereumNetwork.MAINNET, base_url=base_url)
+
+    def post_transaction(client_number: int):
+        nonce = int(time.time() * 1e6)
+        response = transaction_service._post_request(
+            f'/api/v1/safes/{safe_address}/multisig-transactions/',
+            {'to': safe_address, 'value': 0, 'data': None, 'operation': 0, 'nonce': nonce,
+             'contractTransactionHash': f'0x{client_number:08x}{nonce:056x}'}
+        )
+        response.raise_for_status()
+
+    return {
+        'balances': lambda _: transaction_service.get_balances(safe_address),
+        'transactions (all pages)': lambda _: transaction_service.get_transactions(safe_address),
+        'delegates': lambda _: transaction_service.get_delegates(safe_address),
+        'post transaction': post_transaction,
+    }
+
+
+def get_operator_scenarios(base_url: str, safe_address: str, node_url: str) -> Dict[str, Callable[[int], None]]:
+    from safe_cli.safe_tx_service_operator import SafeTxServiceOperator
+
+    safe_operator = SafeTxServiceOperator(safe_address, node_url)
+    safe_operator.safe_tx_service = TransactionService(safe_operator.network, base_url=base_url)
+
+    def silent(operation: Callable[[], None]) -> Callable[[int], None]:
+        def wrapper(_: int):
+            with contextlib.redirect_stdout(io.StringIO()):
+                operation()
+        return wrapper
+
+    return {
+        'operator balances': silent(safe_operator.get_balances),
+        'operator history': silent(safe_operator.get_transaction_history),
+        'operator delegates': silent(safe_operator.get_delegates),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Safe Transaction Service clients')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16], help='Concurrent clients to test')
+    parser.add_argument('--requests', type=int, default=50, help='Requests per client')
+    parser.add_argument('--url', help='Use an already running service instead of starting a fake one')
+    parser.add_argument('--latency', type=float, default=0.01, help='Mean latency of the fake service in seconds')
+    parser.add_argument('--error-rate', type=float, default=0., help='Ratio of 503 responses of the fake service')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.,
+                        help='Ratio of 429 responses of the fake service')
+    parser.add_argument('--safe-address', default=BENCHMARK_SAFE_ADDRESS)
+    parser.add_argument('--node-url', help='Ethereum node url, required to benchmark SafeTxServiceOperator')
+    parser.add_argument('--cache', action='store_true', help='Use the response cache (disabled by default)')
+    args = parser.parse_args()
+
+    if not args.cache:
+        os.environ['SAFE_CLI_DISABLE_CACHE'] = '1'
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = FakeTransactionServiceServer(latency=args.latency, latency_stddev=args.latency / 4,
+                                              error_rate=args.error_rate,
+                                              rate_limit_rate=args.rate_limit_rate).start()
+        base_url = server.url
+
+    try:
+        scenarios = get_transaction_service_scenarios(base_url, args.safe_address)
+        if args.node_url:
+            scenarios.update(get_operator_scenarios(base_url, args.safe_address, args.node_url))
+
+        print(f'Benchmarking {base_url}')
+        for name, operation in scenarios.items():
+            for clients in args.clients:
+                print(run_benchmark(name, operation, clients, args.requests))
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import random
+import weakref
+from abc import ABC
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urljoin
+
+import aiohttp
+
+from gnosis.eth.ethereum_client import EthereumNetwork
+
+from .base_api import BaseAPI
+
+
+class AsyncAPIResponse(NamedTuple):
+    """
+    Response already read from the connection, exposing the subset of `requests.Response` used by the clients
+    """
+    status_code: int
+    content: bytes
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncBaseAPI(ABC):
+    """
+    Asyncio counterpart of `BaseAPI`. Every request goes through a pooled `aiohttp.ClientSession` and at most
+    `MAX_CONCURRENCY` requests are in flight at the same time for a client. Retry settings are the same of `BaseAPI`
+    """
+    URL_BY_NETWORK: Dict[EthereumNetwork, str] = {}
+    POOL_SIZE: int = BaseAPI.POOL_SIZE
+    MAX_CONCURRENCY: int = BaseAPI.POOL_SIZE
+    TIMEOUT: float = 30
+    RETRIES: int = BaseAPI.RETRIES
+    RETRY_BACKOFF_FACTOR: float = BaseAPI.RETRY_BACKOFF_FACTOR
+    RETRY_BACKOFF_JITTER: float = BaseAPI.RETRY_BACKOFF_JITTER
+    RETRY_STATUS_CODES = BaseAPI.RETRY_STATUS_CODES
+    _open_clients: 'weakref.WeakSet[AsyncBaseAPI]' = weakref.WeakSet()  # Clients with a session to close
+
+    def __init__(self, network: EthereumNetwork, max_concurrency: Optional[int] = None,
+                 base_url: Optional[str] = None):
+        self.network = network
+        self.base_url = base_url or self.URL_BY_NETWORK[network]
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        # Session and semaphore are bound to the event loop, they are created on first use
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_network_number(cls, network: int) -> Optional['AsyncBaseAPI']:
+        ethereum_network = EthereumNetwork(network)
+        if ethereum_network in cls.URL_BY_NETWORK:
+            return cls(ethereum_network)
+
+    @property
+    def http_session(self) -> aiohttp.ClientSession:
+        if not self._http_session or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.POOL_SIZE),
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = asyncio.get_event_loop()
+            AsyncBaseAPI._open_clients.add(self)
+        return self._http_session
+
+    async def close(self):
+        if self._http_session:
+            await self._http_session.close()
+            self._http_session = None
+        AsyncBaseAPI._open_clients.discard(self)
+
+    @classmethod
+    async def close_all(cls):
+        """
+        Close the sessions of every client opened on the running event loop, so `aiohttp` doesn't warn about
+        unclosed sessions on exit
+        """
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(*[client.close() for client in list(AsyncBaseAPI._open_clients)
+                               if client._loop is loop])
+
+    async def _request(self, method: str, url: str, retry: bool, **kwargs) -> AsyncAPIResponse:
+        """
+        :param method: HTTP method
+        :param url: Relative or absolute url
+        :param retry: Retry with jittered exponential backoff on `RETRY_STATUS_CODES` and connection errors
+        :param kwargs: Passed to `aiohttp.ClientSession.request`
+        :return: Response
+        """
+        full_url = urljoin(self.base_url, url)
+        http_session = self.http_session
+        for attempt in range(self.RETRIES + 1 if retry else 1):
+            if attempt:
+                await asyncio.sleep(self.RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1))
+                                    + random.uniform(0, self.RETRY_BACKOFF_JITTER))
+            try:
+                async with self._semaphore:
+                    async with http_session.request(method, full_url, **kwargs) as response:
+                        api_response = AsyncAPIResponse(response.status, await response.read())
+            except aiohttp.ClientConnectionError:
+                if not retry or attempt == self.RETRIES:
+                    raise
+                continue
+            if api_response.status_code not in self.RETRY_STATUS_CODES:
+                break
+        return api_response
+
+    async def _get_request(self, url: str, params: Optional[Dict] = None) -> AsyncAPIResponse:
+        return await self._request('GET', url, True, params=params)
+
+    async def _post_request(self, url: str, payload: Dict) -> AsyncAPIResponse:
+        # POST is never retried, as it could send the same transaction twice
+        return await self._request('POST', url, False, json=payload)
+
+    async def _delete_request(self, url: str, payload: Dict) -> AsyncAPIResponse:
+        return await self._request('DELETE', url, True, json=payload)
@@ -0,0 +1,6 @@
+from .async_base_api import AsyncBaseAPI
+from .etherscan import Etherscan
+
+
+class AsyncEtherscan(AsyncBaseAPI):
+    URL_BY_NETWORK = Etherscan.URL_BY_NETWORK
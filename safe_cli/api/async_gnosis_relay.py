@@ -0,0 +1,28 @@
+from gnosis.safe import SafeTx
+
+from .async_base_api import AsyncBaseAPI
+from .base_api import BaseAPIException
+from .gnosis_relay import RelayEstimation, RelaySentTransaction, RelayService
+
+
+class AsyncRelayService(AsyncBaseAPI):
+    """
+    Asyncio counterpart of `RelayService`
+    """
+    URL_BY_NETWORK = RelayService.URL_BY_NETWORK
+
+    async def send_transaction(self, safe_address: str, safe_tx: SafeTx) -> RelaySentTransaction:
+        data = RelayService.build_transaction_payload(safe_tx)
+        response = await self._post_request(f'/api/v1/safes/{safe_address}/transactions/', data)
+        if not response.ok:
+            raise BaseAPIException(f'Error posting transaction: {response.content}')
+        else:
+            return RelaySentTransaction(response.json())
+
+    async def get_estimation(self, safe_address: str, safe_tx: SafeTx) -> RelayEstimation:
+        data = RelayService.build_estimation_payload(safe_tx)
+        response = await self._post_request(f'/api/v2/safes/{safe_address}/transactions/estimate/', data)
+        if not response.ok:
+            raise BaseAPIException(f'Error posting transaction: {response.content}')
+        else:
+            return RelayService.parse_estimation(response.json())
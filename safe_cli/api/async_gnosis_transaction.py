@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from eth_account.signers.local import LocalAccount
+
+from gnosis.safe import SafeTx
+
+from .async_base_api import AsyncBaseAPI
+from .base_api import BaseAPIException
+from .gnosis_transaction import TransactionService
+
+
+class AsyncTransactionService(AsyncBaseAPI):
+    """
+    Asyncio counterpart of `TransactionService`
+    """
+    URL_BY_NETWORK = TransactionService.URL_BY_NETWORK
+
+    async def get_balances(self, safe_address: str) -> List[Dict[str, Any]]:
+        response = await self._get_request(f'/api/v1/safes/{safe_address}/balances/')
+        if not response.ok:
+            raise BaseAPIException(f'Cannot get balances: {response.content}')
+        else:
+            return response.json()
+
+    async def iter_transactions(self, safe_address: str, min_nonce: Optional[int] = None,
+                                since: Optional[datetime] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Same as `TransactionService.iter_transactions`, without the page prefetching
+        """
+        next_url = f'/api/v1/safes/{safe_address}/multisig-transactions/'
+        while next_url:
+            response = await self._get_request(next_url)
+            if not response.ok:
+                raise BaseAPIException(f'Cannot get transactions: {response.content}')
+            response_json = response.json()
+            next_url = response_json.get('next')
+            for transaction in response_json.get('results', []):
+                if min_nonce is not None and transaction['nonce'] < min_nonce:
+                    return
+                if since and TransactionService.parse_date(transaction['submissionDate']) < since:
+                    return
+                yield transaction
+
+    async def get_transactions(self, safe_address: str, **kwargs) -> List[Dict[str, Any]]:
+        return [transaction async for transaction in self.iter_transactions(safe_address, **kwargs)]
+
+    async def get_delegates(self, safe_address: str) -> List[Dict[str, Any]]:
+        response = await self._get_request(f'/api/v1/safes/{safe_address}/delegates/')
+        if not response.ok:
+            raise BaseAPIException(f'Cannot get delegates: {response.content}')
+        else:
+            return response.json().get('results', [])
+
+    async def add_delegate(self, safe_address: str, delegate_address: str, label: str,
+                           signer_account: LocalAccount):
+        add_payload = TransactionService.build_add_delegate_payload(safe_address, delegate_address, label,
+                                                                    signer_account)
+        response = await self._post_request(f'/api/v1/safes/{safe_address}/delegates/', add_payload)
+        if not response.ok:
+            raise BaseAPIException(f'Cannot add delegate: {response.content}')
+
+    async def remove_delegate(self, safe_address: str, delegate_address: str, signer_account: LocalAccount):
+        remove_payload = TransactionService.build_remove_delegate_payload(delegate_address, signer_account)
+        response = await self._delete_request(f'/api/v1/safes/{safe_address}/delegates/{delegate_address}/',
+                                              remove_payload)
+        if not response.ok:
+            raise BaseAPIException(f'Cannot remove delegate: {response.content}')
+
+    async def post_transaction(self, safe_address: str, safe_tx: SafeTx):
+        data = TransactionService.build_transaction_payload(safe_tx)
+        response = await self._post_request(f'/api/v1/safes/{safe_address}/multisig-transactions/', data)
+        if not response.ok:
+            raise BaseAPIException(f'Error posting transaction: {response.content}')
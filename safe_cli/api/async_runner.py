@@ -0,0 +1,65 @@
+import asyncio
+import atexit
+import threading
+from typing import Any, Awaitable, Iterable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class AsyncRunner:
+    """
+    Sync facade for the asyncio clients. Coroutines run on an event loop living on a daemon thread, so synchronous
+    code like `SafeOperator` can fan out requests, and pooled connections are kept warm between calls
+    """
+    _default: Optional['AsyncRunner'] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='safe-cli-async-runner', daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def get_default(cls) -> 'AsyncRunner':
+        with cls._default_lock:
+            if not cls._default or not cls._default.is_running:
+                cls._default = cls()
+                atexit.register(cls._default.shutdown)
+            return cls._default
+
+    @property
+    def is_running(self) -> bool:
+        return self.thread.is_alive() and not self.loop.is_closed()
+
+    def shutdown(self):
+        """
+        Close the sessions of the clients used on the loop, then stop the loop and its thread. Calling it again
+        does nothing
+        """
+        if not self.is_running:
+            return
+        # Runner doesn't depend on aiohttp otherwise
+        from .async_base_api import AsyncBaseAPI
+        try:
+            self.run(AsyncBaseAPI.close_all())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+
+    def run(self, coroutine: Awaitable[T]) -> T:
+        """
+        :param coroutine:
+        :return: Result of the coroutine, blocking until it's done
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def gather(self, coroutines: Iterable[Awaitable], return_exceptions: bool = False) -> List[Any]:
+        """
+        :param coroutines: Run concurrently
+        :param return_exceptions: If `True` exceptions are returned as results instead of raised
+        :return: Results in the same order of `coroutines`
+        """
+        async def _gather():
+            return await asyncio.gather(*coroutines, return_exceptions=return_exceptions)
+        return self.run(_gather())
@@ -1,22 +1,73 @@
+import random
+import re
+import threading
+import time
 from abc import ABC
-from typing import Dict, Optional
-from urllib.parse import urljoin
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from gnosis.eth.ethereum_client import EthereumNetwork
 
+from .response_cache import ResponseCache
+
 
 class BaseAPIException(Exception):
     pass
 
 
+class JitteredRetry(Retry):
+    """
+    `Retry` adding a random jitter to the exponential backoff, so clients retrying at the same
+    time (e.g. after a 429) don't hit the service again all together
+    """
+    def __init__(self, *args, backoff_jitter: float = 0., **kwargs):
+        super().__init__(*args, **kwargs)
+        self.backoff_jitter = backoff_jitter
+
+    def new(self, **kwargs) -> 'JitteredRetry':
+        kwargs.setdefault('backoff_jitter', self.backoff_jitter)
+        return super().new(**kwargs)
+
+    def get_backoff_time(self) -> float:
+        backoff_time = super().get_backoff_time()
+        if backoff_time and self.backoff_jitter:
+            backoff_time += random.uniform(0, self.backoff_jitter)
+        return backoff_time
+
+
 class BaseAPI(ABC):
     URL_BY_NETWORK: Dict[EthereumNetwork, str] = {}
+    POOL_SIZE: int = 10  # Max number of keep-alive connections per host
+    TIMEOUT: Union[float, Tuple[float, float]] = (5, 30)  # Connect and read timeouts
+    RETRIES: int = 3  # Retries for 429/5xx responses and connection errors
+    RETRY_BACKOFF_FACTOR: float = 0.3
+    RETRY_BACKOFF_JITTER: float = 0.3
+    RETRY_STATUS_CODES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    # Seconds a cached GET response is served without asking the service, by url path fragment.
+    # Endpoints not configured are never cached
+    CACHE_TTLS: Dict[str, float] = {}
+
+    # Sessions are shared by every client talking to the same host, so connections are reused
+    _http_sessions: Dict[str, requests.Session] = {}
+    _http_sessions_lock = threading.Lock()
 
-    def __init__(self, network: EthereumNetwork):
+    def __init__(self, network: EthereumNetwork, timeout: Optional[Union[float, Tuple[float, float]]] = None,
+                 response_cache: Optional[ResponseCache] = None, base_url: Optional[str] = None):
+        """
+        :param network:
+        :param timeout: Timeout for the requests, `TIMEOUT` by default
+        :param response_cache: Cache for GET responses of the endpoints in `CACHE_TTLS`. Shared default cache
+            is used if not provided
+        :param base_url: Use a custom url for the service instead of the one configured for the network
+        """
         self.network = network
-        self.base_url = self.URL_BY_NETWORK[network]
+        self.base_url = base_url or self.URL_BY_NETWORK[network]
+        self.timeout = timeout if timeout is not None else self.TIMEOUT
+        self.response_cache = response_cache or (ResponseCache.get_default() if self.CACHE_TTLS else None)
 
     @classmethod
     def from_network_number(cls, network: int) -> Optional['BaseAPI']:
@@ -24,14 +75,94 @@ class BaseAPI(ABC):
         if ethereum_network in cls.URL_BY_NETWORK:
             return cls(ethereum_network)
 
-    def _get_request(self, url: str) -> requests.Response:
+    @classmethod
+    def build_http_session(cls) -> requests.Session:
+        """
+        :return: `requests.Session` with a keep-alive connection pool of `POOL_SIZE` and jittered retries for
+            idempotent requests. POST is never retried, as it could send the same transaction twice
+        """
+        retry = JitteredRetry(total=cls.RETRIES,
+                              status_forcelist=cls.RETRY_STATUS_CODES,
+                              backoff_factor=cls.RETRY_BACKOFF_FACTOR,
+                              backoff_jitter=cls.RETRY_BACKOFF_JITTER,
+                              raise_on_status=False)  # Return last response, errors are handled by the clients
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=cls.POOL_SIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @property
+    def http_session(self) -> requests.Session:
+        host = urlparse(self.base_url).netloc
+        with self._http_sessions_lock:
+            if host not in self._http_sessions:
+                self._http_sessions[host] = self.build_http_session()
+            return self._http_sessions[host]
+
+    def get_cache_ttl(self, full_url: str) -> Optional[float]:
+        """
+        :param full_url:
+        :return: Seconds a response for `full_url` can be cached, `None` if it must not be cached
+        """
+        if self.response_cache:
+            path = urlparse(full_url).path
+            for path_fragment, ttl in self.CACHE_TTLS.items():
+                if path_fragment in path:
+                    return ttl
+
+    def _get_request(self, url: str, params: Optional[Dict] = None) -> requests.Response:
         full_url = urljoin(self.base_url, url)
-        return requests.get(full_url)
+        ttl = self.get_cache_ttl(full_url)
+        if ttl is None:
+            return self.http_session.get(full_url, params=params, timeout=self.timeout)
+
+        cache_key = self.response_cache.build_key(self.network.name, full_url, params)
+        cached_response = self.response_cache.get(cache_key)
+        headers = {}
+        if cached_response:
+            if time.time() - cached_response.fetched_at < ttl:
+                return cached_response.to_response()
+            # Stale, ask the service if it changed
+            if cached_response.etag:
+                headers['If-None-Match'] = cached_response.etag
+            if cached_response.last_modified:
+                headers['If-Modified-Since'] = cached_response.last_modified
+
+        response = self.http_session.get(full_url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached_response:
+            self.response_cache.refresh(cache_key)
+            return cached_response.to_response()
+        elif response.status_code == 200:
+            self.response_cache.set(cache_key, response)
+        return response
+
+    def invalidate_cached_responses(self, url: str):
+        """
+        Invalidate cached responses that can change after modifying `url`. For urls under `/safes/<address>/`
+        every cached response for that Safe is invalidated
+
+        :param url: Relative or absolute url
+        """
+        if self.response_cache:
+            full_url = urljoin(self.base_url, url)
+            match = re.match(r'.*?/safes/[^/]+/', full_url)
+            self.response_cache.invalidate(
+                self.response_cache.build_key(self.network.name, match.group(0) if match else full_url)
+            )
 
     def _post_request(self, url: str, payload: Dict) -> requests.Response:
         full_url = urljoin(self.base_url, url)
-        return requests.post(full_url, json=payload, headers={'Content-type': 'application/json'})
+        response = self.http_session.post(full_url, json=payload, headers={'Content-type': 'application/json'},
+                                          timeout=self.timeout)
+        if response.ok:
+            self.invalidate_cached_responses(full_url)
+        return response
 
     def _delete_request(self, url: str, payload: Dict) -> requests.Response:
         full_url = urljoin(self.base_url, url)
-        return requests.delete(full_url, json=payload, headers={'Content-type': 'application/json'})
+        response = self.http_session.delete(full_url, json=payload, headers={'Content-type': 'application/json'},
+                                            timeout=self.timeout)
+        if response.ok:
+            self.invalidate_cached_responses(full_url)
+        return response
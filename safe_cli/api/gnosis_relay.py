@@ -1,6 +1,5 @@
-from urllib.parse import urljoin
+from typing import Any, Dict
 
-import requests
 from eth_typing import ChecksumAddress, HexStr
 
 from gnosis.eth.ethereum_client import EthereumNetwork
@@ -36,8 +35,8 @@ class RelayService(BaseAPI):
         EthereumNetwork.GOERLI: 'https://safe-relay.goerli.gnosis.io/',
     }
 
-    def send_transaction(self, safe_address: str, safe_tx: SafeTx) -> RelaySentTransaction:
-        url = urljoin(self.base_url, f'/api/v1/safes/{safe_address}/transactions/')
+    @classmethod
+    def build_transaction_payload(cls, safe_tx: SafeTx) -> Dict[str, Any]:
         signatures = []
         for i in range(len(safe_tx.signatures) // 65):
             v, r, s = signature_split(safe_tx.signatures, i)
@@ -49,7 +48,7 @@ class RelayService(BaseAPI):
                 }
             )
 
-        data = {
+        return {
             'to': safe_tx.to,
             'value': safe_tx.value,
             'data': safe_tx.data.hex() if safe_tx.data else None,
@@ -62,7 +61,27 @@ class RelayService(BaseAPI):
             'nonce': safe_tx.safe_nonce,
             'signatures': signatures,
         }
-        response = requests.post(url, json=data)
+
+    @classmethod
+    def build_estimation_payload(cls, safe_tx: SafeTx) -> Dict[str, Any]:
+        return {
+            'to': safe_tx.to,
+            'value': safe_tx.value,
+            'data': safe_tx.data.hex() if safe_tx.data else None,
+            'operation': safe_tx.operation,
+            'gasToken': safe_tx.gas_token,
+        }
+
+    @classmethod
+    def parse_estimation(cls, response_json: Dict[str, Any]) -> RelayEstimation:
+        # Convert values to int
+        for key in ('safeTxGas', 'baseGas', 'gasPrice'):
+            response_json[key] = int(response_json[key])
+        return RelayEstimation(response_json)
+
+    def send_transaction(self, safe_address: str, safe_tx: SafeTx) -> RelaySentTransaction:
+        data = self.build_transaction_payload(safe_tx)
+        response = self._post_request(f'/api/v1/safes/{safe_address}/transactions/', data)
         if not response.ok:
             raise BaseAPIException(f'Error posting transaction: {response.content}')
         else:
@@ -74,20 +93,9 @@ class RelayService(BaseAPI):
         :param safe_tx:
         :return: RelayEstimation
         """
-        url = urljoin(self.base_url, f'/api/v2/safes/{safe_address}/transactions/estimate/')
-        data = {
-            'to': safe_tx.to,
-            'value': safe_tx.value,
-            'data': safe_tx.data.hex() if safe_tx.data else None,
-            'operation': safe_tx.operation,
-            'gasToken': safe_tx.gas_token,
-        }
-        response = requests.post(url, json=data)
+        data = self.build_estimation_payload(safe_tx)
+        response = self._post_request(f'/api/v2/safes/{safe_address}/transactions/estimate/', data)
         if not response.ok:
             raise BaseAPIException(f'Error posting transaction: {response.content}')
         else:
-            response_json = response.json()
-            # Convert values to int
-            for key in ('safeTxGas', 'baseGas', 'gasPrice'):
-                response_json[key] = int(response_json[key])
-            return RelayEstimation(response_json)
+            return self.parse_estimation(response.json())
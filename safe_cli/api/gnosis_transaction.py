@@ -1,8 +1,8 @@
 import time
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import requests
 from eth_account.signers.local import LocalAccount
 from web3 import Web3
 
@@ -24,6 +24,11 @@ class TransactionService(BaseAPI):
         EthereumNetwork.ARBITRUM: 'https://safe-transaction.arbitrum.gnosis.io',
         EthereumNetwork.BINANCE: 'https://safe-transaction.bsc.gnosis.io',
     }
+    CACHE_TTLS = {
+        '/balances/': 15,
+        '/multisig-transactions/': 15,
+        '/delegates/': 60,
+    }
 
     @classmethod
     def create_delegate_message_hash(cls, delegate_address: str) -> str:
@@ -31,6 +36,14 @@ class TransactionService(BaseAPI):
         hash_to_sign = Web3.keccak(text=delegate_address + str(totp))
         return hash_to_sign
 
+    @staticmethod
+    def parse_date(date: str) -> datetime:
+        """
+        :param date: ISO 8601 date returned by the service, like `2021-07-13T10:32:14.153616Z`
+        :return: Timezone aware datetime
+        """
+        return datetime.fromisoformat(date.replace('Z', '+00:00'))
+
     def data_decoded_to_text(self, data_decoded: Dict[str, Any]) -> Optional[str]:
         """
         Decoded data decoded to text
@@ -63,12 +76,65 @@ class TransactionService(BaseAPI):
         else:
             return response.json()
 
-    def get_transactions(self, safe_address: str) -> List[Dict[str, Any]]:
-        response = self._get_request(f'/api/v1/safes/{safe_address}/multisig-transactions/')
+    def _get_transactions_page(self, url: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        :param url: Relative url for the first page or absolute `next` url for the following ones
+        :return: Tuple with the transactions of the page and the url of the next page (if any)
+        """
+        response = self._get_request(url)
         if not response.ok:
             raise BaseAPIException(f'Cannot get transactions: {response.content}')
         else:
-            return response.json().get('results', [])
+            response_json = response.json()
+            return response_json.get('results', []), response_json.get('next')
+
+    def iter_transaction_pages(self, safe_address: str, min_nonce: Optional[int] = None,
+                               since: Optional[datetime] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate lazily through the pages of multisig transactions of a Safe, following the `next` links.
+        Transactions are returned by the service ordered by descending nonce, and the next page is prefetched on
+        the background while the current one is consumed
+
+        :param safe_address:
+        :param min_nonce: Stop when a transaction with a lower nonce is found
+        :param since: Stop when a transaction submitted before this (timezone aware) date is found
+        :return: Iterator of pages of transactions. The last page is truncated if a limit is reached
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            page = executor.submit(self._get_transactions_page,
+                                   f'/api/v1/safes/{safe_address}/multisig-transactions/')
+            while page:
+                transactions, next_url = page.result()
+                page = executor.submit(self._get_transactions_page, next_url) if next_url else None
+                for i, transaction in enumerate(transactions):
+                    if ((min_nonce is not None and transaction['nonce'] < min_nonce)
+                            or (since and self.parse_date(transaction['submissionDate']) < since)):
+                        if i:
+                            yield transactions[:i]
+                        return
+                yield transactions
+        finally:
+            executor.shutdown(wait=False)  # Don't block on an unneeded prefetch if iteration stopped early
+
+    def iter_transactions(self, safe_address: str, min_nonce: Optional[int] = None,
+                          since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """
+        :param safe_address:
+        :param min_nonce: Stop when a transaction with a lower nonce is found
+        :param since: Stop when a transaction submitted before this (timezone aware) date is found
+        :return: Iterator of transactions, see `iter_transaction_pages`
+        """
+        for transactions in self.iter_transaction_pages(safe_address, min_nonce=min_nonce, since=since):
+            yield from transactions
+
+    def get_transactions(self, safe_address: str, **kwargs) -> List[Dict[str, Any]]:
+        """
+        :param safe_address:
+        :param kwargs: Same filters as `iter_transactions`
+        :return: List with every transaction of the Safe (all the pages)
+        """
+        return list(self.iter_transactions(safe_address, **kwargs))
 
     def get_delegates(self, safe_address: str) -> List[Dict[str, Any]]:
         response = self._get_request(f'/api/v1/safes/{safe_address}/delegates/')
@@ -77,34 +143,31 @@ class TransactionService(BaseAPI):
         else:
             return response.json().get('results', [])
 
-    def add_delegate(self, safe_address: str, delegate_address: str, label: str, signer_account: LocalAccount):
-        hash_to_sign = self.create_delegate_message_hash(delegate_address)
+    @classmethod
+    def build_add_delegate_payload(cls, safe_address: str, delegate_address: str, label: str,
+                                   signer_account: LocalAccount) -> Dict[str, Any]:
+        hash_to_sign = cls.create_delegate_message_hash(delegate_address)
         signature = signer_account.signHash(hash_to_sign)
-        add_payload = {
+        return {
             'safe': safe_address,
             'delegate': delegate_address,
             'signature': signature.signature.hex(),
             'label': label
         }
-        response = self._post_request(f'/api/v1/safes/{safe_address}/delegates/', add_payload)
-        if not response.ok:
-            raise BaseAPIException(f'Cannot add delegate: {response.content}')
 
-    def remove_delegate(self, safe_address: str, delegate_address: str, signer_account: LocalAccount):
-        hash_to_sign = self.create_delegate_message_hash(delegate_address)
+    @classmethod
+    def build_remove_delegate_payload(cls, delegate_address: str, signer_account: LocalAccount) -> Dict[str, Any]:
+        hash_to_sign = cls.create_delegate_message_hash(delegate_address)
         signature = signer_account.signHash(hash_to_sign)
-        remove_payload = {
+        return {
             'signature': signature.signature.hex()
         }
-        response = self._delete_request(f'/api/v1/safes/{safe_address}/delegates/{delegate_address}/', remove_payload)
-        if not response.ok:
-            raise BaseAPIException(f'Cannot remove delegate: {response.content}')
 
-    def post_transaction(self, safe_address: str, safe_tx: SafeTx):
-        url = urljoin(self.base_url, f'/api/v1/safes/{safe_address}/multisig-transactions/')
+    @classmethod
+    def build_transaction_payload(cls, safe_tx: SafeTx) -> Dict[str, Any]:
         random_account = '0x1b95E981F808192Dc5cdCF92ef589f9CBe6891C4'
         sender = safe_tx.sorted_signers[0] if safe_tx.sorted_signers else random_account
-        data = {
+        return {
             'to': safe_tx.to,
             'value': safe_tx.value,
             'data': safe_tx.data.hex() if safe_tx.data else None,
@@ -120,6 +183,21 @@ class TransactionService(BaseAPI):
             'signature': safe_tx.signatures.hex() if safe_tx.signatures else None,
             'origin': 'Safe-CLI'
         }
-        response = requests.post(url, json=data)
+
+    def add_delegate(self, safe_address: str, delegate_address: str, label: str, signer_account: LocalAccount):
+        add_payload = self.build_add_delegate_payload(safe_address, delegate_address, label, signer_account)
+        response = self._post_request(f'/api/v1/safes/{safe_address}/delegates/', add_payload)
+        if not response.ok:
+            raise BaseAPIException(f'Cannot add delegate: {response.content}')
+
+    def remove_delegate(self, safe_address: str, delegate_address: str, signer_account: LocalAccount):
+        remove_payload = self.build_remove_delegate_payload(delegate_address, signer_account)
+        response = self._delete_request(f'/api/v1/safes/{safe_address}/delegates/{delegate_address}/', remove_payload)
+        if not response.ok:
+            raise BaseAPIException(f'Cannot remove delegate: {response.content}')
+
+    def post_transaction(self, safe_address: str, safe_tx: SafeTx):
+        data = self.build_transaction_payload(safe_tx)
+        response = self._post_request(f'/api/v1/safes/{safe_address}/multisig-transactions/', data)
         if not response.ok:
             raise BaseAPIException(f'Error posting transaction: {response.content}')
@@ -0,0 +1,123 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ..utils import get_cache_dir
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    fetched_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get('Last-Modified')
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        return response
+
+
+class ResponseCache:
+    """
+    SQLite backed cache for GET responses of the services, bounded to `max_entries` with LRU eviction.
+    Freshness (TTL) is decided by the caller, so every API can use its own TTLs per endpoint
+    """
+    DEFAULT_FILENAME = 'responses.sqlite3'
+    DEFAULT_MAX_ENTRIES = 1000
+    _default: Optional['ResponseCache'] = None
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()  # Connection is shared by the threads prefetching pages
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS responses ('
+                                 'key TEXT PRIMARY KEY, url TEXT NOT NULL, status_code INTEGER NOT NULL, '
+                                 'headers TEXT NOT NULL, content BLOB NOT NULL, fetched_at REAL NOT NULL, '
+                                 'accessed_at REAL NOT NULL)')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+
+    @classmethod
+    def get_default(cls) -> Optional['ResponseCache']:
+        """
+        :return: Shared cache stored on the safe-cli cache dir, `None` if `SAFE_CLI_DISABLE_CACHE` is set or
+            the cache cannot be opened
+        """
+        if cls._default is None and not os.environ.get('SAFE_CLI_DISABLE_CACHE'):
+            try:
+                cls._default = cls(os.path.join(get_cache_dir(), cls.DEFAULT_FILENAME))
+            except (OSError, sqlite3.Error):  # Read only filesystem, locked database...
+                return None
+        return cls._default
+
+    @staticmethod
+    def build_key(namespace: str, url: str, params: Optional[Dict] = None) -> str:
+        """
+        :param namespace: Network for the request, so the same url is not shared between networks
+        :param url:
+        :param params: Query params
+        :return: Key for the cache
+        """
+        key = f'{namespace}:{url}'
+        if params:
+            key += '?' + '&'.join(f'{name}={value}' for name, value in sorted(params.items()))
+        return key
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connection.execute('SELECT url, status_code, headers, content, fetched_at '
+                                           'FROM responses WHERE key=?', (key,)).fetchone()
+            if row:
+                self._connection.execute('UPDATE responses SET accessed_at=? WHERE key=?', (time.time(), key))
+                url, status_code, headers, content, fetched_at = row
+                return CachedResponse(url, status_code, json.loads(headers), content, fetched_at)
+
+    def set(self, key: str, response: requests.Response) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                     (key, response.url, response.status_code, json.dumps(dict(response.headers)),
+                                      response.content, now, now))
+            self._connection.execute('DELETE FROM responses WHERE key IN ('
+                                     'SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                                     (self.max_entries,))
+
+    def refresh(self, key: str) -> None:
+        """
+        Mark a cached response as fresh again, used when the server answers `304 Not Modified`
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute('UPDATE responses SET fetched_at=?, accessed_at=? WHERE key=?', (now, now, key))
+
+    def invalidate(self, key_prefix: str) -> None:
+        """
+        Remove every cached response with a key starting with `key_prefix`
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE substr(key, 1, ?) = ?",
+                                     (len(key_prefix), key_prefix))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM responses')
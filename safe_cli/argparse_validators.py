@@ -0,0 +1,64 @@
+"""
+Validators for ArgParse. Only light dependencies are imported, so entry points can parse the arguments without
+loading web3 and the Safe dependencies
+"""
+import argparse
+from datetime import datetime, timezone
+
+from eth_utils import is_checksum_address, to_checksum_address
+from hexbytes import HexBytes
+
+
+def check_ethereum_address(address: str) -> str:
+    """
+    Ethereum address validator for ArgParse
+    :param address:
+    :return:
+    """
+    if not is_checksum_address(address):
+        raise argparse.ArgumentTypeError(f'{address} is not a valid checksummed ethereum address')
+    return address
+
+
+def check_hex_str(hex_str: str) -> HexBytes:
+    """
+    Hexadecimal
+    :param hex_str:
+    :return:
+    """
+    try:
+        return HexBytes(hex_str)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{hex_str} is not a valid hexadecimal string')
+
+
+def check_keccak256_hash(hex_str: str) -> HexBytes:
+    """
+    Hexadecimal
+    :param hex_str:
+    :return:
+    """
+    hex_str_bytes = check_hex_str(hex_str)
+    if len(hex_str_bytes) != 32:
+        raise argparse.ArgumentTypeError(f'{hex_str} is not a valid keccak256 hash hexadecimal string')
+    return hex_str_bytes
+
+
+def check_iso_date(date: str) -> datetime:
+    """
+    ISO 8601 date validator for ArgParse. UTC is used if no timezone is provided
+    :param date:
+    :return:
+    """
+    try:
+        parsed_date = datetime.fromisoformat(date)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{date} is not a valid ISO 8601 date')
+    return parsed_date if parsed_date.tzinfo else parsed_date.replace(tzinfo=timezone.utc)
+
+
+def to_checksummed_ethereum_address(address: str) -> str:
+    try:
+        return to_checksum_address(address)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{address} is not a valid ethereum address')
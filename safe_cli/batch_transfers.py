@@ -0,0 +1,220 @@
+"""
+Transfers of ether, ERC20 and ERC721 tokens read from CSV/JSON files and grouped on MultiSend transactions.
+
+Every transfer has `to`, `amount` (wei, token units or ERC721 token id) and optionally `token` (token address,
+ether if empty) and `type` (`ether`, `erc20` or `erc721`, by default `erc20` if `token` is provided)
+"""
+import csv
+import json
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from eth_abi import decode_single, encode_abi
+from eth_abi.exceptions import DecodingError
+from eth_utils import function_signature_to_4byte_selector
+from hexbytes import HexBytes
+from web3 import Web3
+
+from gnosis.eth import EthereumClient
+from gnosis.safe.multi_send import MultiSendOperation, MultiSendTx
+
+from .json_rpc import JsonRpcBatch, JsonRpcBatchNotSupported
+
+DEFAULT_GAS_LIMIT = 8000000  # Max gas for every MultiSend tx
+
+
+class BatchTransfersException(Exception):
+    pass
+
+
+class TransferType:
+    ETHER = 'ether'
+    ERC20 = 'erc20'
+    ERC721 = 'erc721'
+
+
+class Transfer(NamedTuple):
+    to: str
+    amount: int  # Token id for ERC721
+    token: Optional[str]  # `None` for ether
+    type: str
+
+    @classmethod
+    def from_dict(cls, transfer_dict: Dict[str, Any]) -> 'Transfer':
+        try:
+            token = Web3.toChecksumAddress(transfer_dict['token']) if transfer_dict.get('token') else None
+            transfer_type = (transfer_dict.get('type') or (TransferType.ERC20 if token else TransferType.ETHER)).lower()
+            if transfer_type not in (TransferType.ETHER, TransferType.ERC20, TransferType.ERC721):
+                raise ValueError(f'Not valid type {transfer_type}')
+            elif bool(token) == (transfer_type == TransferType.ETHER):
+                raise ValueError('Token is required for tokens and not allowed for ether')
+            amount = int(transfer_dict['amount'])
+            if amount < 0:
+                raise ValueError('Amount cannot be negative')
+            return cls(Web3.toChecksumAddress(transfer_dict['to']), amount, token, transfer_type)
+        except (KeyError, TypeError, ValueError) as e:
+            raise BatchTransfersException(f'Invalid transfer {transfer_dict}: {e}') from e
+
+
+def read_transfers_file(path: str) -> List[Transfer]:
+    """
+    :param path: JSON file with a list of transfers, or CSV file with a header row (`to,amount,token,type`)
+    :return: Transfers in the same order of the file
+    :raises: BatchTransfersException
+    """
+    try:
+        with open(path, newline='') as transfers_file:
+            if path.lower().endswith('.json'):
+                transfer_dicts = json.load(transfers_file)
+                if not isinstance(transfer_dicts, list):
+                    raise BatchTransfersException(f'{path} must contain a list of transfers')
+            else:
+                transfer_dicts = [{key.strip(): value.strip() if isinstance(value, str) else value
+                                   for key, value in row.items() if key}
+                                  for row in csv.DictReader(transfers_file)]
+    except (OSError, ValueError, csv.Error) as e:
+        raise BatchTransfersException(f'Cannot read transfers from {path}: {e}') from e
+    return [Transfer.from_dict(transfer_dict) for transfer_dict in transfer_dicts]
+
+
+def encode_call(function_signature: str, args_types: Sequence[str], args: Sequence[Any]) -> bytes:
+    return function_signature_to_4byte_selector(function_signature) + encode_abi(args_types, args)
+
+
+def build_multisend_tx(safe_address: str, transfer: Transfer) -> MultiSendTx:
+    if transfer.type == TransferType.ETHER:
+        return MultiSendTx(MultiSendOperation.CALL, transfer.to, transfer.amount, b'')
+    elif transfer.type == TransferType.ERC20:
+        data = encode_call('transfer(address,uint256)', ['address', 'uint256'], [transfer.to, transfer.amount])
+    else:
+        data = encode_call('transferFrom(address,address,uint256)', ['address', 'address', 'uint256'],
+                           [safe_address, transfer.to, transfer.amount])
+    return MultiSendTx(MultiSendOperation.CALL, transfer.token, 0, data)
+
+
+def get_required_amounts(transfers: Sequence[Transfer]) -> Dict[Optional[str], int]:
+    """
+    :param transfers:
+    :return: Aggregated amount needed for ether (`None` key) and every ERC20 token
+    :raises: BatchTransfersException if the same ERC721 token is transferred more than once
+    """
+    required_amounts = defaultdict(int)
+    erc721_tokens = set()
+    for transfer in transfers:
+        if transfer.type == TransferType.ERC721:
+            if (transfer.token, transfer.amount) in erc721_tokens:
+                raise BatchTransfersException(f'ERC721 {transfer.token} with id {transfer.amount} '
+                                              f'is transferred more than once')
+            erc721_tokens.add((transfer.token, transfer.amount))
+        else:
+            required_amounts[transfer.token] += transfer.amount
+    return dict(required_amounts)
+
+
+def check_balances(ethereum_client: EthereumClient, json_rpc_batch: JsonRpcBatch, safe_address: str,
+                   transfers: Sequence[Transfer]) -> List[str]:
+    """
+    Check the Safe holds enough ether and tokens for all the transfers, using one JSON-RPC batch for all the
+    balances and ERC721 owners
+
+    :param ethereum_client:
+    :param json_rpc_batch:
+    :param safe_address:
+    :param transfers:
+    :return: Errors found, empty if the Safe holds everything needed
+    """
+    required_amounts = get_required_amounts(transfers)
+    checks: List[Callable[[int], Optional[str]]] = []
+    requests = []
+    for token, required_amount in required_amounts.items():
+        if token is None:
+            requests.append(('eth_getBalance', [safe_address, 'latest']))
+        else:
+            requests.append(('eth_call', [{'to': token, 'data': HexBytes(encode_call(
+                'balanceOf(address)', ['address'], [safe_address])).hex()}, 'latest']))
+        checks.append(lambda balance, token=token, required_amount=required_amount:
+                      None if balance >= required_amount else
+                      f'Safe holds {balance} of {token or "ether"}, {required_amount} required')
+
+    for transfer in transfers:
+        if transfer.type == TransferType.ERC721:
+            requests.append(('eth_call', [{'to': transfer.token, 'data': HexBytes(encode_call(
+                'ownerOf(uint256)', ['uint256'], [transfer.amount])).hex()}, 'latest']))
+            checks.append(lambda owner, transfer=transfer:
+                          None if owner == int(safe_address, 16) else
+                          f'ERC721 {transfer.token} with id {transfer.amount} is not owned by the Safe')
+
+    try:
+        results = json_rpc_batch.request(requests, raise_exception=False)
+    except JsonRpcBatchNotSupported:
+        results = []
+        for method, params in requests:
+            try:
+                if method == 'eth_getBalance':
+                    results.append(ethereum_client.get_balance(safe_address))
+                else:
+                    results.append(ethereum_client.w3.eth.call(params[0]))
+            except ValueError as e:
+                results.append(e)
+
+    errors = []
+    for (method, params), result, check in zip(requests, results, checks):
+        if isinstance(result, Exception):
+            errors.append(f'Cannot check {method} {params}: {result}')
+            continue
+        try:
+            value = int(result, 16) if isinstance(result, str) and method == 'eth_getBalance' else result
+            if method == 'eth_call':
+                value = decode_single('uint256', HexBytes(value))
+        except (DecodingError, TypeError, ValueError) as e:  # Not a token contract
+            errors.append(f'Cannot check {params[0]["to"]}: {e}')
+            continue
+        error = check(value)
+        if error:
+            errors.append(error)
+    return errors
+
+
+class BatchTransfersChunker:
+    """
+    Group transfers on MultiSend txs using a gas estimation for every transfer, so every MultiSend fits in
+    `gas_limit`
+    """
+    ESTIMATED_GAS = {  # Conservative: transfers to new accounts or token holders cost more
+        TransferType.ETHER: 35000,
+        TransferType.ERC20: 60000,
+        TransferType.ERC721: 90000,
+    }
+    MULTISEND_TX_GAS = 3000  # Overhead of MultiSend for every tx
+    MULTISEND_TX_HEADER_BYTES = 85  # Operation (1), to (20), value (32) and data length (32)
+
+    def __init__(self, gas_limit: int):
+        self.gas_limit = gas_limit
+
+    def estimate_gas(self, transfer: Transfer, multisend_tx: MultiSendTx) -> int:
+        calldata_gas = 16 * (self.MULTISEND_TX_HEADER_BYTES + len(multisend_tx.data))
+        return self.ESTIMATED_GAS[transfer.type] + self.MULTISEND_TX_GAS + calldata_gas
+
+    def chunk(self, safe_address: str, transfers: Sequence[Transfer]) -> List[List[MultiSendTx]]:
+        """
+        :param safe_address:
+        :param transfers:
+        :return: MultiSend txs for every chunk, keeping the order of `transfers`
+        :raises: BatchTransfersException if a single transfer doesn't fit in `gas_limit`
+        """
+        chunks = []
+        chunk = []
+        chunk_gas = 0
+        for transfer in transfers:
+            multisend_tx = build_multisend_tx(safe_address, transfer)
+            gas = self.estimate_gas(transfer, multisend_tx)
+            if gas > self.gas_limit:
+                raise BatchTransfersException(f'Transfer {transfer} needs more than {self.gas_limit} gas')
+            if chunk and chunk_gas + gas > self.gas_limit:
+                chunks.append(chunk)
+                chunk, chunk_gas = [], 0
+            chunk.append(multisend_tx)
+            chunk_gas += gas
+        if chunk:
+            chunks.append(chunk)
+        return chunks
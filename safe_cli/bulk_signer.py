@@ -0,0 +1,115 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+from eth_abi import encode_abi
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from packaging import version as semantic_version
+from web3 import Web3
+
+from gnosis.eth import EthereumClient
+from gnosis.eth.contracts import get_safe_contract
+
+from .safe_tx_file import SafeTxData
+
+try:
+    from functools import cached_property
+except ImportError:
+    from cached_property import cached_property
+
+SAFE_TX_TYPEHASH = Web3.keccak(text='SafeTx(address to,uint256 value,bytes data,uint8 operation,uint256 safeTxGas,'
+                                    'uint256 baseGas,uint256 gasPrice,address gasToken,address refundReceiver,'
+                                    'uint256 nonce)')
+SAFE_TX_TYPEHASH_V0 = Web3.keccak(text='SafeTx(address to,uint256 value,bytes data,uint8 operation,'
+                                       'uint256 safeTxGas,uint256 dataGas,uint256 gasPrice,address gasToken,'
+                                       'address refundReceiver,uint256 nonce)')  # Safes < 1.0.0
+
+
+def get_safe_tx_hash(domain_separator: bytes, safe_tx: SafeTxData, safe_tx_typehash: bytes = SAFE_TX_TYPEHASH) -> bytes:
+    """
+    EIP712 hash of a Safe transaction, calculated locally without calling the node
+
+    :param domain_separator: EIP712 domain separator of the Safe
+    :param safe_tx:
+    :param safe_tx_typehash:
+    :return: Safe tx hash
+    """
+    safe_tx_struct_hash = Web3.keccak(encode_abi(
+        ['bytes32', 'address', 'uint256', 'bytes32', 'uint8', 'uint256', 'uint256', 'uint256', 'address', 'address',
+         'uint256'],
+        [safe_tx_typehash, safe_tx.to, safe_tx.value, Web3.keccak(safe_tx.data), safe_tx.operation,
+         safe_tx.safe_tx_gas, safe_tx.base_gas, safe_tx.gas_price, safe_tx.gas_token, safe_tx.refund_receiver,
+         safe_tx.nonce]
+    ))
+    return bytes(Web3.keccak(b'\x19\x01' + domain_separator + safe_tx_struct_hash))
+
+
+def sign_hashes(key: bytes, hashes: Sequence[bytes]) -> List[bytes]:
+    """
+    :param key: Private key
+    :param hashes:
+    :return: 65 bytes signature (`r`, `s`, `v`) for every hash
+    """
+    return [bytes(Account.signHash(hash_to_sign, key).signature) for hash_to_sign in hashes]
+
+
+class BulkSigner:
+    """
+    Sign many Safe transactions with many owners. Safe tx hashes are calculated locally using the domain separator
+    retrieved only once, and signing is split between processes when there are enough signatures to be worth it
+    """
+    MIN_SIGNATURES_FOR_PROCESSES = 500  # Starting the processes is slower than signing less hashes in one process
+    CHUNK_SIZE = 100  # Hashes signed by every process task
+
+    def __init__(self, safe_address: str, ethereum_client: EthereumClient, safe_version: str,
+                 max_workers: Optional[int] = None):
+        """
+        :param safe_address:
+        :param ethereum_client:
+        :param safe_version: Version of the Safe, as transaction type hash changed on 1.0.0
+        :param max_workers: Max number of processes for signing, number of cores by default
+        """
+        self.safe_address = safe_address
+        self.ethereum_client = ethereum_client
+        self.safe_version = safe_version
+        self.max_workers = max_workers
+
+    @cached_property
+    def domain_separator(self) -> bytes:
+        return bytes(get_safe_contract(self.ethereum_client.w3, self.safe_address).functions.domainSeparator().call())
+
+    @property
+    def safe_tx_typehash(self) -> bytes:
+        if semantic_version.parse(self.safe_version) >= semantic_version.parse('1.0.0'):
+            return SAFE_TX_TYPEHASH
+        return SAFE_TX_TYPEHASH_V0
+
+    def get_safe_tx_hashes(self, safe_txs: Sequence[SafeTxData]) -> List[bytes]:
+        safe_tx_typehash = self.safe_tx_typehash
+        return [get_safe_tx_hash(self.domain_separator, safe_tx, safe_tx_typehash) for safe_tx in safe_txs]
+
+    def sign_hashes(self, hashes: Sequence[bytes], accounts: Sequence[LocalAccount]) -> List[bytes]:
+        """
+        :param hashes: Safe tx hashes
+        :param accounts: Owners signing
+        :return: Signatures for every hash, concatenated sorted by owner address as the Safe contract requires
+        """
+        sorted_accounts = sorted(accounts, key=lambda account: int(account.address, 16))
+        if not sorted_accounts:
+            return [b''] * len(hashes)
+        elif len(hashes) * len(sorted_accounts) < self.MIN_SIGNATURES_FOR_PROCESSES:
+            signatures_by_account = [sign_hashes(account.key, hashes) for account in sorted_accounts]
+        else:
+            chunks = [hashes[i:i + self.CHUNK_SIZE] for i in range(0, len(hashes), self.CHUNK_SIZE)]
+            keys = [bytes(account.key) for account in sorted_accounts for _ in chunks]
+            # `spawn`, as forking a process with running threads (prompt toolkit, watchers...) can deadlock
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                signed_chunks = list(executor.map(sign_hashes, keys, chunks * len(sorted_accounts)))
+            signatures_by_account = [
+                [signature for signed_chunk in signed_chunks[i:i + len(chunks)] for signature in signed_chunk]
+                for i in range(0, len(signed_chunks), len(chunks))
+            ]
+
+        return [b''.join(account_signatures) for account_signatures in zip(*signatures_by_account)]
@@ -0,0 +1,163 @@
+import contextlib
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from prompt_toolkit import HTML, print_formatted_text
+from web3 import Web3
+
+from .daemon_client import (DaemonClient, DaemonNotAvailable,
+                            get_default_socket_path)
+from .safe_operator import SafeOperator
+from .script_runner import EXIT_INVALID_COMMAND, ScriptRunner
+from .utils import set_non_interactive_answer
+
+
+class DaemonAlreadyRunning(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def capture_output():
+    """
+    Redirect stdout and stderr to a temporary file. Redirection is done for the file descriptors, so output
+    written by `print_formatted_text` is captured whatever the output `prompt_toolkit` created on startup, and
+    for `sys.stdout` and `sys.stderr` in case they were replaced
+
+    :return: Dictionary where `output` is set with everything written when the block finishes
+    """
+    captured = {'output': ''}
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = [os.dup(1), os.dup(2)]
+    with tempfile.TemporaryFile() as capture_file:
+        os.dup2(capture_file.fileno(), 1)
+        os.dup2(capture_file.fileno(), 2)
+        # Same file offset than the file descriptors, line buffered to keep the order of the output
+        capture_stream = open(os.dup(capture_file.fileno()), 'w', buffering=1, errors='replace')
+        try:
+            with capture_stream, contextlib.redirect_stdout(capture_stream), \
+                    contextlib.redirect_stderr(capture_stream):
+                yield captured
+        finally:
+            for fd, saved_fd in zip((1, 2), saved_fds):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+            capture_file.seek(0)
+            captured['output'] = capture_file.read().decode(errors='replace')
+
+
+class SafeCliDaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            response = self.server.safe_cli_daemon.process_request(line)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+class SafeCliDaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, safe_cli_daemon: 'SafeCliDaemon'):
+        self.safe_cli_daemon = safe_cli_daemon
+        super().__init__(socket_path, SafeCliDaemonRequestHandler)
+
+
+class SafeCliDaemon:
+    """
+    Keep warm `SafeOperator`s (one for every Safe address, with its Safe information, loaded owners and
+    service connections) and run commands sent through a Unix socket by `DaemonClient`, so every command
+    doesn't pay the startup of the process and the loading of the Safe. Commands are run one at a time, as
+    output is captured for the whole process and confirmations are answered globally
+    """
+    def __init__(self, node_url: str, socket_path: Optional[str] = None,
+                 safe_operator_factory: Callable[[str, str], SafeOperator] = SafeOperator):
+        """
+        :param node_url: Ethereum node used for every Safe
+        :param socket_path: `get_default_socket_path()` by default
+        :param safe_operator_factory: Build the `SafeOperator` for a Safe address and node url
+        """
+        self.node_url = node_url
+        self.socket_path = socket_path or get_default_socket_path()
+        self.safe_operator_factory = safe_operator_factory
+        self.script_runners: Dict[str, ScriptRunner] = {}
+        self.lock = threading.Lock()
+        self.server: Optional[SafeCliDaemonServer] = None
+
+    def get_script_runner(self, safe_address: str) -> ScriptRunner:
+        if safe_address not in self.script_runners:
+            self.script_runners[safe_address] = ScriptRunner(self.safe_operator_factory(safe_address, self.node_url))
+        return self.script_runners[safe_address]
+
+    def run_command(self, safe_address: str, command: str, yes: bool) -> Tuple[int, str]:
+        """
+        :param safe_address:
+        :param command:
+        :param yes: Answer to every question asked by the command
+        :return: Tuple of exit code and output of the command
+        """
+        with self.lock, capture_output() as captured:
+            set_non_interactive_answer(yes)
+            try:
+                exit_code = self.get_script_runner(safe_address).run_command(command)
+            except Exception as e:  # Safe could not be loaded
+                print(f'Cannot load Safe {safe_address}: {e}', file=sys.stderr)
+                exit_code = EXIT_INVALID_COMMAND
+        return exit_code, captured['output']
+
+    def process_request(self, request: bytes) -> Dict[str, Any]:
+        """
+        :param request: JSON line sent by `DaemonClient`
+        :return: Response with `exit_code` and `output`
+        """
+        try:
+            request_dict = json.loads(request)
+            safe_address = request_dict['safe_address']
+            command = request_dict['command'].strip()
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return {'exit_code': EXIT_INVALID_COMMAND, 'output': f'Not valid request {request!r}'}
+
+        if not Web3.isAddress(safe_address):
+            return {'exit_code': EXIT_INVALID_COMMAND, 'output': f'{safe_address} is not a valid address'}
+        elif not command:
+            return {'exit_code': EXIT_INVALID_COMMAND, 'output': 'Command cannot be empty'}
+
+        exit_code, output = self.run_command(Web3.toChecksumAddress(safe_address), command,
+                                             bool(request_dict.get('yes')))
+        return {'exit_code': exit_code, 'output': output}
+
+    def serve_forever(self):
+        """
+        Listen on the socket until interrupted. Socket is only accessible by the current user, as the daemon
+        can hold private keys of the owners. A socket left by a daemon that is not running anymore is replaced
+
+        :raises DaemonAlreadyRunning: If another daemon is listening on the socket
+        """
+        try:
+            with DaemonClient(self.socket_path):
+                raise DaemonAlreadyRunning(f'Daemon already running on {self.socket_path}')
+        except DaemonNotAvailable:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        previous_umask = os.umask(0o177)
+        try:
+            self.server = SafeCliDaemonServer(self.socket_path, self)
+        finally:
+            os.umask(previous_umask)
+
+        print_formatted_text(HTML(f'<b><ansigreen>Listening on {self.socket_path}</ansigreen></b>'))
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.socket_path)
+
+    def shutdown(self):
+        if self.server:
+            self.server.shutdown()
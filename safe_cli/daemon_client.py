@@ -0,0 +1,95 @@
+import json
+import os
+import socket
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# Only standard library imports, so the client starts in milliseconds. Daemon lives in `safe_cli.daemon`
+DEFAULT_SOCKET_FILENAME = 'safe-cli.sock'
+
+
+class DaemonNotAvailable(Exception):
+    pass
+
+
+def get_default_socket_path() -> str:
+    """
+    :return: Socket on the safe-cli cache dir. Not using `get_cache_dir` to not import the `safe_cli` dependencies
+    """
+    cache_dir = os.environ.get('SAFE_CLI_CACHE_DIR') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'safe-cli'
+    )
+    return os.path.join(cache_dir, DEFAULT_SOCKET_FILENAME)
+
+
+class DaemonClient:
+    """
+    Send commands to a running `SafeCliDaemon`. Every request is a JSON line
+    `{"safe_address": str, "command": str, "yes": bool}` and every response a JSON line
+    `{"exit_code": int, "output": str}`. The connection is reused for all the commands
+    """
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        :param socket_path: Unix socket of the daemon, `get_default_socket_path()` by default
+        :param timeout: Seconds to wait for every response, by default wait forever (commands can wait
+            for transactions to be mined)
+        """
+        self.socket_path = socket_path or get_default_socket_path()
+        self.timeout = timeout
+        self.socket: Optional[socket.socket] = None
+        self.socket_file = None
+
+    def connect(self):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(self.timeout)
+        try:
+            self.socket.connect(self.socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            self.close()
+            raise DaemonNotAvailable(f'Daemon not running on {self.socket_path}') from e
+        self.socket_file = self.socket.makefile('rwb')
+
+    def close(self):
+        if self.socket_file:
+            self.socket_file.close()
+            self.socket_file = None
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def send_command(self, safe_address: str, command: str, yes: bool = False) -> Dict[str, Any]:
+        """
+        :param safe_address:
+        :param command: Same commands as the prompt, including operator modes (`tx-service`...)
+        :param yes: Confirm every question asked by the command. By default they are rejected
+        :return: Response of the daemon, with `exit_code` and `output`
+        :raises: DaemonNotAvailable
+        """
+        if not self.socket_file:
+            self.connect()
+        request = {'safe_address': safe_address, 'command': command, 'yes': yes}
+        self.socket_file.write(json.dumps(request).encode() + b'\n')
+        self.socket_file.flush()
+        response = self.socket_file.readline()
+        if not response:
+            raise DaemonNotAvailable('Daemon closed the connection')
+        return json.loads(response)
+
+    def send_commands(self, safe_address: str, commands: Iterable[str],
+                      yes: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        :param safe_address:
+        :param commands: Empty lines and lines starting with `#` are ignored
+        :param yes:
+        :return: Response for every command, in order
+        """
+        for line in commands:
+            command = line.strip()
+            if command and not command.startswith('#'):
+                yield self.send_command(safe_address, command, yes=yes)
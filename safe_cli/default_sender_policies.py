@@ -0,0 +1,78 @@
+"""
+Policies to choose the default sender of txs among the loaded accounts
+"""
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from eth_account.signers.local import LocalAccount
+
+from gnosis.eth import EthereumClient
+
+from .json_rpc import JsonRpcBatch, JsonRpcBatchNotSupported, JsonRpcError
+
+
+class AccountStatus(NamedTuple):
+    account: LocalAccount
+    balance: int  # Wei
+    nonce: int  # Pending nonce
+
+
+def get_account_statuses(ethereum_client: EthereumClient, json_rpc_batch: JsonRpcBatch,
+                         accounts: Sequence[LocalAccount]) -> List[AccountStatus]:
+    """
+    :param ethereum_client:
+    :param json_rpc_batch:
+    :param accounts:
+    :return: Balance and pending nonce for every account, retrieved with a single JSON-RPC batch if supported.
+        Accounts with a failed request in the batch are retrieved one by one
+    """
+    def retrieve_account_status(account: LocalAccount) -> AccountStatus:
+        return AccountStatus(account, ethereum_client.get_balance(account.address),
+                             ethereum_client.w3.eth.get_transaction_count(account.address, 'pending'))
+
+    requests = []
+    for account in accounts:
+        requests.append(('eth_getBalance', [account.address, 'latest']))
+        requests.append(('eth_getTransactionCount', [account.address, 'pending']))
+    try:
+        results = json_rpc_batch.request(requests, raise_exception=False)
+    except JsonRpcBatchNotSupported:
+        return [retrieve_account_status(account) for account in accounts]
+
+    account_statuses = []
+    for i, account in enumerate(accounts):
+        balance, nonce = results[i * 2], results[i * 2 + 1]
+        # A failed request in the batch only retrieves again the account it belongs to
+        if isinstance(balance, JsonRpcError) or isinstance(nonce, JsonRpcError):
+            account_statuses.append(retrieve_account_status(account))
+        else:
+            account_statuses.append(AccountStatus(account, int(balance, 16), int(nonce, 16)))
+    return account_statuses
+
+
+def first_funded(account_statuses: Sequence[AccountStatus]) -> Optional[LocalAccount]:
+    for account_status in account_statuses:
+        if account_status.balance > 0:
+            return account_status.account
+
+
+def highest_balance(account_statuses: Sequence[AccountStatus]) -> Optional[LocalAccount]:
+    funded = [account_status for account_status in account_statuses if account_status.balance > 0]
+    if funded:
+        return max(funded, key=lambda account_status: account_status.balance).account
+
+
+def lowest_nonce(account_statuses: Sequence[AccountStatus]) -> Optional[LocalAccount]:
+    """
+    Account with less pending txs, so txs sent by the CLI are less likely to wait for other txs
+    """
+    funded = [account_status for account_status in account_statuses if account_status.balance > 0]
+    if funded:
+        return min(funded, key=lambda account_status: account_status.nonce).account
+
+
+DEFAULT_SENDER_POLICIES: Dict[str, Callable[[Sequence[AccountStatus]], Optional[LocalAccount]]] = {
+    'first-funded': first_funded,
+    'highest-balance': highest_balance,
+    'lowest-nonce': lowest_nonce,
+}
+DEFAULT_SENDER_POLICY = 'first-funded'
@@ -1,6 +1,14 @@
+import hashlib
+import hmac
+import itertools
+from typing import Dict, Iterable, Iterator, Sequence, Tuple
+
 from eth_account import Account
+from eth_account.hdaccount import seed_from_mnemonic
+from eth_account.hdaccount.deterministic import Node, derive_child_key
 from eth_account.signers.local import LocalAccount
 from eth_typing import ChecksumAddress
+from eth_utils import ValidationError
 
 ETHEREUM_DEFAULT_PATH = "m/44'/60'/0'/0/0"
 ETHEREUM_BASE_PATH = "m/44'/60'/0'/0"
@@ -29,3 +37,91 @@ def get_address_from_words(words: str, index: int = 0, hd_path: str = ETHEREUM_D
     :raises: eth_utils.ValidationError
     """
     return get_account_from_words(words, index, hd_path).address
+
+
+class HdWalletDeriver:
+    """
+    Derive many accounts from the same mnemonic. BIP39 seed (2048 rounds of PBKDF2) is computed only once, and
+    parent nodes (like `m/44'/60'/0'/0`) are derived once and reused for every child
+    """
+    def __init__(self, words: str, passphrase: str = ''):
+        """
+        :param words: Mnemonic words(BIP39) for a Hierarchical Deterministic Wallet(BIP32)
+        :param passphrase: Optional BIP39 passphrase
+        :raises: eth_utils.ValidationError
+        """
+        seed = seed_from_mnemonic(words, passphrase)
+        master_node = hmac.new(b'Bitcoin seed', seed, hashlib.sha512).digest()
+        # Private key and chain code for every derived path
+        self._nodes: Dict[Tuple[Node, ...], Tuple[bytes, bytes]] = {(): (master_node[:32], master_node[32:])}
+
+    @staticmethod
+    def parse_path(hd_path: str) -> Tuple[Node, ...]:
+        """
+        :param hd_path: BIP32 path, like `m/44'/60'/0'/0/1`
+        :return: Decoded nodes of the path
+        :raises: eth_utils.ValidationError
+        """
+        nodes = hd_path.split('/')
+        if nodes[0] != 'm':
+            raise ValidationError(f'Path is not valid: "{hd_path}". Must start with "m"')
+        return tuple(Node.decode(node) for node in nodes[1:])
+
+    def _derive_nodes(self, nodes: Tuple[Node, ...]) -> Tuple[bytes, bytes]:
+        if nodes not in self._nodes:
+            parent_key, parent_chain_code = self._derive_nodes(nodes[:-1])
+            self._nodes[nodes] = derive_child_key(parent_key, parent_chain_code, nodes[-1])
+        return self._nodes[nodes]
+
+    def get_account(self, hd_path: str = ETHEREUM_DEFAULT_PATH) -> LocalAccount:
+        """
+        :param hd_path: BIP32 path
+        :return: Ethereum Account
+        :raises: eth_utils.ValidationError
+        """
+        nodes = self.parse_path(hd_path)
+        if not nodes:
+            raise ValidationError('Cannot derive an account for the master node')
+        parent_key, parent_chain_code = self._derive_nodes(nodes[:-1])  # Parent is kept for the siblings
+        key, _ = derive_child_key(parent_key, parent_chain_code, nodes[-1])
+        return Account.from_key(key)
+
+    def iter_accounts(self, start: int = 0, count: int = 100,
+                      base_path: str = ETHEREUM_BASE_PATH) -> Iterator[Tuple[str, LocalAccount]]:
+        """
+        :param start: First index to derive
+        :param count: Number of accounts to derive
+        :param base_path: BIP32 path of the parent node
+        :return: Iterator of path and account for the children `start` to `start + count - 1` of `base_path`
+        """
+        for index in range(start, start + count):
+            hd_path = f'{base_path}/{index}'
+            yield hd_path, self.get_account(hd_path)
+
+    def find_accounts(self, addresses: Iterable[str], start: int = 0, count: int = 100,
+                      base_path: str = ETHEREUM_BASE_PATH,
+                      hd_paths: Sequence[str] = ()) -> Dict[str, LocalAccount]:
+        """
+        Look for the accounts of `addresses`, stopping as soon as all of them are found
+
+        :param addresses: Addresses to look for, like the owners of a Safe
+        :param start: First index to derive from `base_path`
+        :param count: Number of children of `base_path` to check
+        :param base_path: BIP32 path of the parent node
+        :param hd_paths: Custom BIP32 paths to check before the children of `base_path`
+        :return: Dictionary of BIP32 path and account for every address found
+        """
+        pending_addresses = set(addresses)
+        accounts_found = {}
+        if not pending_addresses:
+            return accounts_found
+
+        candidates = itertools.chain(((hd_path, self.get_account(hd_path)) for hd_path in hd_paths),
+                                     self.iter_accounts(start, count, base_path))
+        for hd_path, account in candidates:
+            if account.address in pending_addresses:
+                pending_addresses.remove(account.address)
+                accounts_found[hd_path] = account
+                if not pending_addresses:
+                    break
+        return accounts_found
@@ -0,0 +1,79 @@
+import itertools
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import requests
+
+from .api.base_api import BaseAPI
+
+
+class JsonRpcException(Exception):
+    pass
+
+
+class JsonRpcBatchNotSupported(JsonRpcException):
+    pass
+
+
+class JsonRpcError(JsonRpcException):
+    def __init__(self, method: str, error: Any):
+        super().__init__(f'Error calling {method}: {error}')
+        self.method = method
+        self.error = error
+
+
+JsonRpcRequest = Tuple[str, Sequence[Any]]  # Method and params
+
+
+class JsonRpcBatch:
+    """
+    Send several JSON-RPC requests to a node in a single HTTP round trip. Nodes that don't support batches
+    (or non HTTP providers) raise `JsonRpcBatchNotSupported`, so callers can fall back to individual requests
+    """
+    TIMEOUT = (5, 60)
+
+    def __init__(self, node_url: str, http_session: Optional[requests.Session] = None):
+        self.node_url = node_url
+        self.http_session = http_session or BaseAPI.build_http_session()
+        self._ids = itertools.count()
+
+    @property
+    def is_supported(self) -> bool:
+        return self.node_url.startswith(('http://', 'https://'))
+
+    def request(self, requests_: Sequence[JsonRpcRequest],
+                raise_exception: bool = True) -> List[Union[Any, JsonRpcError]]:
+        """
+        :param requests_: List of `(method, params)`
+        :param raise_exception: If `False`, a `JsonRpcError` is returned as the result of every failed request
+            instead of raising it
+        :return: Results in the same order of `requests_`
+        """
+        if not requests_:
+            return []
+        if not self.is_supported:
+            raise JsonRpcBatchNotSupported(f'Batch requests not supported for {self.node_url}')
+
+        payload = [{'jsonrpc': '2.0', 'method': method, 'params': list(params), 'id': next(self._ids)}
+                   for method, params in requests_]
+        try:
+            response = self.http_session.post(self.node_url, json=payload, timeout=self.TIMEOUT)
+            response_json = response.json() if response.ok else None
+        except (requests.RequestException, ValueError) as exc:
+            raise JsonRpcBatchNotSupported(f'Error sending batch request to {self.node_url}') from exc
+
+        # Nodes not supporting batches return a single error object or a list missing some responses
+        if not isinstance(response_json, list) or len(response_json) != len(payload):
+            raise JsonRpcBatchNotSupported(f'Batch requests not supported by {self.node_url}')
+
+        responses_by_id = {element.get('id'): element for element in response_json if isinstance(element, dict)}
+        results = []
+        for element in payload:
+            response_element = responses_by_id.get(element['id'], {'error': 'Missing response'})
+            if 'result' in response_element:
+                results.append(response_element['result'])
+            else:
+                error = JsonRpcError(element['method'], response_element.get('error'))
+                if raise_exception:
+                    raise error
+                results.append(error)
+        return results
@@ -0,0 +1,103 @@
+import glob
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from eth_account import Account
+from web3 import Web3
+
+
+class Keystore(NamedTuple):
+    path: str
+    content: Dict[str, Any]
+
+    @property
+    def address(self) -> Optional[str]:
+        """
+        :return: Checksummed address stored in cleartext on the keystore (it's optional, so it can be `None`)
+        """
+        address = self.content.get('address')
+        if isinstance(address, str):
+            try:
+                return Web3.toChecksumAddress(address if address.startswith('0x') else '0x' + address)
+            except ValueError:
+                pass
+
+
+class KeystoreResult(NamedTuple):
+    path: str
+    address: Optional[str]
+    key: Optional[bytes]  # `None` if it couldn't be decrypted
+
+
+def get_keystore_paths(path: str) -> List[str]:
+    """
+    :param path: Directory with keystores, keystore file or glob pattern (like `~/keystores/UTC--*`)
+    :return: Sorted list of files
+    """
+    path = os.path.expanduser(path)
+    if os.path.isdir(path):
+        path = os.path.join(path, '*')
+    return sorted(file_path for file_path in glob.glob(path) if os.path.isfile(file_path))
+
+
+def read_keystores(paths: Iterable[str]) -> List[Keystore]:
+    """
+    :param paths:
+    :return: Keystores for the files that are valid JSON keystores, other files are ignored
+    """
+    keystores = []
+    for path in paths:
+        try:
+            with open(path) as keystore_file:
+                content = json.load(keystore_file)
+        except (OSError, ValueError):
+            continue
+        if isinstance(content, dict) and ('crypto' in content or 'Crypto' in content):
+            keystores.append(Keystore(path, content))
+    return keystores
+
+
+def decrypt_keystore(keystore: Keystore, password: str) -> KeystoreResult:
+    try:
+        key = bytes(Account.decrypt(keystore.content, password))
+        return KeystoreResult(keystore.path, Account.from_key(key).address, key)
+    except ValueError:  # Wrong password or invalid keystore
+        return KeystoreResult(keystore.path, keystore.address, None)
+
+
+def decrypt_keystores(keystores: List[Keystore], password: str,
+                      max_workers: Optional[int] = None) -> List[KeystoreResult]:
+    """
+    Key derivation of keystores (scrypt/pbkdf2) is slow on purpose, so keystores are decrypted in parallel
+    using a process for every core
+
+    :param keystores:
+    :param password:
+    :param max_workers: Max number of processes, number of cores by default
+    :return: Results in the same order of `keystores`
+    """
+    if len(keystores) <= 1:  # Not worth starting processes
+        return [decrypt_keystore(keystore, password) for keystore in keystores]
+
+    # `spawn`, as forking a process with running threads (prompt toolkit, watchers...) can deadlock
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(decrypt_keystore, keystores, [password] * len(keystores)))
+
+
+def load_keystores(path: str, password: str, addresses: Optional[Iterable[str]] = None,
+                   max_workers: Optional[int] = None) -> List[KeystoreResult]:
+    """
+    :param path: Directory with keystores, keystore file or glob pattern
+    :param password: Password for the keystores
+    :param addresses: If provided, keystores with a cleartext address not in `addresses` are not decrypted
+    :param max_workers: Max number of processes for decryption
+    :return: Results of the decrypted keystores
+    """
+    keystores = read_keystores(get_keystore_paths(path))
+    if addresses is not None:
+        addresses = set(addresses)
+        keystores = [keystore for keystore in keystores if not keystore.address or keystore.address in addresses]
+    return decrypt_keystores(keystores, password, max_workers=max_workers)
@@ -0,0 +1,56 @@
+from typing import Optional
+
+from prompt_toolkit import HTML, print_formatted_text
+from web3 import Web3
+
+from .safe_operator import SafeOperator, ServiceNotAvailable
+from .safe_relay_operator import SafeRelayOperator
+from .safe_tx_service_operator import SafeTxServiceOperator
+
+
+class OperatorModes:
+    """
+    Switch between blockchain (default), relay-service and tx-service operators. Operators for every mode share
+    the context of the blockchain operator, and are reused when switching back
+    """
+    MODES = ('blockchain', 'relay-service', 'tx-service')
+
+    def __init__(self, safe_operator: SafeOperator):
+        self.safe_operator = safe_operator
+        self.tx_service_operator: Optional[SafeTxServiceOperator] = None
+        self.relay_operator: Optional[SafeRelayOperator] = None
+
+    def parse_operator_mode(self, command: str) -> Optional[SafeOperator]:
+        """
+        Parse operator mode to switch between blockchain (default), relay-service, and tx-service
+        :param command:
+        :return: SafeOperator if detected
+        """
+        split_command = command.split()
+        safe_address = self.safe_operator.address
+        node_url = self.safe_operator.node_url
+        try:
+            if (split_command[0]) == 'tx-service':
+                if not self.tx_service_operator:
+                    self.tx_service_operator = SafeTxServiceOperator(safe_address, node_url,
+                                                                     context=self.safe_operator.context)
+                print_formatted_text(HTML('<b><ansigreen>Sending txs to tx service</ansigreen></b>'))
+                return self.tx_service_operator
+            elif split_command[0] == 'relay-service':
+                if len(split_command) == 2 and Web3.isChecksumAddress(split_command[1]):
+                    gas_token = split_command[1]
+                else:
+                    gas_token = None
+                if not self.relay_operator:
+                    self.relay_operator = SafeRelayOperator(safe_address, node_url,
+                                                            context=self.safe_operator.context)
+                self.relay_operator.gas_token = gas_token
+                print_formatted_text(HTML(
+                    f'<b><ansigreen>Sending txs trough relay service gas-token={gas_token}</ansigreen></b>'
+                ))
+                return self.relay_operator
+            elif split_command[0] == 'blockchain':
+                print_formatted_text(HTML('<b><ansigreen>Sending txs to blockchain</ansigreen></b>'))
+                return self.safe_operator
+        except ServiceNotAvailable:
+            print_formatted_text(HTML('<b><ansired>Mode not supported on this network</ansired></b>'))
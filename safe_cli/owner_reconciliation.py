@@ -0,0 +1,77 @@
+from typing import List, NamedTuple, Sequence, Tuple
+
+from gnosis.eth.constants import NULL_ADDRESS, SENTINEL_ADDRESS
+
+
+class OwnerReconciliationException(Exception):
+    pass
+
+
+class OwnerChange(NamedTuple):
+    function_name: str  # Function of the Safe contract
+    args: Tuple
+
+
+def get_prev_owner(owners: Sequence[str], owner: str) -> str:
+    """
+    :param owners: Owners in the order of the Safe linked list (`getOwners`)
+    :param owner:
+    :return: Previous owner on the linked list of the Safe
+    """
+    index = owners.index(owner)
+    return owners[index - 1] if index else SENTINEL_ADDRESS
+
+
+def reconcile_owners(current_owners: Sequence[str], current_threshold: int,
+                     desired_owners: Sequence[str], desired_threshold: int) -> List[OwnerChange]:
+    """
+    Calculate the minimal list of Safe calls to go from the current owners and threshold to the desired ones.
+    Owners are replaced with `swapOwner` first, then extra owners are added and then the rest removed, so the
+    number of owners never goes under the threshold. Every change is applied to a simulated linked list, so
+    `prev_owner` of every call is right after the previous calls
+
+    :param current_owners: Owners in the order returned by `getOwners`
+    :param current_threshold:
+    :param desired_owners:
+    :param desired_threshold:
+    :return: Calls in the order they must be executed
+    :raises: OwnerReconciliationException if desired owners or threshold are not valid
+    """
+    if not desired_owners:
+        raise OwnerReconciliationException('At least one owner is required')
+    elif len(set(desired_owners)) != len(desired_owners):
+        raise OwnerReconciliationException('Owners cannot be repeated')
+    elif any(owner in (NULL_ADDRESS, SENTINEL_ADDRESS) for owner in desired_owners):
+        raise OwnerReconciliationException('Owners cannot be the null or sentinel addresses')
+    elif not 1 <= desired_threshold <= len(desired_owners):
+        raise OwnerReconciliationException(f'Threshold must be between 1 and {len(desired_owners)}')
+
+    owners = list(current_owners)  # Simulated linked list
+    threshold = current_threshold
+    desired_owners_set = set(desired_owners)
+    owners_to_remove = [owner for owner in current_owners if owner not in desired_owners_set]
+    owners_to_add = [owner for owner in desired_owners if owner not in set(current_owners)]
+    changes = []
+
+    number_swaps = min(len(owners_to_remove), len(owners_to_add))
+    for old_owner, new_owner in zip(owners_to_remove[:number_swaps], owners_to_add[:number_swaps]):
+        changes.append(OwnerChange('swapOwner', (get_prev_owner(owners, old_owner), old_owner, new_owner)))
+        owners[owners.index(old_owner)] = new_owner
+
+    owners_to_add = owners_to_add[number_swaps:]
+    owners_to_remove = owners_to_remove[number_swaps:]
+    for i, new_owner in enumerate(owners_to_add):
+        is_last_change = i == len(owners_to_add) - 1 and not owners_to_remove
+        threshold = desired_threshold if is_last_change else threshold
+        changes.append(OwnerChange('addOwnerWithThreshold', (new_owner, threshold)))
+        owners.insert(0, new_owner)
+
+    for i, old_owner in enumerate(owners_to_remove):
+        is_last_change = i == len(owners_to_remove) - 1
+        threshold = desired_threshold if is_last_change else min(threshold, len(owners) - 1)
+        changes.append(OwnerChange('removeOwner', (get_prev_owner(owners, old_owner), old_owner, threshold)))
+        owners.remove(old_owner)
+
+    if threshold != desired_threshold:
+        changes.append(OwnerChange('changeThreshold', (desired_threshold,)))
+    return changes
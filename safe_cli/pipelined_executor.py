@@ -0,0 +1,222 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
+from web3.contract import Contract
+
+from gnosis.eth import EthereumClient
+
+from .json_rpc import JsonRpcBatch, JsonRpcBatchNotSupported
+from .safe_tx_file import SafeTxData
+
+
+class PipelinedTxStatus:
+    PENDING = 'pending'
+    SUCCESS = 'success'
+    FAILED = 'failed'  # `execTransaction` reverted
+    CANCELLED = 'cancelled'  # Replaced by an empty tx after a previous failure
+    TIMEOUT = 'timeout'
+    NOT_SENT = 'not-sent'
+
+
+@dataclass
+class PipelinedTx:
+    safe_tx: SafeTxData
+    nonce: int  # Nonce of the sender account
+    gas: int
+    gas_price: int
+    tx_hashes: List[HexBytes] = field(default_factory=list)  # Every tx sent for `nonce`, last one is the newest
+    cancel_tx_hash: Optional[HexBytes] = None
+    sent_at: float = 0.
+    reprices: int = 0
+    receipt: Optional[Dict[str, Any]] = None
+    status: str = PipelinedTxStatus.NOT_SENT
+    error: Optional[str] = None
+
+    @property
+    def tx_hash(self) -> Optional[HexBytes]:
+        return self.receipt['transactionHash'] if self.receipt else (self.tx_hashes[-1] if self.tx_hashes else None)
+
+
+class PipelinedExecutor:
+    """
+    Execute Safe txs with consecutive Safe nonces without waiting for every receipt before sending the next tx.
+    Nonce of the sender is managed locally and gas is provided for every tx (it cannot be estimated for a Safe nonce
+    not reached yet), so all the txs are sent back to back and receipts are tracked together
+    (one JSON-RPC batch on every poll).
+
+    If a tx reverts the next Safe txs will revert too, as the Safe nonce didn't increase. What to do then (or when a
+    tx is not mined in time) depends on `on_failure`:
+      - `stop`: Pending txs are replaced by empty txs to the sender, so they don't waste gas.
+      - `report`: Failures are reported, pending txs are kept.
+      - `reprice`: Txs not mined after `REPRICE_TIMEOUT` are sent again with a higher gas price. Reverted txs
+        stop the remainder like `stop`.
+    """
+    ON_FAILURE_OPTIONS = ('stop', 'report', 'reprice')
+    GAS_OVERHEAD = 75000  # Gas used by `execTransaction` besides the Safe tx: intrinsic gas, signature checks...
+    POLL_INTERVAL = 1  # Seconds
+    RECEIPT_TIMEOUT = 120  # Seconds without receipt since the last tx sent for a nonce
+    REPRICE_TIMEOUT = 30  # Seconds without receipt to send the tx again with a higher gas price
+    REPRICE_FACTOR = 1.2  # Nodes require at least 10% more gas price to replace a tx
+    MAX_REPRICES = 3
+
+    def __init__(self, ethereum_client: EthereumClient, json_rpc_batch: JsonRpcBatch, safe_contract: Contract,
+                 sender: LocalAccount, chain_id: int, on_failure: str = 'stop'):
+        """
+        :param ethereum_client:
+        :param json_rpc_batch:
+        :param safe_contract: Contract of the Safe, used to encode `execTransaction`
+        :param sender: Account sending the txs and paying the gas
+        :param chain_id:
+        :param on_failure: One of `ON_FAILURE_OPTIONS`
+        """
+        assert on_failure in self.ON_FAILURE_OPTIONS, f'on_failure must be one of {self.ON_FAILURE_OPTIONS}'
+        self.ethereum_client = ethereum_client
+        self.w3 = ethereum_client.w3
+        self.json_rpc_batch = json_rpc_batch
+        self.safe_contract = safe_contract
+        self.sender = sender
+        self.chain_id = chain_id
+        self.on_failure = on_failure
+
+    def build_exec_transaction_data(self, safe_tx: SafeTxData) -> bytes:
+        return HexBytes(self.safe_contract.encodeABI(fn_name='execTransaction', args=[
+            safe_tx.to, safe_tx.value, safe_tx.data, safe_tx.operation, safe_tx.safe_tx_gas, safe_tx.base_gas,
+            safe_tx.gas_price, safe_tx.gas_token, safe_tx.refund_receiver, safe_tx.signatures
+        ]))
+
+    def get_gas_limit(self, safe_tx: SafeTxData, estimated_tx_gas: int) -> int:
+        """
+        :param safe_tx:
+        :param estimated_tx_gas: Estimation of the gas used by the Safe tx
+        :return: Gas limit for executing `safe_tx`
+        """
+        calldata_gas = 16 * len(self.build_exec_transaction_data(safe_tx))
+        return max(safe_tx.safe_tx_gas, estimated_tx_gas) + safe_tx.base_gas + calldata_gas + self.GAS_OVERHEAD
+
+    def _send(self, tx: Dict[str, Any]) -> HexBytes:
+        signed_tx = self.sender.sign_transaction(dict(tx, chainId=self.chain_id))
+        return HexBytes(self.w3.eth.send_raw_transaction(signed_tx.rawTransaction))
+
+    def send(self, pipelined_tx: PipelinedTx):
+        tx_hash = self._send({
+            'to': self.safe_contract.address,
+            'value': 0,
+            'data': self.build_exec_transaction_data(pipelined_tx.safe_tx),
+            'gas': pipelined_tx.gas,
+            'gasPrice': pipelined_tx.gas_price,
+            'nonce': pipelined_tx.nonce,
+        })
+        pipelined_tx.tx_hashes.append(tx_hash)
+        pipelined_tx.sent_at = time.monotonic()
+        pipelined_tx.status = PipelinedTxStatus.PENDING
+
+    def reprice(self, pipelined_tx: PipelinedTx):
+        pipelined_tx.gas_price = int(pipelined_tx.gas_price * self.REPRICE_FACTOR)
+        pipelined_tx.reprices += 1
+        self.send(pipelined_tx)
+
+    def cancel(self, pipelined_tx: PipelinedTx):
+        """
+        Replace a pending tx by an empty tx to the sender with the same nonce
+        """
+        pipelined_tx.cancel_tx_hash = self._send({
+            'to': self.sender.address,
+            'value': 0,
+            'gas': 21000,
+            'gasPrice': int(pipelined_tx.gas_price * self.REPRICE_FACTOR),
+            'nonce': pipelined_tx.nonce,
+        })
+        pipelined_tx.sent_at = time.monotonic()
+
+    def get_receipts(self, tx_hashes: Sequence[HexBytes]) -> List[Optional[Dict[str, Any]]]:
+        """
+        :param tx_hashes:
+        :return: Receipt for every tx hash, `None` if not mined. `status` and `transactionHash` are normalized
+        """
+        try:
+            results = self.json_rpc_batch.request([('eth_getTransactionReceipt', [tx_hash.hex()])
+                                                   for tx_hash in tx_hashes], raise_exception=False)
+            receipts = [result if isinstance(result, dict) else None for result in results]
+        except JsonRpcBatchNotSupported:
+            receipts = [self.ethereum_client.get_transaction_receipt(tx_hash) for tx_hash in tx_hashes]
+        return [dict(receipt, status=int(receipt['status'], 16) if isinstance(receipt['status'], str)
+                     else receipt['status'], transactionHash=HexBytes(receipt['transactionHash']))
+                if receipt else None for receipt in receipts]
+
+    def check_receipts(self, pipelined_txs: Sequence[PipelinedTx]):
+        pending_txs = [pipelined_tx for pipelined_tx in pipelined_txs
+                       if pipelined_tx.status == PipelinedTxStatus.PENDING]
+        tx_hashes = [(pipelined_tx, tx_hash) for pipelined_tx in pending_txs
+                     for tx_hash in pipelined_tx.tx_hashes + ([pipelined_tx.cancel_tx_hash]
+                                                              if pipelined_tx.cancel_tx_hash else [])]
+        if not tx_hashes:
+            return
+
+        receipts = self.get_receipts([tx_hash for _, tx_hash in tx_hashes])
+        for (pipelined_tx, tx_hash), receipt in zip(tx_hashes, receipts):
+            if receipt and pipelined_tx.status == PipelinedTxStatus.PENDING:
+                pipelined_tx.receipt = receipt
+                if tx_hash == pipelined_tx.cancel_tx_hash:
+                    pipelined_tx.status = PipelinedTxStatus.CANCELLED
+                elif receipt['status'] == 1:
+                    pipelined_tx.status = PipelinedTxStatus.SUCCESS
+                else:
+                    pipelined_tx.status = PipelinedTxStatus.FAILED
+                    pipelined_tx.error = 'execTransaction reverted'
+
+    def stop_remainder(self, pipelined_txs: Sequence[PipelinedTx]):
+        for pipelined_tx in pipelined_txs:
+            if pipelined_tx.status == PipelinedTxStatus.PENDING and not pipelined_tx.cancel_tx_hash:
+                try:
+                    self.cancel(pipelined_tx)
+                except ValueError as e:  # Node rejected the tx, probably it was already mined
+                    pipelined_tx.error = f'Cannot cancel: {e}'
+
+    def execute(self, safe_txs: Sequence[SafeTxData], gas_limits: Sequence[int], gas_price: int,
+                nonce: Optional[int] = None) -> List[PipelinedTx]:
+        """
+        :param safe_txs: Signed Safe txs, sorted by consecutive Safe nonce
+        :param gas_limits: Gas for every tx
+        :param gas_price: Gas price for all the txs
+        :param nonce: First nonce of the sender, pending nonce of the sender if not provided
+        :return: Result of every tx
+        """
+        if nonce is None:
+            nonce = self.w3.eth.get_transaction_count(self.sender.address, 'pending')
+        pipelined_txs = [PipelinedTx(safe_tx, nonce + i, gas, gas_price)
+                         for i, (safe_tx, gas) in enumerate(zip(safe_txs, gas_limits))]
+
+        for pipelined_tx in pipelined_txs:
+            try:
+                self.send(pipelined_tx)
+            except ValueError as e:  # Next txs cannot be sent, as nonce would be skipped
+                pipelined_tx.error = str(e)
+                break
+
+        stopped = False
+        while any(pipelined_tx.status == PipelinedTxStatus.PENDING for pipelined_tx in pipelined_txs):
+            time.sleep(self.POLL_INTERVAL)
+            self.check_receipts(pipelined_txs)
+            now = time.monotonic()
+            for pipelined_tx in pipelined_txs:
+                if pipelined_tx.status == PipelinedTxStatus.FAILED and self.on_failure != 'report' and not stopped:
+                    stopped = True
+                    self.stop_remainder(pipelined_txs)
+                elif pipelined_tx.status != PipelinedTxStatus.PENDING:
+                    continue
+                elif (self.on_failure == 'reprice' and not pipelined_tx.cancel_tx_hash
+                      and pipelined_tx.reprices < self.MAX_REPRICES
+                      and now - pipelined_tx.sent_at > self.REPRICE_TIMEOUT):
+                    try:
+                        self.reprice(pipelined_tx)
+                    except ValueError as e:
+                        pipelined_tx.error = f'Cannot reprice: {e}'
+                elif now - pipelined_tx.sent_at > self.RECEIPT_TIMEOUT:
+                    pipelined_tx.status = PipelinedTxStatus.TIMEOUT
+                    if self.on_failure == 'stop' and not stopped:
+                        stopped = True
+                        self.stop_remainder(pipelined_txs)
+        return pipelined_txs
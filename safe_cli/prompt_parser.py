@@ -1,11 +1,18 @@
 import argparse
 import functools
+import os
 
-from hexbytes import HexBytes
 from prompt_toolkit import HTML, print_formatted_text
-from web3 import Web3
 
 from .api.base_api import BaseAPIException
+from .argparse_validators import (  # noqa: F401 Validators used to be defined here
+    check_ethereum_address, check_hex_str, check_iso_date,
+    check_keccak256_hash, to_checksummed_ethereum_address)
+from .batch_transfers import DEFAULT_GAS_LIMIT, BatchTransfersException
+from .default_sender_policies import DEFAULT_SENDER_POLICIES
+from .owner_reconciliation import OwnerReconciliationException
+from .pipelined_executor import PipelinedExecutor
+from .safe_event_indexer import SafeEventIndexerException
 from .safe_operator import (AccountNotLoadedException, ExistingOwnerException,
                             FallbackHandlerNotSupportedException,
                             HashAlreadyApproved, InvalidMasterCopyException,
@@ -15,48 +22,8 @@ from .safe_operator import (AccountNotLoadedException, ExistingOwnerException,
                             SameFallbackHandlerException,
                             SameMasterCopyException, SenderRequiredException,
                             ServiceNotAvailable, ThresholdLimitException)
-
-
-def check_ethereum_address(address: str) -> str:
-    """
-    Ethereum address validator for ArgParse
-    :param address:
-    :return:
-    """
-    if not Web3.isChecksumAddress(address):
-        raise argparse.ArgumentTypeError(f'{address} is not a valid checksummed ethereum address')
-    return address
-
-
-def check_hex_str(hex_str: str) -> HexBytes:
-    """
-    Hexadecimal
-    :param hex_str:
-    :return:
-    """
-    try:
-        return HexBytes(hex_str)
-    except ValueError:
-        raise argparse.ArgumentTypeError(f'{hex_str} is not a valid hexadecimal string')
-
-
-def check_keccak256_hash(hex_str: str) -> HexBytes:
-    """
-    Hexadecimal
-    :param hex_str:
-    :return:
-    """
-    hex_str_bytes = check_hex_str(hex_str)
-    if len(hex_str_bytes) != 32:
-        raise argparse.ArgumentTypeError(f'{hex_str} is not a valid keccak256 hash hexadecimal string')
-    return hex_str_bytes
-
-
-def to_checksummed_ethereum_address(address: str) -> str:
-    try:
-        return Web3.toChecksumAddress(address)
-    except ValueError:
-        raise argparse.ArgumentTypeError(f'{address} is not a valid ethereum address')
+from .safe_tx_file import SafeTxFileException
+from .token_balance_scanner import TokenBalanceScannerException
 
 
 def safe_exception(function):
@@ -102,6 +69,10 @@ def safe_exception(function):
                                       f'</ansired>'))
         except ServiceNotAvailable as e:
             print_formatted_text(HTML(f'<ansired>Service not available for network {e.args[0]}</ansired>'))
+        except (SafeTxFileException, BatchTransfersException, OwnerReconciliationException,
+                TokenBalanceScannerException, SafeEventIndexerException) as e:
+            print_formatted_text(HTML(f'<ansired>{e.args[0]}</ansired>'))
+        return False  # Exception was handled, so command failed
     return wrapper
 
 
@@ -127,116 +98,144 @@ def build_prompt_parser(safe_operator: SafeOperator) -> argparse.ArgumentParser:
 
     @safe_exception
     def show_cli_owners(args):
-        safe_operator.show_cli_owners()
+        return safe_operator.show_cli_owners()
 
     @safe_exception
     def load_cli_owners_from_words(args):
-        safe_operator.load_cli_owners_from_words(args.words)
+        return safe_operator.load_cli_owners_from_words(args.words, start=args.start, count=args.count,
+                                                        hd_paths=args.path or ())
 
     @safe_exception
     def load_cli_owners(args):
-        safe_operator.load_cli_owners(args.keys)
+        return safe_operator.load_cli_owners(args.keys, default_sender_policy=args.default_sender_policy)
+
+    @safe_exception
+    def load_cli_owners_from_keystores(args):
+        password = None
+        if args.password_env:
+            password = os.environ.get(args.password_env)
+            if password is None:
+                print_formatted_text(HTML(f'<ansired>Environment variable {args.password_env} is not set</ansired>'))
+                return False
+        return safe_operator.load_cli_owners_from_keystores(args.path, password=password)
+
+    @safe_exception
+    def sign_transactions(args):
+        return safe_operator.sign_transactions(args.path, output=args.output)
+
+    @safe_exception
+    def execute_transactions(args):
+        return safe_operator.execute_transactions(args.path, on_failure=args.on_failure, gas_price=args.gas_price)
 
     @safe_exception
     def unload_cli_owners(args):
-        safe_operator.unload_cli_owners(args.addresses)
+        return safe_operator.unload_cli_owners(args.addresses)
 
     @safe_exception
     def approve_hash(args):
-        safe_operator.approve_hash(args.hash_to_approve, args.sender)
+        return safe_operator.approve_hash(args.hash_to_approve, args.sender)
 
     @safe_exception
     def add_owner(args):
-        safe_operator.add_owner(args.address, threshold=args.threshold)
+        return safe_operator.add_owner(args.address, threshold=args.threshold)
 
     @safe_exception
     def remove_owner(args):
-        safe_operator.remove_owner(args.address, threshold=args.threshold)
+        return safe_operator.remove_owner(args.address, threshold=args.threshold)
 
     @safe_exception
     def change_fallback_handler(args):
-        safe_operator.change_fallback_handler(args.address)
+        return safe_operator.change_fallback_handler(args.address)
 
     @safe_exception
     def change_guard(args):
-        safe_operator.change_guard(args.address)
+        return safe_operator.change_guard(args.address)
 
     @safe_exception
     def change_master_copy(args):
-        safe_operator.change_master_copy(args.address)
+        return safe_operator.change_master_copy(args.address)
+
+    @safe_exception
+    def set_owners(args):
+        return safe_operator.set_owners(args.addresses, threshold=args.threshold)
 
     @safe_exception
     def change_threshold(args):
-        safe_operator.change_threshold(args.threshold)
+        return safe_operator.change_threshold(args.threshold)
 
     @safe_exception
     def send_custom(args):
-        safe_operator.send_custom(args.to, args.value, args.data,
-                                  safe_nonce=args.safe_nonce, delegate_call=args.delegate)
+        return safe_operator.send_custom(args.to, args.value, args.data,
+                                         safe_nonce=args.safe_nonce, delegate_call=args.delegate)
 
     @safe_exception
     def send_ether(args):
-        safe_operator.send_ether(args.to, args.value, safe_nonce=args.safe_nonce)
+        return safe_operator.send_ether(args.to, args.value, safe_nonce=args.safe_nonce)
 
     @safe_exception
     def send_erc20(args):
-        safe_operator.send_erc20(args.to, args.token_address, args.amount, safe_nonce=args.safe_nonce)
+        return safe_operator.send_erc20(args.to, args.token_address, args.amount, safe_nonce=args.safe_nonce)
 
     @safe_exception
     def send_erc721(args):
-        safe_operator.send_erc721(args.to, args.token_address, args.token_id, safe_nonce=args.safe_nonce)
+        return safe_operator.send_erc721(args.to, args.token_address, args.token_id, safe_nonce=args.safe_nonce)
+
+    @safe_exception
+    def send_batch(args):
+        return safe_operator.send_batch(args.path, gas_limit=args.gas_limit)
 
     @safe_exception
     def get_threshold(args):
-        safe_operator.get_threshold()
+        return safe_operator.get_threshold()
 
     @safe_exception
     def get_nonce(args):
-        safe_operator.get_nonce()
+        return safe_operator.get_nonce()
 
     @safe_exception
     def get_owners(args):
-        safe_operator.get_owners()
+        return safe_operator.get_owners()
 
     @safe_exception
     def enable_module(args):
-        safe_operator.enable_module(args.address)
+        return safe_operator.enable_module(args.address)
 
     @safe_exception
     def disable_module(args):
-        safe_operator.disable_module(args.address)
+        return safe_operator.disable_module(args.address)
 
     @safe_exception
     def update_version(args):
-        safe_operator.update_version()
+        return safe_operator.update_version()
 
     @safe_exception
     def get_info(args):
-        safe_operator.print_info()
+        return safe_operator.print_info()
 
     @safe_exception
     def get_refresh(args):
-        safe_operator.refresh_safe_cli_info()
+        return safe_operator.refresh_safe_cli_info()
 
     @safe_exception
     def get_balances(args):
-        safe_operator.get_balances()
+        return safe_operator.get_balances(args.tokens)
 
     @safe_exception
     def get_history(args):
-        safe_operator.get_transaction_history()
+        return safe_operator.get_transaction_history(min_nonce=args.min_nonce, since=args.since,
+                                                     from_block=args.from_block)
 
     @safe_exception
     def get_delegates(args):
-        safe_operator.get_delegates()
+        return safe_operator.get_delegates()
 
     @safe_exception
     def add_delegate(args):
-        safe_operator.add_delegate(args.address, args.label, args.signer)
+        return safe_operator.add_delegate(args.address, args.label, args.signer)
 
     @safe_exception
     def remove_delegate(args):
-        safe_operator.remove_delegate(args.address, args.signer)
+        return safe_operator.remove_delegate(args.address, args.signer)
 
     # Cli owners
     parser_show_cli_owners = subparsers.add_parser('show_cli_owners')
@@ -244,12 +243,41 @@ def build_prompt_parser(safe_operator: SafeOperator) -> argparse.ArgumentParser:
 
     parser_load_cli_owners_from_words = subparsers.add_parser('load_cli_owners_from_words')
     parser_load_cli_owners_from_words.add_argument('words', type=str, nargs='+')
+    parser_load_cli_owners_from_words.add_argument('--start', type=int, default=0,
+                                                   help="First index of m/44'/60'/0'/0 to check")
+    parser_load_cli_owners_from_words.add_argument('--count', type=int, default=100,
+                                                   help="Number of accounts of m/44'/60'/0'/0 to check")
+    parser_load_cli_owners_from_words.add_argument('--path', type=str, action='append',
+                                                   help='Custom BIP32 path to check, can be used several times')
     parser_load_cli_owners_from_words.set_defaults(func=load_cli_owners_from_words)
 
     parser_load_cli_owners = subparsers.add_parser('load_cli_owners')
     parser_load_cli_owners.add_argument('keys', type=str, nargs='+')
+    parser_load_cli_owners.add_argument('--default-sender-policy', type=str, choices=DEFAULT_SENDER_POLICIES.keys(),
+                                        help='How to choose the default sender among the funded accounts, '
+                                             'first funded account by default')
     parser_load_cli_owners.set_defaults(func=load_cli_owners)
 
+    parser_load_cli_owners_from_keystores = subparsers.add_parser('load_cli_owners_from_keystores')
+    parser_load_cli_owners_from_keystores.add_argument('path', type=str,
+                                                       help='Directory with keystores, keystore or glob pattern')
+    parser_load_cli_owners_from_keystores.add_argument('--password-env', type=str,
+                                                       help='Environment variable with the password. '
+                                                            'If not provided password will be asked')
+    parser_load_cli_owners_from_keystores.set_defaults(func=load_cli_owners_from_keystores)
+
+    parser_sign_transactions = subparsers.add_parser('sign_transactions')
+    parser_sign_transactions.add_argument('path', type=str, help='JSON file with a list of Safe txs')
+    parser_sign_transactions.add_argument('--output', type=str, help='JSON file to store the signed txs')
+    parser_sign_transactions.set_defaults(func=sign_transactions)
+
+    parser_execute_transactions = subparsers.add_parser('execute_transactions')
+    parser_execute_transactions.add_argument('path', type=str, help='JSON file with a list of Safe txs')
+    parser_execute_transactions.add_argument('--on-failure', type=str, choices=PipelinedExecutor.ON_FAILURE_OPTIONS,
+                                             default='stop', help='What to do with the next txs if one fails')
+    parser_execute_transactions.add_argument('--gas-price', type=int, help='Gas price in wei for the txs')
+    parser_execute_transactions.set_defaults(func=execute_transactions)
+
     parser_unload_cli_owners = subparsers.add_parser('unload_cli_owners')
     parser_unload_cli_owners.add_argument('addresses', type=check_ethereum_address, nargs='+')
     parser_unload_cli_owners.set_defaults(func=unload_cli_owners)
@@ -277,6 +305,11 @@ def build_prompt_parser(safe_operator: SafeOperator) -> argparse.ArgumentParser:
     parser_remove_owner.add_argument('--threshold', type=int, default=None)
     parser_remove_owner.set_defaults(func=remove_owner)
 
+    parser_set_owners = subparsers.add_parser('set_owners')
+    parser_set_owners.add_argument('addresses', type=check_ethereum_address, nargs='+')
+    parser_set_owners.add_argument('--threshold', type=int, default=None)
+    parser_set_owners.set_defaults(func=set_owners)
+
     # Change FallbackHandler
     parser_change_master_copy = subparsers.add_parser('change_fallback_handler')
     parser_change_master_copy.add_argument('address', type=check_ethereum_address)
@@ -332,6 +365,12 @@ def build_prompt_parser(safe_operator: SafeOperator) -> argparse.ArgumentParser:
         parser.add_argument('token_address', type=check_ethereum_address)
         parser.add_argument('amount', type=int)
 
+    parser_send_batch = subparsers.add_parser('send_batch')
+    parser_send_batch.add_argument('path', type=str, help='CSV/JSON file with the transfers')
+    parser_send_batch.add_argument('--gas-limit', type=int, default=DEFAULT_GAS_LIMIT,
+                                   help='Max gas for every MultiSend tx')
+    parser_send_batch.set_defaults(func=send_batch)
+
     # Retrieve threshold, nonce or owners
     parser_get_threshold = subparsers.add_parser('get_threshold')
     parser_get_threshold.set_defaults(func=get_threshold)
@@ -361,8 +400,17 @@ def build_prompt_parser(safe_operator: SafeOperator) -> argparse.ArgumentParser:
     # Tx-History
     # TODO Use subcommands
     parser_info = subparsers.add_parser('balances')
+    parser_info.add_argument('--tokens', type=str, default=None,
+                             help='File with token addresses to check on chain, one per line or a JSON list')
     parser_info.set_defaults(func=get_balances)
     parser_info = subparsers.add_parser('history')
+    parser_info.add_argument('--min-nonce', type=int, default=None,
+                             help='Stop listing transactions when one with a lower nonce is found')
+    parser_info.add_argument('--since', type=check_iso_date, default=None,
+                             help='Stop listing transactions when one submitted before this ISO 8601 date is found')
+    parser_info.add_argument('--from-block', type=int, default=0,
+                             help='Block to start reading Safe events from if there is no tx service, like the '
+                                  'Safe creation block')
     parser_info.set_defaults(func=get_history)
 
     # List delegates
@@ -0,0 +1,264 @@
+import dataclasses
+import threading
+import time
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Sequence,
+                    Set, Tuple)
+
+from eth_abi import decode_abi, encode_abi
+from eth_abi.exceptions import DecodingError
+from eth_utils import function_signature_to_4byte_selector
+from hexbytes import HexBytes
+from web3 import Web3
+
+from gnosis.eth import EthereumClient
+from gnosis.eth.constants import SENTINEL_ADDRESS
+from gnosis.safe import Safe
+
+from . import safe_events
+from .json_rpc import JsonRpcBatch, JsonRpcBatchNotSupported, JsonRpcError
+
+
+@dataclasses.dataclass
+class SafeCliInfo:
+    address: str
+    nonce: int
+    threshold: int
+    owners: List[str]
+    master_copy: str
+    modules: List[str]
+    fallback_handler: str
+    guard: str
+    balance_ether: int
+    version: str
+    block_number: Optional[int] = None  # Block the information was loaded for
+
+    def __str__(self):
+        return f'safe-version={self.version} nonce={self.nonce} threshold={self.threshold} owners={self.owners} ' \
+               f'master-copy={self.master_copy} fallback-hander={self.fallback_handler} ' \
+               f'modules={self.modules} balance-ether={self.balance_ether:.4f}'
+
+
+def _decode_address(value: HexBytes) -> str:
+    return Web3.toChecksumAddress(value[-20:].rjust(20, b'\0'))
+
+
+class SafeCliInfoLoader:
+    """
+    Load `SafeCliInfo` with a single JSON-RPC batch pinned to one block, instead of one round trip for every
+    field. If the node doesn't support batches, the slower `Safe.retrieve_*` methods are used
+    """
+    MAX_MODULES = 20
+    # Field: (function signature, args types, args, return types)
+    SAFE_CALLS: Dict[str, Tuple[str, Sequence[str], Sequence[Any], Sequence[str]]] = {
+        'nonce': ('nonce()', [], [], ['uint256']),
+        'threshold': ('getThreshold()', [], [], ['uint256']),
+        'owners': ('getOwners()', [], [], ['address[]']),
+        'modules': ('getModulesPaginated(address,uint256)', ['address', 'uint256'],
+                    [SENTINEL_ADDRESS, MAX_MODULES], ['address[]', 'address']),
+        'version': ('VERSION()', [], [], ['string']),
+    }
+    # Field: storage slot
+    SAFE_STORAGE_SLOTS: Dict[str, int] = {
+        'master_copy': 0,
+        'fallback_handler': int.from_bytes(Web3.keccak(text='fallback_manager.handler.address'), 'big'),
+        'guard': int.from_bytes(Web3.keccak(text='guard_manager.guard.address'), 'big'),
+    }
+    FIELDS: Tuple[str, ...] = ('nonce', 'threshold', 'owners', 'master_copy', 'modules', 'fallback_handler', 'guard',
+                               'balance_ether', 'version')
+
+    def __init__(self, safe: Safe, json_rpc_batch: Optional[JsonRpcBatch] = None):
+        """
+        :param safe:
+        :param json_rpc_batch: Batch client for the node of `safe`. If not provided, one is created using the
+            url of the node
+        """
+        self.safe = safe
+        self.ethereum_client: EthereumClient = safe.ethereum_client
+        self.json_rpc_batch = json_rpc_batch or JsonRpcBatch(self.ethereum_client.w3.provider.endpoint_uri)
+
+    @classmethod
+    def build_safe_call_data(cls, field: str) -> str:
+        function_signature, args_types, args, _ = cls.SAFE_CALLS[field]
+        return HexBytes(function_signature_to_4byte_selector(function_signature)
+                        + encode_abi(args_types, args)).hex()
+
+    def build_requests(self, fields: Iterable[str], block_identifier: str) -> List[Tuple[str, Sequence[Any]]]:
+        requests = []
+        for field in fields:
+            if field == 'balance_ether':
+                requests.append(('eth_getBalance', [self.safe.address, block_identifier]))
+            elif field in self.SAFE_STORAGE_SLOTS:
+                requests.append(('eth_getStorageAt', [self.safe.address, hex(self.SAFE_STORAGE_SLOTS[field]),
+                                                      block_identifier]))
+            else:
+                requests.append(('eth_call', [{'to': self.safe.address, 'data': self.build_safe_call_data(field)},
+                                              block_identifier]))
+        return requests
+
+    def decode_result(self, field: str, result: str) -> Any:
+        if field == 'balance_ether':
+            return Web3.fromWei(int(result, 16), 'ether')
+        elif field in self.SAFE_STORAGE_SLOTS:
+            return _decode_address(HexBytes(result))
+
+        _, _, _, return_types = self.SAFE_CALLS[field]
+        decoded = decode_abi(return_types, HexBytes(result))
+        if field == 'owners':
+            return [Web3.toChecksumAddress(owner) for owner in decoded[0]]
+        elif field == 'modules':
+            modules, next_module = decoded
+            if Web3.toChecksumAddress(next_module) != SENTINEL_ADDRESS:
+                # More than `MAX_MODULES` modules, let `Safe` retrieve every page
+                return self.retrieve_field(field)
+            return [Web3.toChecksumAddress(module) for module in modules]
+        return decoded[0]
+
+    def retrieve_field(self, field: str) -> Any:
+        """
+        Retrieve a field without batching, used as a fallback
+        """
+        retrievers: Dict[str, Callable[[], Any]] = {
+            'nonce': self.safe.retrieve_nonce,
+            'threshold': self.safe.retrieve_threshold,
+            'owners': self.safe.retrieve_owners,
+            'master_copy': self.safe.retrieve_master_copy_address,
+            'modules': self.safe.retrieve_modules,
+            'fallback_handler': self.safe.retrieve_fallback_handler,
+            'guard': self.safe.retrieve_guard,
+            'balance_ether': lambda: Web3.fromWei(self.ethereum_client.get_balance(self.safe.address), 'ether'),
+            'version': self.safe.retrieve_version,
+        }
+        return retrievers[field]()
+
+    def load_fields(self, fields: Optional[Iterable[str]] = None,
+                    block_number: Optional[int] = None) -> Dict[str, Any]:
+        """
+        :param fields: Subset of `FIELDS` to load, all of them by default
+        :param block_number: Block to pin the requests to. If not provided, the latest block is used
+        :return: Dictionary with the value for every requested field
+        """
+        fields = list(fields or self.FIELDS)
+        if block_number is None:
+            block_number = self.ethereum_client.current_block_number
+        try:
+            results = self.json_rpc_batch.request(self.build_requests(fields, hex(block_number)),
+                                                  raise_exception=False)
+        except JsonRpcBatchNotSupported:
+            return {field: self.retrieve_field(field) for field in fields}
+
+        values = {}
+        for field, result in zip(fields, results):
+            # Calls not supported by the Safe version (e.g. `getModulesPaginated`) revert or return no data
+            try:
+                values[field] = (self.retrieve_field(field) if isinstance(result, JsonRpcError)
+                                 else self.decode_result(field, result))
+            except DecodingError:
+                values[field] = self.retrieve_field(field)
+        return values
+
+    def load(self, block_number: Optional[int] = None) -> SafeCliInfo:
+        """
+        :param block_number: Block to pin the requests to. If not provided, the latest block is used
+        :return: SafeCliInfo
+        """
+        if block_number is None:
+            block_number = self.ethereum_client.current_block_number
+        return SafeCliInfo(address=self.safe.address, block_number=block_number,
+                           **self.load_fields(block_number=block_number))
+
+
+class SafeCliInfoCache:
+    """
+    `SafeCliInfo` cache keyed by block number. At most every `check_interval` seconds the latest block is checked
+    and, if it advanced, the logs of the Safe since the cached block are used to reload only the fields that
+    changed. Balance is always reloaded, as receiving ether doesn't always emit an event
+    """
+    CHECK_INTERVAL: float = 3  # Seconds
+    MAX_LOG_BLOCKS: int = 5000  # If more blocks passed, everything is reloaded instead of querying the logs
+    ALL_FIELDS = SafeCliInfoLoader.FIELDS
+    FIELDS_BY_TOPIC: Dict[bytes, Tuple[str, ...]] = {
+        safe_events.ADDED_OWNER_TOPIC: ('owners',),
+        safe_events.REMOVED_OWNER_TOPIC: ('owners',),
+        safe_events.CHANGED_THRESHOLD_TOPIC: ('threshold',),
+        safe_events.CHANGED_MASTER_COPY_TOPIC: ('master_copy', 'version'),
+        safe_events.ENABLED_MODULE_TOPIC: ('modules',),
+        safe_events.DISABLED_MODULE_TOPIC: ('modules',),
+        safe_events.CHANGED_FALLBACK_HANDLER_TOPIC: ('fallback_handler',),
+        safe_events.CHANGED_GUARD_TOPIC: ('guard',),
+        # A delegate call can update the master copy without emitting an event
+        safe_events.EXECUTION_SUCCESS_TOPIC: ('nonce', 'master_copy', 'version'),
+        safe_events.EXECUTION_FAILURE_TOPIC: ('nonce',),
+        safe_events.EXECUTION_FAILED_TOPIC: ('nonce',),
+        # Modules can do anything with the Safe
+        safe_events.EXECUTION_FROM_MODULE_SUCCESS_TOPIC: ALL_FIELDS,
+        safe_events.EXECUTION_FROM_MODULE_FAILURE_TOPIC: ALL_FIELDS,
+    }
+
+    def __init__(self, safe_cli_info_loader: SafeCliInfoLoader, check_interval: Optional[float] = None):
+        self.safe_cli_info_loader = safe_cli_info_loader
+        self.ethereum_client = safe_cli_info_loader.ethereum_client
+        self.check_interval = self.CHECK_INTERVAL if check_interval is None else check_interval
+        self.checked_at: float = 0.  # Last time the latest block was checked
+        self._safe_cli_info: Optional[SafeCliInfo] = None
+        self._lock = threading.RLock()
+
+    @property
+    def block_number(self) -> Optional[int]:
+        return self._safe_cli_info.block_number if self._safe_cli_info else None
+
+    @property
+    def age(self) -> Optional[float]:
+        """
+        :return: Seconds since the information was checked against the chain for the last time
+        """
+        return time.time() - self.checked_at if self._safe_cli_info else None
+
+    def get_changed_fields(self, from_block: int, to_block: int) -> Set[str]:
+        """
+        :return: Fields that could have changed between `from_block` and `to_block` (both inclusive)
+        """
+        if to_block - from_block >= self.MAX_LOG_BLOCKS:
+            return set(self.ALL_FIELDS)
+
+        fields = {'balance_ether'}
+        for log in self.ethereum_client.w3.eth.get_logs({'address': self.safe_cli_info_loader.safe.address,
+                                                         'fromBlock': from_block, 'toBlock': to_block}):
+            if log['topics']:
+                fields.update(self.FIELDS_BY_TOPIC.get(bytes(log['topics'][0]), ()))
+        return fields
+
+    def get(self) -> SafeCliInfo:
+        """
+        :return: Cached SafeCliInfo, updated if the chain advanced and `check_interval` passed since last check
+        """
+        with self._lock:
+            if not self._safe_cli_info:
+                return self.refresh()
+            if time.time() - self.checked_at < self.check_interval:
+                return self._safe_cli_info
+
+            block_number = self.ethereum_client.current_block_number
+            if block_number > self._safe_cli_info.block_number:
+                changed_fields = self.get_changed_fields(self._safe_cli_info.block_number + 1, block_number)
+                self._safe_cli_info = dataclasses.replace(
+                    self._safe_cli_info, block_number=block_number,
+                    **self.safe_cli_info_loader.load_fields(changed_fields, block_number=block_number)
+                )
+            self.checked_at = time.time()
+            return self._safe_cli_info
+
+    def refresh(self) -> SafeCliInfo:
+        """
+        Reload every field
+        """
+        with self._lock:
+            self._safe_cli_info = self.safe_cli_info_loader.load()
+            self.checked_at = time.time()
+            return self._safe_cli_info
+
+    def invalidate(self):
+        """
+        Check the chain on next `get`, ignoring `check_interval`. Used after sending a transaction
+        """
+        with self._lock:
+            self.checked_at = 0.
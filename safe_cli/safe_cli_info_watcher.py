@@ -0,0 +1,71 @@
+import copy
+import threading
+from typing import Callable, Optional
+
+from .safe_cli_info import SafeCliInfo, SafeCliInfoCache
+
+
+class SafeCliInfoWatcher:
+    """
+    Keep `SafeCliInfo` updated on a daemon thread, so the prompt never waits for the node. Every update is
+    published as a snapshot (a copy nobody else holds), readers must only use `snapshot`
+    """
+    POLL_INTERVAL: float = SafeCliInfoCache.CHECK_INTERVAL
+
+    def __init__(self, safe_cli_info_cache: SafeCliInfoCache, poll_interval: Optional[float] = None,
+                 on_update: Optional[Callable[[SafeCliInfo], None]] = None):
+        """
+        :param safe_cli_info_cache:
+        :param poll_interval: Seconds between checks for new blocks
+        :param on_update: Called from the watcher thread every time a different snapshot is published
+        """
+        self.safe_cli_info_cache = safe_cli_info_cache
+        self.poll_interval = self.POLL_INTERVAL if poll_interval is None else poll_interval
+        self.on_update = on_update
+        self.snapshot: Optional[SafeCliInfo] = None
+        self.last_error: Optional[Exception] = None  # Last error updating, snapshot is kept
+        self._wake_up = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'SafeCliInfoWatcher':
+        if not self._thread:
+            self._thread = threading.Thread(target=self._run, name='safe-cli-info-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wake_up.set()
+
+    def wake_up(self):
+        """
+        Check for updates now instead of waiting for `poll_interval`
+        """
+        self.safe_cli_info_cache.invalidate()
+        self._wake_up.set()
+
+    def update(self) -> Optional[SafeCliInfo]:
+        """
+        Check for updates and publish a new snapshot if something changed
+
+        :return: Latest snapshot
+        """
+        try:
+            safe_cli_info = self.safe_cli_info_cache.get()
+            self.last_error = None
+        except Exception as exc:  # Node not available... Keep the last snapshot and try again later
+            self.last_error = exc
+            return self.snapshot
+
+        if safe_cli_info != self.snapshot:
+            self.snapshot = copy.deepcopy(safe_cli_info)
+            if self.on_update:
+                self.on_update(self.snapshot)
+        return self.snapshot
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake_up.clear()
+            self.update()
+            self._wake_up.wait(self.poll_interval)
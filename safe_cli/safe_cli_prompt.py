@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+from typing import List, Optional, Tuple
+
+from prompt_toolkit import HTML, PromptSession, print_formatted_text
+from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+from prompt_toolkit.history import FileHistory
+from prompt_toolkit.lexers import PygmentsLexer
+
+from .operator_modes import OperatorModes
+from .prompt_parser import PromptParser
+from .safe_cli_info import SafeCliInfo
+from .safe_cli_info_watcher import SafeCliInfoWatcher
+from .safe_completer import ArgumentSuggestions, SafeCompleter
+from .safe_lexer import SafeLexer
+from .safe_operator import SafeOperator
+from .safe_relay_operator import SafeRelayOperator
+from .safe_tx_service_operator import SafeTxServiceOperator
+from .utils import get_banner
+
+
+class SafeCli:
+    def __init__(self, safe_address: str, node_url: str, history: bool = False):
+        if history:
+            self.session = PromptSession(history=FileHistory(os.path.join(sys.path[0], '.history')))
+        else:
+            self.session = PromptSession()
+        self.safe_address = safe_address
+        self.safe_operator = SafeOperator(safe_address, node_url)
+        self.operator_modes = OperatorModes(self.safe_operator)
+        self.prompt_parser = PromptParser(self.safe_operator)
+        self.network_name = self.safe_operator.network.name
+        # Toolbar only reads the snapshots of the watcher, so rendering never waits for the node
+        self.safe_cli_info_watcher = SafeCliInfoWatcher(self.safe_operator.safe_cli_info_cache,
+                                                        on_update=lambda _: self.session.app.invalidate())
+        self.bottom_toolbar: Optional[Tuple[Optional[SafeCliInfo], HTML]] = None  # Toolbar of the last snapshot
+        self.lexer = PygmentsLexer(SafeLexer)  # Kept between commands, lines lexed are memoized
+        # Completer only suggests arguments from data already cached, so it never waits for the node
+        self.completer = SafeCompleter({
+            'owners': ArgumentSuggestions(self.get_snapshot_owners),
+            'token_addresses': ArgumentSuggestions(lambda: self.safe_operator.token_addresses),
+            'accounts': ArgumentSuggestions(lambda: self.safe_operator.accounts, to_text=lambda account: account.address),
+        }, parser=self.prompt_parser.prompt_parser)
+
+    def get_snapshot_owners(self) -> List[str]:
+        safe_cli_info = self.safe_cli_info_watcher.snapshot
+        return safe_cli_info.owners if safe_cli_info else []
+
+    def print_startup_info(self):
+        print_formatted_text(get_banner('Gnosis Safe CLI'))  # Print fancy text
+        print_formatted_text(HTML('<b><ansigreen>Loading Safe information...</ansigreen></b>'))
+        self.safe_operator.print_info()
+        self.safe_cli_info_watcher.start()
+
+    def get_prompt_text(self):
+        if isinstance(self.prompt_parser.safe_operator, SafeRelayOperator):
+            return HTML(f'<bold><ansiblue>relay-service > {self.safe_address}</ansiblue><ansired> > </ansired></bold>')
+        elif isinstance(self.prompt_parser.safe_operator, SafeTxServiceOperator):
+            return HTML(f'<bold><ansiblue>tx-service > {self.safe_address}</ansiblue><ansired> > </ansired></bold>')
+        elif isinstance(self.prompt_parser.safe_operator, SafeOperator):
+            return HTML(f'<bold><ansiblue>blockchain > {self.safe_address}</ansiblue><ansired> > </ansired></bold>')
+
+    def get_bottom_toolbar(self):
+        # Toolbar is rendered on every keystroke, it's only built again when the watcher publishes a new snapshot
+        safe_cli_info = self.safe_cli_info_watcher.snapshot
+        if not self.bottom_toolbar or self.bottom_toolbar[0] is not safe_cli_info:
+            self.bottom_toolbar = (safe_cli_info, HTML(
+                f'<b><style fg="ansiyellow">network={self.network_name} '
+                f'{safe_cli_info if safe_cli_info else "Loading Safe information..."}</style></b>'
+            ))
+        return self.bottom_toolbar[1]
+
+    def loop(self):
+        while True:
+            try:
+                command = self.session.prompt(self.get_prompt_text,
+                                              auto_suggest=AutoSuggestFromHistory(),
+                                              bottom_toolbar=self.get_bottom_toolbar,
+                                              lexer=self.lexer,
+                                              completer=self.completer)
+                if not command.strip():
+                    continue
+
+                if new_operator := self.operator_modes.parse_operator_mode(command):
+                    self.prompt_parser = PromptParser(new_operator)
+                else:
+                    self.prompt_parser.process_command(command)
+                self.safe_cli_info_watcher.wake_up()  # Command could have changed the Safe
+            except EOFError:
+                break
+            except KeyboardInterrupt:
+                continue
+            except (argparse.ArgumentError, argparse.ArgumentTypeError, SystemExit):
+                pass
@@ -1,31 +1,185 @@
+import argparse
+import bisect
+from typing import (Any, Callable, Collection, Dict, FrozenSet, Iterable, List,
+                    Optional, Sequence)
+
 from prompt_toolkit import HTML
 from prompt_toolkit.completion import CompleteEvent, Completer, Completion
 from prompt_toolkit.document import Document
 
 from .safe_completer_constants import (meta, safe_color_arguments,
-                                       safe_commands, safe_commands_arguments)
+                                       safe_commands,
+                                       safe_commands_argument_sources,
+                                       safe_commands_arguments)
+
+
+def get_command_display(command: str) -> HTML:
+    safe_command = safe_commands_arguments[command]
+    safe_argument_color = safe_color_arguments.get(safe_command, 'default')
+    return HTML('<b><ansired> &gt; </ansired>%s</b> <' + safe_argument_color + '>%s</'
+                + safe_argument_color + '>') % (command, safe_command)
+
+
+def get_option_nargs(action: argparse.Action) -> Optional[int]:
+    """
+    :return: Number of values taken by an option, `None` if it takes every following word
+    """
+    if action.nargs is None or action.nargs == argparse.OPTIONAL:
+        return 1
+    elif isinstance(action.nargs, int):
+        return action.nargs
+    return None
+
+
+def get_commands_options(parser: argparse.ArgumentParser) -> Dict[str, Dict[str, Optional[int]]]:
+    """
+    :param parser: Parser with a subparser for every command
+    :return: Number of values taken by every option of every command
+    """
+    return {
+        command: {option_string: get_option_nargs(action)
+                  for action in command_parser._actions for option_string in action.option_strings}
+        for action in parser._actions if isinstance(action, argparse._SubParsersAction)
+        for command, command_parser in action.choices.items()
+    }
+
+
+class CommandTrieNode:
+    __slots__ = ('children', 'completions')
+
+    def __init__(self):
+        self.children: Dict[str, 'CommandTrieNode'] = {}
+        self.completions: List[Completion] = []  # Commands starting with the prefix of the node
+
+
+class CommandTrie:
+    """
+    Prefix trie of the commands. Every node keeps the styled `Completion` of every command starting with its prefix,
+    with the `start_position` of that prefix, so completing a command is walking the typed word
+    """
+    def __init__(self, commands: Iterable[str]):
+        self.root = CommandTrieNode()
+        for command in commands:
+            if command not in safe_commands_arguments:
+                continue
+            display = get_command_display(command)
+            node = self.root
+            node.completions.append(Completion(command, start_position=0, display=display,
+                                               display_meta=meta.get(command)))
+            for depth, character in enumerate(command, start=1):
+                node = node.children.setdefault(character, CommandTrieNode())
+                node.completions.append(Completion(command, start_position=-depth, display=display,
+                                                   display_meta=meta.get(command)))
+
+    def get_completions(self, word: str) -> Sequence[Completion]:
+        node = self.root
+        for character in word.lower():  # note: force lower() to function as ignore_case.
+            node = node.children.get(character)
+            if node is None:
+                return ()
+        return node.completions
+
+
+class ArgumentSuggestions:
+    """
+    Values of cached data (owners, loaded accounts...) suggested for an argument. Values are kept sorted and
+    looked up by prefix with `bisect`, and only sorted again when the values changed (compared by content, as
+    sources like the loaded accounts are sets updated in place), so no RPC call or sorting is done on every
+    keystroke. At most `MAX_COMPLETIONS` are returned, typing more characters narrows them
+    """
+    MAX_COMPLETIONS = 50
+
+    def __init__(self, get_values: Callable[[], Collection[Any]], to_text: Callable[[Any], str] = str):
+        """
+        :param get_values: Return the cached values, it must not do any network call
+        :param to_text: Text to complete for every value
+        """
+        self.get_values = get_values
+        self.to_text = to_text
+        self.values_key: Optional[FrozenSet[Any]] = None  # Values the suggestions were built for
+        self.keys: List[str] = []  # Lowercase texts, sorted
+        self.texts: List[str] = []
+
+    def update(self):
+        values_key = frozenset(self.get_values() or ())
+        if values_key != self.values_key:
+            self.values_key = values_key
+            texts = sorted({self.to_text(value) for value in values_key}, key=str.lower)
+            self.keys = [text.lower() for text in texts]
+            self.texts = texts
+
+    def get_completions(self, word: str) -> List[Completion]:
+        self.update()
+        prefix = word.lower()
+        start = bisect.bisect_left(self.keys, prefix)
+        end = min(bisect.bisect_left(self.keys, prefix + chr(0x10FFFF), lo=start), start + self.MAX_COMPLETIONS)
+        return [Completion(text, start_position=-len(word)) for text in self.texts[start:end]]
 
 
 class SafeCompleter(Completer):
     """ Command Completer
     This class will perform the utilities regarding auto-completion of known user input commands
     """
-    def get_completions(self, document: Document, complete_event: CompleteEvent) -> Completion:
+    def __init__(self, argument_suggestions: Optional[Dict[str, ArgumentSuggestions]] = None,
+                 parser: Optional[argparse.ArgumentParser] = None):
+        """
+        :param argument_suggestions: Suggestions for every source of `safe_commands_argument_sources`
+            (`owners`, `token_addresses`, `accounts`). Arguments of sources not provided are not completed
+        :param parser: Prompt parser, to know the values taken by the options of every command. If not provided
+            options are considered flags
+        """
+        self.command_trie = CommandTrie(safe_commands)
+        self.argument_suggestions = argument_suggestions or {}
+        self.commands_options = get_commands_options(parser) if parser else {}
+
+    def get_argument_position(self, command: str, words: Sequence[str]) -> Optional[int]:
+        """
+        :param command:
+        :param words: Arguments typed before the one under the cursor
+        :return: Position of the argument under the cursor between the positional ones, `None` if it's the value
+            of an option
+        """
+        options = self.commands_options.get(command, {})
+        position = 0
+        option_values = 0  # Values left for the last option, `None` if it takes every word
+        for word in words:
+            if word.startswith('-'):
+                option_values = 0 if '=' in word else options.get(word, 0)
+            elif option_values is None:
+                continue
+            elif option_values:
+                option_values -= 1
+            else:
+                position += 1
+        return position if option_values == 0 else None
+
+    def get_argument_completions(self, text_before_cursor: str) -> Sequence[Completion]:
+        """
+        :param text_before_cursor: Text with the command already typed
+        :return: Completions for the argument under the cursor. Position of the argument is the number of
+            previous positional arguments, skipping the options and their values
+        """
+        words = text_before_cursor.split()
+        word = '' if text_before_cursor[-1:].isspace() else words.pop()
+        argument_sources = safe_commands_argument_sources.get(words[0]) if words else None
+        if not argument_sources:
+            return ()
+        position = self.get_argument_position(words[0], words[1:])
+        if position is None:
+            return ()
+        source = argument_sources.get(position, argument_sources.get(None))
+        if source not in self.argument_suggestions or word.startswith('-'):
+            return ()
+        return self.argument_suggestions[source].get_completions(word)
+
+    def get_completions(self, document: Document, complete_event: CompleteEvent) -> Iterable[Completion]:
         """ Get Completions
         This will function will provide the completions for param types and function name
         :param document:
         :param complete_event:
         :return:
         """
-        word = document.get_word_before_cursor()
         if document.find_previous_word_ending() is None:
-            for command in safe_commands:
-                # note: force lower() to function as ignore_case.
-                if command.startswith(word.lower()):
-                    if command in safe_commands_arguments:
-                        safe_command = safe_commands_arguments[command]
-                        safe_argument_color = safe_color_arguments.get(safe_command, 'default')
-                        display = HTML('<b><ansired> &gt; </ansired>%s</b> <' + safe_argument_color + '>%s</'
-                                       + safe_argument_color + '>') % (command, safe_command)
-                        yield Completion(command, start_position=-len(word), display=display,
-                                         display_meta=meta.get(command))
+            yield from self.command_trie.get_completions(document.get_word_before_cursor())
+        else:
+            yield from self.get_argument_completions(document.text_before_cursor)
@@ -8,7 +8,7 @@ safe_commands_arguments = {
     'add_delegate': '<address> <label> <signer-address>',
     'add_owner': '<address> [--threshold <int>]',
     'approve_hash': '<keccak-hexstr-hash> <address>',
-    'balances': '(read-only)',
+    'balances': '[--tokens <tokens-file>] (read-only)',
     'change_fallback_handler': '<address>',
     'change_guard': '<address>',
     'change_master_copy': '<address>',
@@ -19,19 +19,26 @@ safe_commands_arguments = {
     'get_owners': '(read-only)',
     'get_threshold': '(read-only)',
     'get_delegates': '(read-only)',
-    'history': '(read-only)',
+    'history': '[--min-nonce <int>] [--since <iso-date>] [--from-block <int>] (read-only)',
     'info': '(read-only)',
-    'load_cli_owners': '<account-private-key> [<account-private-key>...]',
-    'load_cli_owners_from_words': '<word_1> <word_2> ... <word_12>',
+    'load_cli_owners': '<account-private-key> [<account-private-key>...] '
+                       '[--default-sender-policy first-funded|highest-balance|lowest-nonce]',
+    'load_cli_owners_from_keystores': '<keystores-dir-or-glob> [--password-env <env-var>]',
+    'load_cli_owners_from_words': '<word_1> <word_2> ... <word_12> [--start <int>] [--count <int>] '
+                                  '[--path <bip32-path>]',
     'update': '',
     'refresh': '',
     'remove_delegate': '<address> <signer-address>',
     'remove_owner': '<address> [--threshold <int>]',
+    'set_owners': '<address> [<address>...] [--threshold <int>]',
     'send_erc20': '<address> <token-address> <value-wei> [--safe-nonce <int>] [--tx-service] [--relay-service]',
     'send_erc721': '<address> <token-address> <token-id> [--safe-nonce <int>] [--tx-service] [--relay-service]',
     'send_custom': '<address> <value-wei> <data> [--delegate] [--safe-nonce <int>] [--tx-service] [--relay-service]',
+    'send_batch': '<transfers-csv-or-json-file> [--gas-limit <int>]',
     'send_ether': '<address> <value-wei> [--safe-nonce <int>] [--tx-service] [--relay-service]',
     'show_cli_owners': '(read-only)',
+    'sign_transactions': '<safe-txs-json-file> [--output <json-file>]',
+    'execute_transactions': '<safe-txs-json-file> [--on-failure stop|report|reprice] [--gas-price <int>]',
     'unload_cli_owners': '<address> [<address>...]',
     'blockchain': '',
     'relay-service': '[<token-address>]',
@@ -40,6 +47,13 @@ safe_commands_arguments = {
 
 safe_commands = list(safe_commands_arguments.keys())
 
+# Source of the suggestions for the arguments of a command, by argument position (`None` for every position)
+safe_commands_argument_sources = {
+    'remove_owner': {0: 'owners'},
+    'send_erc20': {1: 'token_addresses'},
+    'unload_cli_owners': {None: 'accounts'},
+}
+
 safe_color_arguments = {
     '(read-only)': SAFE_ARGUMENT_COLOR,
     '<address>': SAFE_ARGUMENT_COLOR,
@@ -54,12 +68,21 @@ safe_color_arguments = {
 meta = {
     'approve_hash': HTML('<b>approve_hash</b> will approve a safe-tx-hash for the provided sender address. '
                          'Sender private key must be loaded first'),
-    'balances': HTML('<b>balances</b> will return the balance of Ether and ERC20 tokens of the Safe '
-                     '(if tx service available for the network)'),
+    'balances': HTML('<b>balances</b> will return the balance of Ether and ERC20 tokens of the Safe. '
+                     'Tokens are retrieved from the tx service, or checked on chain using Multicall for the '
+                     'tokens on <b>--tokens</b> file (one address per line or JSON list) and the ones already seen'),
     'history': HTML('<b>history</b> will return information of last transactions for the Safe '
-                    '(if tx service available for the network)'),
+                    'from the tx service, or reconstructed from the Safe events since <b>--from-block</b> if the network '
+                    'has no tx service'),
     'info': HTML('<b>info</b> will return all the information available for a Safe, with Gnosis Tx Service and '
                  'Etherscan links if the network is supported'),
+    'execute_transactions': HTML('Command <b>execute_transactions</b> will execute the Safe txs on the JSON '
+                                 '<u>&lt;safe-txs-json-file&gt;</u> with consecutive nonces, sending all of them '
+                                 'without waiting for every receipt. Unsigned txs are signed with the loaded owners.'),
+    'sign_transactions': HTML('Command <b>sign_transactions</b> will sign the Safe txs on the JSON '
+                              '<u>&lt;safe-txs-json-file&gt;</u> with every loaded owner. Txs without nonce use '
+                              'consecutive nonces from the current one. In <b>tx-service</b> mode signed txs are '
+                              'sent to the service.'),
     'show_cli_owners': HTML('Command <b>show_cli_owners</b> will return a list of loaded <u>&lt;address&gt;</u> '
                             'account owners.'),
     'get_owners': HTML('Command <b>get_owners</b> will return a list of check-summed <u>&lt;address&gt;</u> '
@@ -68,6 +91,9 @@ meta = {
     'change_owner': HTML('Command <b>change_owner</b> will change an old account <u>&lt;address&gt;</u> for the new '
                          'check-summed <u>&lt;address&gt;</u> account.'),
     'add_owner': HTML('Command <b>add_owner</b> will add a check-summed <u>&lt;address&gt;</u> owner account.'),
+    'set_owners': HTML('Command <b>set_owners</b> will replace the owners of the Safe by the check-summed '
+                       '<u>&lt;address&gt;</u> list and set <u>--threshold</u>, using the minimal number of owner '
+                       'changes executed in a single tx.'),
     'remove_owner': HTML('Command <b>remove_owner</b> will remove an old account <u>&lt;address&gt;</u> from the '
                          'current loaded safe.'),
     'add_delegate': HTML('Command <b>add_delegate</b> will add a check-summed <u>&lt;address&gt;</u> delegate account.'),
@@ -83,6 +109,9 @@ meta = {
                              'value for the loaded safe.'),
     'send_custom': HTML("Command <b>send_custom</b> will try to send a custom tx to a check-summed account. Set value "
                         "to 0 if you don't want to send ether. <b>--delegate</b> can be added to send a DELEGATECALL"),
+    'send_batch': HTML('Command <b>send_batch</b> will send the ether, ERC20 and ERC721 transfers on the '
+                       '<u>&lt;transfers-csv-or-json-file&gt;</u> (columns <b>to,amount,token,type</b>) grouped on '
+                       'MultiSend txs of at most <u>--gas-limit</u> gas.'),
     'send_ether': HTML('Command <b>send_ether</b> will try to send Wei <u>&lt;value&gt;</u> to a check-summed account'
                        ' <u>&lt;address&gt;</u> if enough funds are found, withing the current loaded safe.'),
     'send_erc20': HTML('Command <b>send_erc20</b> will try to send a Token <u>&lt;value&gt;</u> from a check-summed '
@@ -94,9 +123,14 @@ meta = {
     'unload_cli_owners': HTML('Command <b>unload_cli_owners</b> will unload a check-summed <u>&lt;address&gt;</u> '
                               'from the current loaded account owners.'),
     'load_cli_owners': HTML('Command <b>load_cli_owners</b> will try to load a new owner via '
-                            '<u>&lt;account-private-key&gt;</u>.'),
+                            '<u>&lt;account-private-key&gt;</u>. If there is no default sender, one of the funded '
+                            'accounts is chosen using <u>--default-sender-policy</u>.'),
+    'load_cli_owners_from_keystores': HTML('Command <b>load_cli_owners_from_keystores</b> will try to load owners '
+                                           'from the encrypted JSON keystores on <u>path</u>. Only keystores for '
+                                           'owners of the Safe will be decrypted'),
     'load_cli_owners_from_words': HTML('Command <b>load_cli_owners_from_words</b> will try to load owners via'
-                                       '<u>seed_words</u>. Only relevant accounts(owners) will be loaded'),
+                                       '<u>seed_words</u>. Only relevant accounts(owners) will be loaded. '
+                                       'First 100 accounts are checked by default'),
     'refresh': HTML('Command <b>refresh</b> will refresh the information for the current loaded safe.'),
     'change_master_copy': HTML('Command <b>change_master_copy</b> will change the current MasterCopy of the '
                                'Safe Contract <b>[DO NOT CALL THIS FUNCTION, UNLESS YOU KNOW WHAT YOU ARE DOING. '
@@ -0,0 +1,278 @@
+"""
+Index the events of a Safe from the logs of the node, so history is available on networks without tx service.
+
+`eth_getLogs` is called for block ranges of adaptive size: ranges are split when the node complains about too many
+results (or times out) and grow again while they return few logs. Ranges are scanned by several threads.
+
+Executed transactions are reconstructed from the calldata of the transactions emitting `ExecutionSuccess` or
+`ExecutionFailure`. Only direct calls to `execTransaction` of the Safe can be decoded, Safe txs executed through
+another contract (like a MultiSend or a relayer) are returned without `to`, `value` and `data`
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import requests
+from eth_abi import decode_abi, decode_single
+from eth_abi.exceptions import DecodingError
+from eth_utils import function_signature_to_4byte_selector
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import BlockNotFound
+
+from gnosis.eth import EthereumClient
+
+from . import safe_events
+from .batch_transfers import encode_call
+from .json_rpc import JsonRpcBatch, JsonRpcBatchNotSupported
+
+# Event topic: name, argument names and types. Arguments are indexed or not depending on the Safe version, but all of
+# them are static types so topics and data can be decoded together
+SAFE_EVENTS: Dict[bytes, Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = {
+    safe_events.EXECUTION_SUCCESS_TOPIC: ('ExecutionSuccess', ('txHash', 'payment'), ('bytes32', 'uint256')),
+    safe_events.EXECUTION_FAILURE_TOPIC: ('ExecutionFailure', ('txHash', 'payment'), ('bytes32', 'uint256')),
+    safe_events.EXECUTION_FAILED_TOPIC: ('ExecutionFailure', ('txHash',), ('bytes32',)),
+    safe_events.SAFE_RECEIVED_TOPIC: ('SafeReceived', ('sender', 'value'), ('address', 'uint256')),
+    safe_events.ADDED_OWNER_TOPIC: ('AddedOwner', ('owner',), ('address',)),
+    safe_events.REMOVED_OWNER_TOPIC: ('RemovedOwner', ('owner',), ('address',)),
+    safe_events.CHANGED_THRESHOLD_TOPIC: ('ChangedThreshold', ('threshold',), ('uint256',)),
+    safe_events.ENABLED_MODULE_TOPIC: ('EnabledModule', ('module',), ('address',)),
+    safe_events.DISABLED_MODULE_TOPIC: ('DisabledModule', ('module',), ('address',)),
+    safe_events.EXECUTION_FROM_MODULE_SUCCESS_TOPIC: ('ExecutionFromModuleSuccess', ('module',), ('address',)),
+    safe_events.EXECUTION_FROM_MODULE_FAILURE_TOPIC: ('ExecutionFromModuleFailure', ('module',), ('address',)),
+}
+EXECUTION_EVENT_NAMES = ('ExecutionSuccess', 'ExecutionFailure')
+CONFIGURATION_EVENT_NAMES = ('AddedOwner', 'RemovedOwner', 'ChangedThreshold', 'EnabledModule', 'DisabledModule')
+EXEC_TRANSACTION_SELECTOR = function_signature_to_4byte_selector(
+    'execTransaction(address,uint256,bytes,uint8,uint256,uint256,uint256,address,address,bytes)'
+)
+EXEC_TRANSACTION_TYPES = ['address', 'uint256', 'bytes', 'uint8', 'uint256', 'uint256', 'uint256', 'address',
+                          'address', 'bytes']
+# Errors of nodes limiting the results of `eth_getLogs`
+TOO_MANY_RESULTS_MESSAGES = ('more than', 'too many', 'limit exceeded', 'range', 'too large', 'timeout')
+
+
+class SafeEventIndexerException(Exception):
+    pass
+
+
+class SafeEvent(NamedTuple):
+    block_number: int
+    block_hash: bytes
+    transaction_hash: bytes
+    log_index: int
+    name: str
+    args: Dict[str, Any]
+
+
+class BlockHeader(NamedTuple):
+    number: int
+    hash: bytes
+    timestamp: int
+
+
+class ExecutedSafeTx(NamedTuple):
+    nonce: Optional[int]  # `None` if the nonce of the Safe could not be retrieved
+    safe_tx_hash: bytes
+    transaction_hash: bytes
+    block_number: int
+    is_successful: bool
+    to: Optional[str]  # `to`, `value`, `data` and `operation` are `None` if calldata cannot be decoded
+    value: Optional[int]
+    data: Optional[bytes]
+    operation: Optional[int]
+
+
+def decode_safe_event(log: Dict[str, Any]) -> Optional[SafeEvent]:
+    """
+    :param log: Log returned by `eth_getLogs`
+    :return: Decoded event, `None` if it's not a Safe event
+    """
+    topics = [HexBytes(topic) for topic in log['topics']]
+    if not topics or bytes(topics[0]) not in SAFE_EVENTS:
+        return None
+    name, arg_names, arg_types = SAFE_EVENTS[bytes(topics[0])]
+    try:
+        values = decode_abi(arg_types, b''.join(topics[1:]) + HexBytes(log['data']))
+    except DecodingError:
+        return None
+    args = {arg_name: Web3.toChecksumAddress(value) if arg_type == 'address' else value
+            for arg_name, arg_type, value in zip(arg_names, arg_types, values)}
+    return SafeEvent(log['blockNumber'], bytes(HexBytes(log['blockHash'])), bytes(HexBytes(log['transactionHash'])),
+                     log['logIndex'], name, args)
+
+
+def is_too_many_results_error(error: Exception) -> bool:
+    if isinstance(error, requests.Timeout):
+        return True
+    message = str(error).lower()
+    return isinstance(error, ValueError) and ('-32005' in message
+                                              or any(hint in message for hint in TOO_MANY_RESULTS_MESSAGES))
+
+
+class SafeEventIndexer:
+    INITIAL_CHUNK_SIZE = 5000  # Blocks
+    MAX_CHUNK_SIZE = 500000
+    MAX_LOGS_TO_GROW = 1000  # Chunk size is doubled after a range returning less logs
+    MAX_WORKERS = 4
+
+    def __init__(self, ethereum_client: EthereumClient, json_rpc_batch: JsonRpcBatch, safe_address: str,
+                 max_workers: Optional[int] = None):
+        self.ethereum_client = ethereum_client
+        self.json_rpc_batch = json_rpc_batch
+        self.safe_address = safe_address
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.chunk_size = self.INITIAL_CHUNK_SIZE  # Shared by the workers, adapted to the node and the Safe
+        self._lock = threading.Lock()
+
+    def get_logs(self, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        return self.ethereum_client.w3.eth.get_logs({
+            'address': self.safe_address,
+            'fromBlock': from_block,
+            'toBlock': to_block,
+            'topics': [[HexBytes(topic).hex() for topic in SAFE_EVENTS]],
+        })
+
+    def get_logs_splitting(self, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        """
+        :return: Logs of the range, splitting it in halves while the node returns too many results
+        """
+        try:
+            logs = self.get_logs(from_block, to_block)
+        except (ValueError, requests.Timeout) as e:
+            if from_block == to_block or not is_too_many_results_error(e):
+                raise SafeEventIndexerException(f'Cannot get logs for blocks {from_block}-{to_block}: {e}') from e
+            middle_block = (from_block + to_block) // 2
+            with self._lock:
+                self.chunk_size = max(1, min(self.chunk_size, (to_block - from_block + 1) // 2))
+            return (self.get_logs_splitting(from_block, middle_block)
+                    + self.get_logs_splitting(middle_block + 1, to_block))
+
+        if len(logs) < self.MAX_LOGS_TO_GROW and to_block - from_block + 1 >= self.chunk_size:
+            with self._lock:
+                self.chunk_size = min(self.chunk_size * 2, self.MAX_CHUNK_SIZE)
+        return logs
+
+    def scan(self, from_block: int, to_block: int) -> List[SafeEvent]:
+        """
+        :param from_block:
+        :param to_block:
+        :return: Events of the Safe in the range, sorted
+        :raises: SafeEventIndexerException
+        """
+        cursor = from_block
+        logs = []
+        failed = threading.Event()  # Set when a worker fails, so the others stop taking ranges
+
+        def next_range() -> Optional[Tuple[int, int]]:
+            nonlocal cursor
+            with self._lock:
+                if cursor > to_block or failed.is_set():
+                    return None
+                block_range = (cursor, min(cursor + self.chunk_size - 1, to_block))
+                cursor = block_range[1] + 1
+                return block_range
+
+        def worker():
+            try:
+                block_range = next_range()
+                while block_range:
+                    range_logs = self.get_logs_splitting(*block_range)
+                    with self._lock:
+                        logs.extend(range_logs)
+                    block_range = next_range()
+            except BaseException:
+                failed.set()
+                raise
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for future in [executor.submit(worker) for _ in range(self.max_workers)]:
+                future.result()
+
+        events = [event for event in map(decode_safe_event, logs) if event]
+        return sorted(events, key=lambda event: (event.block_number, event.log_index))
+
+    def get_transactions(self, transaction_hashes: Sequence[bytes]) -> List[Dict[str, Any]]:
+        try:
+            return self.json_rpc_batch.request([('eth_getTransactionByHash', [HexBytes(transaction_hash).hex()])
+                                                for transaction_hash in transaction_hashes])
+        except JsonRpcBatchNotSupported:
+            return [self.ethereum_client.w3.eth.get_transaction(transaction_hash)
+                    for transaction_hash in transaction_hashes]
+
+    def get_executed_safe_txs(self, events: Sequence[SafeEvent], nonce: Optional[int] = None) -> List[ExecutedSafeTx]:
+        """
+        :param events: Events of `scan`, every execution from the first one to the end of the scan is required
+            to calculate nonces
+        :param nonce: Nonce of the Safe after the last event, used to number the executions backwards
+        :return: Executed Safe txs, with their parameters decoded from the calldata if possible
+        """
+        execution_events = [event for event in events if event.name in EXECUTION_EVENT_NAMES]
+        transactions = self.get_transactions(list(dict.fromkeys(event.transaction_hash
+                                                                for event in execution_events)))
+        transactions_by_hash = {bytes(HexBytes(transaction['hash'])): transaction
+                                for transaction in transactions if transaction}
+        executed_safe_txs = []
+        for i, event in enumerate(execution_events):
+            to = value = data = operation = None
+            transaction = transactions_by_hash.get(event.transaction_hash)
+            if transaction and transaction['to'] and Web3.toChecksumAddress(transaction['to']) == self.safe_address:
+                calldata = HexBytes(transaction['input'])
+                if calldata[:4] == EXEC_TRANSACTION_SELECTOR:
+                    try:
+                        to, value, data, operation = decode_abi(EXEC_TRANSACTION_TYPES, calldata[4:])[:4]
+                        to = Web3.toChecksumAddress(to)
+                    except DecodingError:
+                        pass
+            executed_safe_txs.append(ExecutedSafeTx(
+                nonce - (len(execution_events) - i) if nonce is not None else None,
+                event.args['txHash'], event.transaction_hash, event.block_number,
+                event.name == 'ExecutionSuccess', to, value, data, operation
+            ))
+        return executed_safe_txs
+
+    def get_nonce(self, block_number: int) -> Optional[int]:
+        """
+        :return: Nonce of the Safe at `block_number`, `None` if it cannot be retrieved (like on pruned nodes)
+        """
+        try:
+            return decode_single('uint256', self.ethereum_client.w3.eth.call(
+                {'to': self.safe_address, 'data': HexBytes(encode_call('nonce()', [], [])).hex()}, block_number
+            ))
+        except (ValueError, DecodingError):
+            return None
+
+    def get_block_headers(self, block_numbers: Sequence[int]) -> Dict[int, BlockHeader]:
+        """
+        :param block_numbers:
+        :return: Headers by block number. Blocks not found on the node (like after a reorg) are missing
+        """
+        block_numbers = list(dict.fromkeys(block_numbers))
+        try:
+            blocks = self.json_rpc_batch.request([('eth_getBlockByNumber', [hex(block_number), False])
+                                                  for block_number in block_numbers], raise_exception=False)
+            blocks = [block if isinstance(block, dict) else None for block in blocks]
+        except JsonRpcBatchNotSupported:
+            blocks = []
+            for block_number in block_numbers:
+                try:
+                    blocks.append(self.ethereum_client.w3.eth.get_block(block_number))
+                except BlockNotFound:
+                    blocks.append(None)
+        return {block_number: BlockHeader(block_number, bytes(HexBytes(block['hash'])),
+                                          int(block['timestamp'], 16) if isinstance(block['timestamp'], str)
+                                          else block['timestamp'])
+                for block_number, block in zip(block_numbers, blocks) if block}
+
+    def get_history(self, from_block: int = 0,
+                    to_block: Optional[int] = None) -> Tuple[List[ExecutedSafeTx], List[SafeEvent]]:
+        """
+        :param from_block: Block to start scanning, Safe creation block if known
+        :param to_block: Last block to scan, current block by default
+        :return: Safe txs executed in the range and every event of the range
+        :raises: SafeEventIndexerException
+        """
+        if to_block is None:
+            to_block = self.ethereum_client.w3.eth.block_number
+        events = self.scan(from_block, to_block)
+        return self.get_executed_safe_txs(events, nonce=self.get_nonce(to_block)), events
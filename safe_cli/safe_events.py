@@ -0,0 +1,25 @@
+"""
+Topics of the events emitted by the Safe contracts (v1.0.0 to v1.3.0)
+"""
+from hexbytes import HexBytes
+from web3 import Web3
+
+
+def get_event_topic(event_signature: str) -> HexBytes:
+    return HexBytes(Web3.keccak(text=event_signature))
+
+
+ADDED_OWNER_TOPIC = get_event_topic('AddedOwner(address)')
+REMOVED_OWNER_TOPIC = get_event_topic('RemovedOwner(address)')
+CHANGED_THRESHOLD_TOPIC = get_event_topic('ChangedThreshold(uint256)')
+CHANGED_MASTER_COPY_TOPIC = get_event_topic('ChangedMasterCopy(address)')
+ENABLED_MODULE_TOPIC = get_event_topic('EnabledModule(address)')
+DISABLED_MODULE_TOPIC = get_event_topic('DisabledModule(address)')
+CHANGED_FALLBACK_HANDLER_TOPIC = get_event_topic('ChangedFallbackHandler(address)')
+CHANGED_GUARD_TOPIC = get_event_topic('ChangedGuard(address)')
+EXECUTION_SUCCESS_TOPIC = get_event_topic('ExecutionSuccess(bytes32,uint256)')
+EXECUTION_FAILURE_TOPIC = get_event_topic('ExecutionFailure(bytes32,uint256)')
+EXECUTION_FAILED_TOPIC = get_event_topic('ExecutionFailed(bytes32)')  # v1.0.0
+EXECUTION_FROM_MODULE_SUCCESS_TOPIC = get_event_topic('ExecutionFromModuleSuccess(address)')
+EXECUTION_FROM_MODULE_FAILURE_TOPIC = get_event_topic('ExecutionFromModuleFailure(address)')
+SAFE_RECEIVED_TOPIC = get_event_topic('SafeReceived(address,uint256)')
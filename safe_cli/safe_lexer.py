@@ -1,25 +1,63 @@
+import functools
 import re
+from typing import Iterator, Tuple
 
 from pygments.lexers.shell import BashLexer
 from pygments.token import Keyword, Name, Text, Token
+from pygments.util import get_int_opt
 
 
 class SafeLexer(BashLexer):
+    """
+    Bash lexer highlighting safe-cli commands, addresses, hashes and ENS names. Tokens of every line are memoized
+    on a bounded LRU, as the prompt lexes the line again on every render (cursor moves, completions, toolbar
+    updates...) and not only when it changes. Lines are lexed independently, commands are single line
+    """
     name = 'SafeLexer'
     aliases = ['safe_lexer']
 
-    ADDRESS = r'^0x[aA-zZ,0-9]{40}$|^0x[aA-zZ,0-9]{62}$'
+    ADDRESS = re.compile(r'0x[0-9a-fA-F]{40}')
+    HASH = re.compile(r'0x[0-9a-fA-F]{64}')  # 32 bytes, like safe tx hashes
+    ENS_NAME = re.compile(r'(?:[a-z0-9-]+\.)+eth', re.IGNORECASE)
+    CACHE_SIZE = 256  # Lines
     EXTRA_KEYWORDS = {'refresh', 'get_nonce', 'get_owners', 'get_threshold', 'get_delegates', 'show_cli_owners',
                       'load_cli_owners_from_words', 'load_cli_owners', 'unload_cli_owners',
                       'approve_hash', 'add_owner', 'change_threshold', 'change_fallback_handler', 'change_guard',
                       'remove_owner', 'change_master_copy', 'add_delegate', 'remove_delegate',
                       'send_ether', 'send_erc20', 'send_erc721'}
 
-    def get_tokens_unprocessed(self, text: str) -> (int, Token, str):
-        for index, token, value in BashLexer.get_tokens_unprocessed(self, text):
-            if token is Text and value in self.EXTRA_KEYWORDS:
-                yield index, Name.Builtin, value
-            elif token is Text and re.search(self.ADDRESS, value):
-                yield index, Keyword, value
-            else:
-                yield index, token, value
+    def __init__(self, **options):
+        """
+        :param options: Pygments lexer options. `cache_size` sets the number of lines memoized, 0 to disable it
+        """
+        super().__init__(**options)
+        cache_size = get_int_opt(options, 'cache_size', self.CACHE_SIZE)
+        self.get_line_tokens = functools.lru_cache(maxsize=cache_size)(self._get_line_tokens)
+
+    def get_token_type(self, token, value: str):
+        if token is not Text:
+            return token
+        elif value in self.EXTRA_KEYWORDS:
+            return Name.Builtin
+        elif self.ADDRESS.fullmatch(value):
+            return Keyword
+        elif self.HASH.fullmatch(value):
+            return Keyword.Constant
+        elif self.ENS_NAME.fullmatch(value):
+            return Name.Namespace
+        return token
+
+    def _get_line_tokens(self, line: str) -> Tuple[Tuple[int, Token, str], ...]:
+        """
+        :param line:
+        :return: Tokens of the line, with the index relative to the line
+        """
+        return tuple((index, self.get_token_type(token, value), value)
+                     for index, token, value in BashLexer.get_tokens_unprocessed(self, line))
+
+    def get_tokens_unprocessed(self, text: str) -> Iterator[Tuple[int, Token, str]]:
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            for index, token, value in self.get_line_tokens(line):
+                yield offset + index, token, value
+            offset += len(line)
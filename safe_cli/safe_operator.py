@@ -1,59 +1,46 @@
 import dataclasses
+import getpass
+import itertools
 import os
-from typing import Any, Dict, List, NoReturn, Optional, Set
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NoReturn, Optional, Sequence, Set
 
 from colorama import Fore, Style
-from ens import ENS
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from eth_utils import ValidationError
 from hexbytes import HexBytes
 from packaging import version as semantic_version
 from prompt_toolkit import HTML, print_formatted_text
-from tabulate import tabulate
 from web3 import Web3
 from web3.exceptions import BadFunctionCallOutput
 
-from gnosis.eth import EthereumClient
 from gnosis.eth.constants import NULL_ADDRESS, SENTINEL_ADDRESS
 from gnosis.eth.contracts import (get_erc20_contract, get_erc721_contract,
-                                  get_safe_contract, get_safe_V1_3_0_contract)
-from gnosis.eth.ethereum_client import EthereumNetwork
+                                  get_safe_contract)
 from gnosis.safe import InvalidInternalTx, Safe, SafeOperation, SafeTx
 from gnosis.safe.multi_send import MultiSend, MultiSendOperation, MultiSendTx
 
-from safe_cli.api.etherscan import Etherscan
-from safe_cli.api.gnosis_relay import RelayService
-from safe_cli.api.gnosis_transaction import TransactionService
-from safe_cli.ethereum_hd_wallet import get_account_from_words
+from safe_cli.batch_transfers import (DEFAULT_GAS_LIMIT, BatchTransfersChunker,
+                                      check_balances, read_transfers_file)
+from safe_cli.default_sender_policies import (DEFAULT_SENDER_POLICIES,
+                                              get_account_statuses)
+from safe_cli.ethereum_hd_wallet import HdWalletDeriver
+from safe_cli.keystore_loader import get_keystore_paths, load_keystores
+from safe_cli.owner_reconciliation import reconcile_owners
+from safe_cli.pipelined_executor import PipelinedExecutor, PipelinedTxStatus
 from safe_cli.safe_addresses import (LAST_DEFAULT_CALLBACK_HANDLER,
                                      LAST_MULTISEND_CONTRACT,
                                      LAST_SAFE_CONTRACT)
-from safe_cli.utils import yes_or_no_question
-
-try:
-    from functools import cached_property
-except ImportError:
-    from cached_property import cached_property
-
-
-@dataclasses.dataclass
-class SafeCliInfo:
-    address: str
-    nonce: int
-    threshold: int
-    owners: List[str]
-    master_copy: str
-    modules: List[str]
-    fallback_handler: str
-    guard: str
-    balance_ether: int
-    version: str
-
-    def __str__(self):
-        return f'safe-version={self.version} nonce={self.nonce} threshold={self.threshold} owners={self.owners} ' \
-               f'master-copy={self.master_copy} fallback-hander={self.fallback_handler} ' \
-               f'modules={self.modules} balance-ether={self.balance_ether:.4f}'
+from safe_cli.safe_cli_info import SafeCliInfo
+from safe_cli.safe_event_indexer import CONFIGURATION_EVENT_NAMES
+from safe_cli.safe_operator_context import (ContextAttribute,
+                                            SafeOperatorContext)
+from safe_cli.safe_tx_file import (SafeTxData, assign_nonces,
+                                   read_safe_txs_file, write_safe_txs_file)
+from safe_cli.token_balance_scanner import (TokenBalance,
+                                            read_token_addresses_file)
+from safe_cli.utils import is_interactive, print_table, yes_or_no_question
 
 
 class SafeOperatorException(Exception):
@@ -141,35 +128,43 @@ class ServiceNotAvailable(SafeOperatorException):
 
 
 class SafeOperator:
-    def __init__(self, address: str, node_url: str):
+    def __init__(self, address: str, node_url: str, context: Optional[SafeOperatorContext] = None):
+        """
+        :param address: Safe address
+        :param node_url: Ethereum node url
+        :param context: Session state shared with other operators. A new one is created if not provided
+        """
         self.address = address
         self.node_url = node_url
-        self.ethereum_client = EthereumClient(self.node_url)
-        self.ens = ENS.fromWeb3(self.ethereum_client.w3)
-        self.network: EthereumNetwork = self.ethereum_client.get_network()
-        self.etherscan = Etherscan.from_network_number(self.network.value)
-        self.safe_relay_service = RelayService.from_network_number(self.network.value)
-        self.safe_tx_service = TransactionService.from_network_number(self.network.value)
-        self.safe = Safe(address, self.ethereum_client)
-        self.safe_contract = get_safe_V1_3_0_contract(self.ethereum_client.w3, address=self.address)
-        self.safe_contract_1_1_0 = get_safe_contract(self.ethereum_client.w3, address=self.address)
-        self.accounts: Set[LocalAccount] = set()
-        self.default_sender: Optional[LocalAccount] = None
-        self.executed_transactions: List[str] = []
-        self._safe_cli_info: Optional[SafeCliInfo] = None  # Cache for SafeCliInfo
+        self.context = context or SafeOperatorContext(address, node_url)
         self.require_all_signatures = True  # Require all signatures to be present to send a tx
 
-    @cached_property
-    def ens_domain(self) -> Optional[str]:
-        # FIXME After web3.py fixes the middleware copy
-        if self.network == EthereumNetwork.MAINNET:
-            return self.ens.name(self.address)
+    ethereum_client = ContextAttribute()
+    json_rpc_batch = ContextAttribute()
+    ens = ContextAttribute()
+    network = ContextAttribute()
+    etherscan = ContextAttribute()
+    safe_relay_service = ContextAttribute()
+    safe_tx_service = ContextAttribute()
+    safe = ContextAttribute()
+    safe_contract = ContextAttribute()
+    safe_contract_1_1_0 = ContextAttribute()
+    ens_domain = ContextAttribute()
+    safe_cli_info_loader = ContextAttribute()
+    safe_cli_info_cache = ContextAttribute()
+    bulk_signer = ContextAttribute()
+    token_balance_scanner = ContextAttribute()
+    safe_event_indexer = ContextAttribute()
+    safe_store = ContextAttribute()
+    accounts = ContextAttribute()
+    default_sender = ContextAttribute()
+    default_sender_policy = ContextAttribute()
+    executed_transactions = ContextAttribute()
+    token_addresses = ContextAttribute()
 
     @property
     def safe_cli_info(self) -> SafeCliInfo:
-        if not self._safe_cli_info:
-            self._safe_cli_info = self.refresh_safe_cli_info()
-        return self._safe_cli_info
+        return self.safe_cli_info_cache.get()
 
     def _require_default_sender(self) -> NoReturn:
         """
@@ -183,7 +178,7 @@ class SafeOperator:
         :return: True if Safe Master Copy is updated, False otherwise
         """
 
-        if self._safe_cli_info.master_copy == LAST_SAFE_CONTRACT:
+        if self.safe_cli_info.master_copy == LAST_SAFE_CONTRACT:
             return True
         else:  # Check versions, maybe safe-cli addresses were not updated
             safe_contract = get_safe_contract(self.ethereum_client.w3, LAST_SAFE_CONTRACT)
@@ -194,96 +189,261 @@ class SafeOperator:
             return semantic_version.parse(self.safe_cli_info.version) >= semantic_version.parse(safe_contract_version)
 
     def refresh_safe_cli_info(self) -> SafeCliInfo:
-        self._safe_cli_info = self.get_safe_cli_info()
-        return self._safe_cli_info
+        return self.safe_cli_info_cache.refresh()
+
+    def get_balances(self, tokens_file: Optional[str] = None) -> bool:
+        """
+        Show balances of the Safe from the tx service. If tokens are provided, or there's no tx service for the
+        network, balances are retrieved from the node for the tokens of the file and the tokens already seen
 
-    def get_balances(self):
-        if not self.safe_tx_service:  # TODO Maybe use Etherscan
-            print_formatted_text(HTML(f'<ansired>No tx service available for '
-                                      f'network={self.network.name}</ansired>'))
+        :param tokens_file: File with token addresses, one per line or a JSON list
+        """
+        if self.safe_tx_service and not tokens_file:
+            token_balances = [
+                TokenBalance(balance['tokenAddress'], int(balance['balance']), int(balance['token']['decimals']),
+                             balance['token']['symbol'], balance['token']['name'])
+                if balance['tokenAddress'] else TokenBalance(None, int(balance['balance']), 18, 'Ξ', 'ETHER')
+                for balance in self.safe_tx_service.get_balances(self.address)
+            ]
         else:
-            balances = self.safe_tx_service.get_balances(self.address)
-            headers = ['name', 'balance', 'symbol', 'decimals', 'tokenAddress']
-            rows = []
-            for balance in balances:
-                if balance['tokenAddress']:  # Token
-                    row = [balance['token']['name'],
-                           f"{int(balance['balance']) / 10**int(balance['token']['decimals']):.5f}",
-                           balance['token']['symbol'],
-                           balance['token']['decimals'],
-                           balance['tokenAddress']]
-                else:  # Ether
-                    row = ['ETHER',
-                           f"{int(balance['balance']) / 10 ** 18:.5f}",
-                           'Ξ',
-                           18,
-                           '']
-                rows.append(row)
-            print(tabulate(rows, headers=headers))
-
-    def get_transaction_history(self):
+            token_metadata = self.safe_store.get_tokens(self.network.value, self.address) if self.safe_store else {}
+            token_addresses = read_token_addresses_file(tokens_file) if tokens_file else []
+            token_addresses += [token_address for token_address in (*self.token_addresses, *token_metadata)
+                                if token_address not in token_addresses]
+            if not tokens_file:
+                print_formatted_text(HTML(f'<ansiyellow>No tx service available for network={self.network.name}, '
+                                          f'checking {len(token_addresses)} tokens already seen on chain. '
+                                          f'Use --tokens to provide a list</ansiyellow>'))
+            token_balances = self.token_balance_scanner.get_balances(self.address, token_addresses,
+                                                                     token_metadata=token_metadata)
+
+        headers = ['name', 'balance', 'symbol', 'decimals', 'tokenAddress']
+        rows = [[token_balance.name,
+                 f'{token_balance.balance / 10 ** token_balance.decimals:.5f}',
+                 token_balance.symbol,
+                 token_balance.decimals,
+                 token_balance.token_address or '']
+                for token_balance in token_balances]
+        print_table(rows, headers)
+        self.token_addresses = [token_balance.token_address for token_balance in token_balances
+                                if token_balance.token_address]
+        if self.safe_store:
+            self.safe_store.save_tokens(self.network.value, self.address, token_balances)
+        return True
+
+    def get_transaction_history(self, min_nonce: Optional[int] = None, since: Optional[datetime] = None,
+                                from_block: int = 0) -> bool:
         if not self.safe_tx_service:
-            print_formatted_text(HTML(f'<ansired>No tx service available for '
-                                      f'network={self.network.name}</ansired>'))
-            if self.etherscan:
-                url = f'{self.etherscan.base_url}/address/{self.address}'
-                print_formatted_text(HTML(f'<b>Try Etherscan instead</b> {url}'))
+            print_formatted_text(HTML(f'<ansiyellow>No tx service available for network={self.network.name}, '
+                                      f'reading history from events since block={from_block}</ansiyellow>'))
+            return self.get_transaction_history_from_events(min_nonce=min_nonce, since=since, from_block=from_block)
         else:
-            transactions = self.safe_tx_service.get_transactions(self.address)
             headers = ['nonce', 'to', 'value', 'transactionHash', 'safeTxHash']
             rows = []
             last_executed_tx = False
-            for transaction in transactions:
-                row = [transaction[header] for header in headers]
-                data_decoded: Dict[str, Any] = transaction.get('dataDecoded')
-                if data_decoded:
-                    row.append(self.safe_tx_service.data_decoded_to_text(data_decoded))
-                if transaction['transactionHash'] and transaction['isSuccessful']:
-                    row[0] = Fore.GREEN + str(row[0])  # For executed transactions we use green
-                    if not last_executed_tx:
-                        row[0] = Style.BRIGHT + row[0]
-                        last_executed_tx = True
-                elif transaction['transactionHash']:
-                    row[0] = Fore.RED + str(row[0])  # For transactions failed
-                else:
-                    row[0] = Fore.YELLOW + str(row[0])  # For non executed transactions we use yellow
-
-                row[0] = Style.RESET_ALL + row[0]  # Reset all just in case
-                rows.append(row)
+            # Every page is formatted while the next one is prefetched
+            for transactions in self.iter_service_transaction_pages(min_nonce=min_nonce, since=since):
+                for transaction in transactions:
+                    row = [transaction[header] for header in headers]
+                    data_decoded: Dict[str, Any] = transaction.get('dataDecoded')
+                    if data_decoded:
+                        row.append(self.safe_tx_service.data_decoded_to_text(data_decoded))
+                    if transaction['transactionHash'] and transaction['isSuccessful']:
+                        row[0] = Fore.GREEN + str(row[0])  # For executed transactions we use green
+                        if not last_executed_tx:
+                            row[0] = Style.BRIGHT + row[0]
+                            last_executed_tx = True
+                    elif transaction['transactionHash']:
+                        row[0] = Fore.RED + str(row[0])  # For transactions failed
+                    else:
+                        row[0] = Fore.YELLOW + str(row[0])  # For non executed transactions we use yellow
+
+                    row[0] = Style.RESET_ALL + row[0]  # Reset all just in case
+                    rows.append(row)
 
             headers.append('dataDecoded')
             headers[0] = Style.BRIGHT + headers[0]
-            print(tabulate(rows, headers=headers))
+            print_table(rows, headers)
+            return True
+
+    def iter_service_transaction_pages(self, min_nonce: Optional[int] = None,
+                                       since: Optional[datetime] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate through the tx service transactions of the Safe, newest first. If the Safe store is available,
+        pages are stored as they are retrieved and executed transactions already stored are read from it: only
+        transactions with a higher nonce (the queue included) are retrieved from the service
 
-    def load_cli_owners_from_words(self, words: List[str]):
+        :param min_nonce: Stop when a transaction with a lower nonce is found
+        :param since: Stop when a transaction submitted before this (timezone aware) date is found
+        :return: Iterator of pages of transactions
+        """
+        if not self.safe_store:
+            yield from self.safe_tx_service.iter_transaction_pages(self.address, min_nonce=min_nonce, since=since)
+            return
+
+        chain_id = self.network.value
+        min_nonce = min_nonce or 0
+        sync_state = self.safe_store.get_service_sync_state(chain_id, self.address)
+        if sync_state and sync_state[0] <= min_nonce <= sync_state[1] + 1:  # Stored transactions can be reused
+            first_nonce, service_min_nonce = sync_state[0], sync_state[1] + 1
+        else:
+            first_nonce = service_min_nonce = min_nonce
+
+        def is_recent(transaction: Dict[str, Any]) -> bool:
+            return not since or self.safe_tx_service.parse_date(transaction['submissionDate']) >= since
+
+        self.safe_store.start_service_sync(chain_id, self.address, service_min_nonce)
+        # `since` is checked here so it's known if every transaction was retrieved
+        for transactions in self.safe_tx_service.iter_transaction_pages(self.address, min_nonce=service_min_nonce):
+            self.safe_store.save_service_transactions(chain_id, self.address, transactions)
+            recent_transactions = list(itertools.takewhile(is_recent, transactions))
+            if recent_transactions:
+                yield recent_transactions
+            if len(recent_transactions) < len(transactions):
+                return
+        self.safe_store.finish_service_sync(chain_id, self.address, first_nonce)
+        if service_min_nonce > min_nonce:
+            stored_transactions = self.safe_store.get_service_transactions(chain_id, self.address,
+                                                                           min_nonce=min_nonce,
+                                                                           max_nonce=service_min_nonce - 1)
+            yield list(itertools.takewhile(is_recent, reversed(stored_transactions)))
+
+    def get_transaction_history_from_events(self, min_nonce: Optional[int] = None, since: Optional[datetime] = None,
+                                            from_block: int = 0) -> bool:
+        """
+        Print Safe txs executed since `from_block` reconstructed from the events of the Safe, for networks
+        without tx service. Only the method selector of `data` is shown, as there is no service to decode it,
+        along with the owners, threshold and modules changes emitted on the same transaction.
+        Events are indexed on the Safe store if available, so only new blocks are scanned next time
+        """
+        if self.safe_store:
+            self.safe_store.sync(self.network.value, self.safe_event_indexer, from_block=from_block)
+            executed_safe_txs = self.safe_store.get_executed_safe_txs(self.network.value, self.address,
+                                                                      from_block=from_block)
+            events = self.safe_store.get_events(self.network.value, self.address, names=CONFIGURATION_EVENT_NAMES,
+                                                from_block=from_block)
+        else:
+            executed_safe_txs, events = self.safe_event_indexer.get_history(from_block=from_block)
+        changes: Dict[bytes, List[str]] = {}
+        for event in events:
+            if event.name in CONFIGURATION_EVENT_NAMES:
+                changes.setdefault(event.transaction_hash, []).append(
+                    f'{event.name}: {",".join(str(value) for value in event.args.values())}'
+                )
+        if min_nonce is not None:
+            executed_safe_txs = [executed_safe_tx for executed_safe_tx in executed_safe_txs
+                                 if executed_safe_tx.nonce is not None and executed_safe_tx.nonce >= min_nonce]
+        if since and executed_safe_txs:
+            block_headers = self.safe_event_indexer.get_block_headers([executed_safe_tx.block_number
+                                                                       for executed_safe_tx in executed_safe_txs])
+            executed_safe_txs = [executed_safe_tx for executed_safe_tx in executed_safe_txs
+                                 if executed_safe_tx.block_number in block_headers
+                                 and block_headers[executed_safe_tx.block_number].timestamp >= since.timestamp()]
+
+        headers = ['nonce', 'to', 'value', 'transactionHash', 'safeTxHash', 'data', 'changes']
+        rows = []
+        for executed_safe_tx in reversed(executed_safe_txs):  # Newest first, like the tx service
+            color = Fore.GREEN if executed_safe_tx.is_successful else Fore.RED
+            rows.append([Style.RESET_ALL + color + str(executed_safe_tx.nonce), executed_safe_tx.to,
+                         executed_safe_tx.value, HexBytes(executed_safe_tx.transaction_hash).hex(),
+                         HexBytes(executed_safe_tx.safe_tx_hash).hex(),
+                         HexBytes(executed_safe_tx.data[:4]).hex() if executed_safe_tx.data else None,
+                         '\n'.join(changes.get(executed_safe_tx.transaction_hash, []))])
+        if rows:
+            rows[0][0] = Style.BRIGHT + rows[0][0]
+        headers[0] = Style.BRIGHT + headers[0]
+        print_table(rows, headers)
+        return True
+
+    def load_cli_owners_from_words(self, words: List[str], start: int = 0, count: int = 100,
+                                   hd_paths: Sequence[str] = ()) -> bool:
+        """
+        Load the owners of the Safe derived from a seed phrase
+
+        :param words: Mnemonic words, or the name of an environment variable holding them
+        :param start: First index of `m/44'/60'/0'/0` to check
+        :param count: Number of accounts of `m/44'/60'/0'/0` to check
+        :param hd_paths: Custom BIP32 paths to check too
+        """
         if len(words) == 1:  # Reading seed from Environment Variable
             words = os.environ.get(words[0], default="").strip().split(" ")
         parsed_words = ' '.join(words)
         try:
-            for index in range(100):  # Try first accounts of seed phrase
-                account = get_account_from_words(parsed_words, index=index)
-                if account.address in self.safe_cli_info.owners:
-                    self.load_cli_owners([account.key.hex()])
-            if not index:
-                print_formatted_text(HTML('<ansired>Cannot generate any valid owner for this Safe</ansired>'))
+            hd_wallet_deriver = HdWalletDeriver(parsed_words)
+            accounts_found = hd_wallet_deriver.find_accounts(self.safe_cli_info.owners, start=start, count=count,
+                                                             hd_paths=hd_paths)
         except ValidationError:
             print_formatted_text(HTML('<ansired>Cannot load owners from words</ansired>'))
+            return False
+
+        if accounts_found:
+            return self.load_cli_owners([account.key.hex() for account in accounts_found.values()])
+        print_formatted_text(HTML('<ansired>Cannot generate any valid owner for this Safe</ansired>'))
+        return False
 
-    def load_cli_owners(self, keys: List[str]):
+    def load_cli_owners(self, keys: List[str], default_sender_policy: Optional[str] = None) -> bool:
+        """
+        Load accounts from private keys. Balances and pending nonces of all the accounts are retrieved on one
+        JSON-RPC batch, and if there's no default sender one of the funded accounts is chosen using
+        `default_sender_policy`
+
+        :param keys: Private keys, or names of environment variables holding them
+        :param default_sender_policy: One of `DEFAULT_SENDER_POLICIES`, `self.default_sender_policy` if not provided
+        :return: `True` if every key was loaded
+        """
+        accounts = []
         for key in keys:
             try:
-                account = Account.from_key(os.environ.get(key, default=key))  # Try to get key from `environ`
-                self.accounts.add(account)
-                balance = self.ethereum_client.get_balance(account.address)
-                print_formatted_text(HTML(f'Loaded account <b>{account.address}</b> '
-                                          f'with balance={Web3.fromWei(balance, "ether")} ether'))
-                if not self.default_sender and balance > 0:
-                    print_formatted_text(HTML(f'Set account <b>{account.address}</b> as default sender of txs'))
-                    self.default_sender = account
+                accounts.append(Account.from_key(os.environ.get(key, default=key)))  # Try to get key from `environ`
             except ValueError:
                 print_formatted_text(HTML(f'<ansired>Cannot load key=f{key}</ansired>'))
+        if not accounts:
+            return False
+
+        account_statuses = get_account_statuses(self.ethereum_client, self.json_rpc_batch, accounts)
+        for account_status in account_statuses:
+            self.accounts.add(account_status.account)
+            print_formatted_text(HTML(f'Loaded account <b>{account_status.account.address}</b> '
+                                      f'with balance={Web3.fromWei(account_status.balance, "ether")} ether'))
+
+        if not self.default_sender:
+            policy = DEFAULT_SENDER_POLICIES[default_sender_policy or self.default_sender_policy]
+            default_sender = policy(account_statuses)
+            if default_sender:
+                print_formatted_text(HTML(f'Set account <b>{default_sender.address}</b> as default sender of txs'))
+                self.default_sender = default_sender
+        return len(accounts) == len(keys)
+
+    def load_cli_owners_from_keystores(self, path: str, password: Optional[str] = None) -> bool:
+        """
+        Load the owners of the Safe from encrypted JSON keystores. Only keystores for owners are decrypted
+
+        :param path: Directory with keystores, keystore file or glob pattern
+        :param password: Password for the keystores, it's asked if not provided and running interactively
+        """
+        keystore_paths = get_keystore_paths(path)
+        if not keystore_paths:
+            print_formatted_text(HTML(f'<ansired>No keystores found on {path}</ansired>'))
+            return False
+
+        if password is None:
+            if not is_interactive():  # `getpass` would block reading the terminal
+                print_formatted_text(HTML('<ansired>Password cannot be asked when not running interactively, '
+                                          'use --password-env</ansired>'))
+                return False
+            password = getpass.getpass('Keystore password: ')
+        keystore_results = load_keystores(path, password, addresses=self.safe_cli_info.owners)
+        for keystore_result in keystore_results:
+            if not keystore_result.key:
+                print_formatted_text(HTML(f'<ansired>Cannot decrypt keystore {keystore_result.path}</ansired>'))
+        keys = [keystore_result.key.hex() for keystore_result in keystore_results
+                if keystore_result.key and keystore_result.address in self.safe_cli_info.owners]
+        if keys:
+            return self.load_cli_owners(keys)
+        print_formatted_text(HTML('<ansired>No keystore found for the owners of this Safe</ansired>'))
+        return False
 
-    def unload_cli_owners(self, owners: List[str]):
+    def unload_cli_owners(self, owners: List[str]) -> bool:
         accounts_to_remove: Set[Account] = set()
         for owner in owners:
             for account in self.accounts:
@@ -295,20 +455,22 @@ class SafeOperator:
         self.accounts = self.accounts.difference(accounts_to_remove)
         if accounts_to_remove:
             print_formatted_text(HTML('<ansigreen>Accounts have been deleted</ansigreen>'))
-        else:
-            print_formatted_text(HTML('<ansired>No account was deleted</ansired>'))
+            return True
+        print_formatted_text(HTML('<ansired>No account was deleted</ansired>'))
+        return False
 
-    def show_cli_owners(self):
+    def show_cli_owners(self) -> bool:
         if not self.accounts:
             print_formatted_text(HTML('<ansired>No accounts loaded</ansired>'))
+            return False
+        for account in self.accounts:
+            print_formatted_text(HTML(f'<ansigreen><b>Account</b> {account.address} loaded</ansigreen>'))
+        if self.default_sender:
+            print_formatted_text(HTML(f'<ansigreen><b>Default sender:</b> {self.default_sender.address}'
+                                      f'</ansigreen>'))
         else:
-            for account in self.accounts:
-                print_formatted_text(HTML(f'<ansigreen><b>Account</b> {account.address} loaded</ansigreen>'))
-            if self.default_sender:
-                print_formatted_text(HTML(f'<ansigreen><b>Default sender:</b> {self.default_sender.address}'
-                                          f'</ansigreen>'))
-            else:
-                print_formatted_text(HTML('<ansigreen>Not default sender set </ansigreen>'))
+            print_formatted_text(HTML('<ansigreen>Not default sender set </ansigreen>'))
+        return True
 
     def approve_hash(self, hash_to_approve: HexBytes, sender: str) -> bool:
         sender_account = [account for account in self.accounts if account.address == sender]
@@ -355,7 +517,7 @@ class SafeOperator:
                 return True
             return False
 
-    def remove_owner(self, owner_to_remove: str, threshold: Optional[int] = None):
+    def remove_owner(self, owner_to_remove: str, threshold: Optional[int] = None) -> bool:
         threshold = threshold if threshold is not None else self.safe_cli_info.threshold
         if owner_to_remove not in self.safe_cli_info.owners:
             raise NonExistingOwnerException(owner_to_remove)
@@ -373,6 +535,42 @@ class SafeOperator:
                 return True
             return False
 
+    def set_owners(self, owners: List[str], threshold: Optional[int] = None) -> bool:
+        """
+        Replace the owners of the Safe by `owners` using the minimal number of owner changes, executed as one
+        Safe tx (MultiSend if more than one change is needed)
+
+        :param owners: Desired owners
+        :param threshold: Desired threshold, current threshold if not provided
+        :return: `True` if owners were updated
+        """
+        threshold = threshold if threshold is not None else self.safe_cli_info.threshold
+        changes = reconcile_owners(self.safe_cli_info.owners, self.safe_cli_info.threshold, owners, threshold)
+        if not changes:
+            print_formatted_text(HTML('<ansired>Owners and threshold are already the desired ones</ansired>'))
+            return False
+
+        tx_params = {'from': self.address, 'gas': 0, 'gasPrice': 0}
+        changes_data = []
+        for change in changes:
+            print_formatted_text(HTML(f'{change.function_name}{change.args}'))
+            changes_data.append(getattr(self.safe_contract.functions, change.function_name)(
+                *change.args
+            ).buildTransaction(tx_params)['data'])
+
+        if len(changes_data) == 1:
+            executed = self.execute_safe_internal_transaction(changes_data[0])
+        else:
+            multisend = MultiSend(LAST_MULTISEND_CONTRACT, self.ethereum_client)
+            multisend_txs = [MultiSendTx(MultiSendOperation.CALL, self.address, 0, data) for data in changes_data]
+            executed = self.execute_safe_transaction(multisend.address, 0, multisend.build_tx_data(multisend_txs),
+                                                     operation=SafeOperation.DELEGATE_CALL)
+        if executed:
+            self.safe_cli_info.owners = self.safe.retrieve_owners()
+            self.safe_cli_info.threshold = threshold
+            return True
+        return False
+
     def send_custom(self, to: str, value: int, data: bytes, safe_nonce: Optional[int] = None,
                     delegate_call: bool = False) -> bool:
         if value > 0:
@@ -412,6 +610,7 @@ class SafeOperator:
                 self.safe_cli_info.fallback_handler = new_fallback_handler
                 self.safe_cli_info.version = self.safe.retrieve_version()
                 return True
+            return False
 
     def change_guard(self, guard: str) -> bool:
         if guard == self.safe_cli_info.guard:
@@ -428,6 +627,7 @@ class SafeOperator:
                 self.safe_cli_info.guard = guard
                 self.safe_cli_info.version = self.safe.retrieve_version()
                 return True
+            return False
 
     def change_master_copy(self, new_master_copy: str) -> bool:
         # TODO Check that master copy is valid
@@ -446,8 +646,9 @@ class SafeOperator:
                 self.safe_cli_info.master_copy = new_master_copy
                 self.safe_cli_info.version = self.safe.retrieve_version()
                 return True
+            return False
 
-    def update_version(self) -> Optional[bool]:
+    def update_version(self) -> bool:
         """
         Update Safe Master Copy and Fallback handler to the last version
         :return:
@@ -475,13 +676,58 @@ class SafeOperator:
             self.safe_cli_info.master_copy = LAST_SAFE_CONTRACT
             self.safe_cli_info.fallback_handler = LAST_DEFAULT_CALLBACK_HANDLER
             self.safe_cli_info.version = self.safe.retrieve_version()
+            return True
+        return False
+
+    def send_batch(self, path: str, gas_limit: int = DEFAULT_GAS_LIMIT) -> bool:
+        """
+        Send the transfers on a CSV/JSON file grouped on MultiSend txs
+
+        :param path: CSV/JSON file with the transfers
+        :param gas_limit: Max gas for every MultiSend tx
+        :return: `True` if every MultiSend tx was executed
+        """
+        transfers = read_transfers_file(path)
+        if not transfers:
+            print_formatted_text(HTML(f'<ansired>No transfers found on {path}</ansired>'))
+            return False
+
+        errors = check_balances(self.ethereum_client, self.json_rpc_batch, self.address, transfers)
+        for error in errors:
+            print_formatted_text(HTML(f'<ansired>{error}</ansired>'))
+        if errors:
+            return False
+
+        multisend = MultiSend(LAST_MULTISEND_CONTRACT, self.ethereum_client)
+        chunks = []
+        pending_chunks = BatchTransfersChunker(gas_limit).chunk(self.address, transfers)
+        while pending_chunks:  # Check gas with the node, chunks over the limit are split
+            chunk = pending_chunks.pop(0)
+            estimated_gas = self.safe.estimate_tx_gas(multisend.address, 0, multisend.build_tx_data(chunk),
+                                                      SafeOperation.DELEGATE_CALL.value)
+            if estimated_gas > gas_limit and len(chunk) > 1:
+                pending_chunks[:0] = [chunk[:len(chunk) // 2], chunk[len(chunk) // 2:]]
+            else:
+                chunks.append(chunk)
+
+        print_formatted_text(HTML(f'<ansigreen>Sending {len(transfers)} transfers on {len(chunks)} '
+                                  f'MultiSend txs</ansigreen>'))
+        safe_nonce = self.safe_cli_info.nonce
+        for i, chunk in enumerate(chunks):
+            if not self.execute_safe_transaction(multisend.address, 0, multisend.build_tx_data(chunk),
+                                                 operation=SafeOperation.DELEGATE_CALL, safe_nonce=safe_nonce + i):
+                print_formatted_text(HTML(f'<ansired>Stopped after {i} of {len(chunks)} MultiSend txs</ansired>'))
+                return False
+        return True
 
-    def change_threshold(self, threshold: int):
+    def change_threshold(self, threshold: int) -> bool:
         if threshold == self.safe_cli_info.threshold:
             print_formatted_text(HTML(f'<ansired>Threshold is already {threshold}</ansired>'))
+            return False
         elif threshold > len(self.safe_cli_info.owners):
             print_formatted_text(HTML(f'<ansired>Threshold={threshold} bigger than number '
                                       f'of owners={len(self.safe_cli_info.owners)}</ansired>'))
+            return False
         else:
             transaction = self.safe_contract.functions.changeThreshold(
                 threshold
@@ -489,20 +735,26 @@ class SafeOperator:
 
             if self.execute_safe_internal_transaction(transaction['data']):
                 self.safe_cli_info.threshold = threshold
+                return True
+            return False
 
-    def enable_module(self, module_address: str):
+    def enable_module(self, module_address: str) -> bool:
         if module_address in self.safe_cli_info.modules:
             print_formatted_text(HTML(f'<ansired>Module {module_address} is already enabled</ansired>'))
+            return False
         else:
             transaction = self.safe_contract.functions.enableModule(
                 module_address
             ).buildTransaction({'from': self.address, 'gas': 0, 'gasPrice': 0})
             if self.execute_safe_internal_transaction(transaction['data']):
                 self.safe_cli_info.modules = self.safe.retrieve_modules()
+                return True
+            return False
 
-    def disable_module(self, module_address: str):
+    def disable_module(self, module_address: str) -> bool:
         if module_address not in self.safe_cli_info.modules:
             print_formatted_text(HTML(f'<ansired>Module {module_address} is not enabled</ansired>'))
+            return False
         else:
             pos = self.safe_cli_info.modules.index(module_address)
             if pos == 0:
@@ -514,11 +766,15 @@ class SafeOperator:
             ).buildTransaction({'from': self.address, 'gas': 0, 'gasPrice': 0})
             if self.execute_safe_internal_transaction(transaction['data']):
                 self.safe_cli_info.modules = self.safe.retrieve_modules()
+                return True
+            return False
 
     def print_info(self):
         for key, value in dataclasses.asdict(self.safe_cli_info).items():
             print_formatted_text(HTML(f'<b><ansigreen>{key.capitalize()}</ansigreen></b>='
                                       f'<ansiblue>{value}</ansiblue>'))
+        print_formatted_text(HTML(f'<b><ansigreen>Checked</ansigreen></b>='
+                                  f'<ansiblue>{self.safe_cli_info_cache.age:.0f} seconds ago</ansiblue>'))
         if self.ens_domain:
             print_formatted_text(HTML(f'<b><ansigreen>Ens domain</ansigreen></b>='
                                       f'<ansiblue>{self.ens_domain}</ansiblue>'))
@@ -542,12 +798,7 @@ class SafeOperator:
                                       'the Safe to a newest version</ansired>'))
 
     def get_safe_cli_info(self) -> SafeCliInfo:
-        safe = self.safe
-        balance_ether = Web3.fromWei(self.ethereum_client.get_balance(self.address), 'ether')
-        safe_info = safe.retrieve_all_info()
-        return SafeCliInfo(self.address, safe_info.nonce, safe_info.threshold,
-                           safe_info.owners, safe_info.master_copy, safe_info.modules, safe_info.fallback_handler,
-                           safe_info.guard, balance_ether, safe_info.version)
+        return self.safe_cli_info_loader.load()
 
     def get_threshold(self):
         print_formatted_text(self.safe.retrieve_threshold())
@@ -581,15 +832,16 @@ class SafeOperator:
                 self.executed_transactions.append(tx_hash.hex())
                 print_formatted_text(HTML(f'<ansigreen>Sent tx with tx-hash {tx_hash.hex()} '
                                           f'and safe-nonce {safe_tx.safe_nonce}, waiting for receipt</ansigreen>'))
+                self.safe_cli_info_cache.invalidate()  # Check the new block on next access
                 if self.ethereum_client.get_transaction_receipt(tx_hash, timeout=120):
-                    self.safe_cli_info.nonce += 1
+                    self.safe_cli_info.nonce = safe_tx.safe_nonce + 1
                     return True
                 else:
                     print_formatted_text(HTML(f'<ansired>Tx with tx-hash {tx_hash.hex()} still not mined</ansired>'))
                     return False
         except InvalidInternalTx as invalid_internal_tx:
             print_formatted_text(HTML(f'Result: <ansired>InvalidTx - {invalid_internal_tx}</ansired>'))
-            return False
+        return False
 
     # TODO Set sender so we can save gas in that signature
     def sign_transaction(self, safe_tx: SafeTx) -> NoReturn:
@@ -617,6 +869,120 @@ class SafeOperator:
         return signatures
         """
 
+    def build_safe_tx(self, safe_tx_data: SafeTxData) -> SafeTx:
+        return SafeTx(self.ethereum_client, self.address, safe_tx_data.to, safe_tx_data.value, safe_tx_data.data,
+                      safe_tx_data.operation, safe_tx_data.safe_tx_gas, safe_tx_data.base_gas,
+                      safe_tx_data.gas_price, safe_tx_data.gas_token, safe_tx_data.refund_receiver,
+                      signatures=safe_tx_data.signatures, safe_nonce=safe_tx_data.nonce,
+                      safe_version=self.safe_cli_info.version)
+
+    def get_signing_accounts(self) -> List[LocalAccount]:
+        """
+        :return: Loaded accounts that are owners of the Safe
+        :raises: NotEnoughSignatures if there are no owners loaded or not enough to reach the threshold and
+            `require_all_signatures`
+        """
+        owners = self.safe_cli_info.owners
+        accounts = [account for account in self.accounts if account.address in owners]
+        missing_signatures = self.safe_cli_info.threshold - len(accounts)
+        if not accounts or (self.require_all_signatures and missing_signatures > 0):
+            raise NotEnoughSignatures(missing_signatures)
+        return accounts
+
+    def sign_transactions(self, path: str, output: Optional[str] = None) -> bool:
+        """
+        Sign a list of Safe txs with every loaded owner. Txs without nonce get consecutive nonces starting with
+        the current Safe nonce
+
+        :param path: JSON file with the Safe txs
+        :param output: JSON file to store the signed txs
+        :return: `True` if txs were signed
+        """
+        accounts = self.get_signing_accounts()
+        safe_txs = assign_nonces(read_safe_txs_file(path), self.safe_cli_info.nonce)
+        if not safe_txs:
+            print_formatted_text(HTML(f'<ansired>No txs found on {path}</ansired>'))
+            return False
+
+        safe_tx_hashes = self.bulk_signer.get_safe_tx_hashes(safe_txs)
+        signatures = self.bulk_signer.sign_hashes(safe_tx_hashes, accounts)
+        safe_txs = [safe_tx._replace(signatures=safe_tx_signatures)
+                    for safe_tx, safe_tx_signatures in zip(safe_txs, signatures)]
+        print_formatted_text(HTML(f'<ansigreen>Signed {len(safe_txs)} txs with {len(accounts)} owners</ansigreen>'))
+        if output:
+            write_safe_txs_file(output, safe_txs, safe_tx_hashes)
+            print_formatted_text(HTML(f'<ansigreen>Signed txs stored on {output}</ansigreen>'))
+        else:
+            rows = [[safe_tx.nonce, safe_tx_hash.hex()] for safe_tx, safe_tx_hash in zip(safe_txs, safe_tx_hashes)]
+            print_table(rows, ['nonce', 'safeTxHash'])
+        return self.process_signed_transactions(safe_txs)
+
+    def process_signed_transactions(self, safe_txs: List[SafeTxData]) -> bool:
+        """
+        Hook for the operator modes to use the txs signed by `sign_transactions`
+
+        :param safe_txs:
+        :return: `True` if processing succeeded
+        """
+        return True
+
+    def execute_transactions(self, path: str, on_failure: str = 'stop', gas_price: Optional[int] = None) -> bool:
+        """
+        Execute a list of Safe txs with consecutive nonces starting with the current Safe nonce, without waiting
+        for the receipt of a tx to send the next one. Txs without signatures are signed with the loaded owners
+
+        :param path: JSON file with the Safe txs, like the one stored by `sign_transactions`
+        :param on_failure: What to do if a tx fails, one of `PipelinedExecutor.ON_FAILURE_OPTIONS`
+        :param gas_price: Gas price for the txs, current gas price if not provided
+        :return: `True` if every tx was executed
+        """
+        self._require_default_sender()  # Throws Exception if default sender not found
+        safe_txs = assign_nonces(read_safe_txs_file(path), self.safe_cli_info.nonce)
+        if not safe_txs:
+            print_formatted_text(HTML(f'<ansired>No txs found on {path}</ansired>'))
+            return False
+
+        safe_txs.sort(key=lambda safe_tx: safe_tx.nonce)
+        expected_nonces = list(range(self.safe_cli_info.nonce, self.safe_cli_info.nonce + len(safe_txs)))
+        if [safe_tx.nonce for safe_tx in safe_txs] != expected_nonces:
+            print_formatted_text(HTML(f'<ansired>Safe txs must have consecutive nonces starting with the current '
+                                      f'nonce {self.safe_cli_info.nonce}</ansired>'))
+            return False
+
+        unsigned_positions = [i for i, safe_tx in enumerate(safe_txs) if not safe_tx.signatures]
+        if unsigned_positions:
+            accounts = self.get_signing_accounts()
+            unsigned_safe_txs = [safe_txs[i] for i in unsigned_positions]
+            signatures = self.bulk_signer.sign_hashes(self.bulk_signer.get_safe_tx_hashes(unsigned_safe_txs),
+                                                      accounts)
+            for i, safe_tx_signatures in zip(unsigned_positions, signatures):
+                safe_txs[i] = safe_txs[i]._replace(signatures=safe_tx_signatures)
+
+        pipelined_executor = PipelinedExecutor(self.ethereum_client, self.json_rpc_batch, self.safe_contract,
+                                               self.default_sender, self.ethereum_client.w3.eth.chain_id,
+                                               on_failure=on_failure)
+        gas_limits = []
+        for safe_tx in safe_txs:
+            estimated_tx_gas = self.safe.estimate_tx_gas(safe_tx.to, safe_tx.value, safe_tx.data, safe_tx.operation)
+            gas_limits.append(pipelined_executor.get_gas_limit(safe_tx, estimated_tx_gas))
+        gas_price = gas_price or self.ethereum_client.w3.eth.gas_price
+        if not yes_or_no_question(f'Do you want to execute {len(safe_txs)} txs with nonces '
+                                  f'{expected_nonces[0]}-{expected_nonces[-1]} and '
+                                  f'gas-price={Web3.fromWei(gas_price, "gwei")} gwei'):
+            return False
+
+        pipelined_txs = pipelined_executor.execute(safe_txs, gas_limits, gas_price)
+        self.safe_cli_info_cache.invalidate()  # Check the new block on next access
+        for pipelined_tx in pipelined_txs:
+            if pipelined_tx.tx_hash:
+                self.executed_transactions.append(pipelined_tx.tx_hash.hex())
+            status = pipelined_tx.status
+            color = 'ansigreen' if status == PipelinedTxStatus.SUCCESS else 'ansired'
+            print_formatted_text(HTML(f'<{color}>Safe tx with nonce {pipelined_tx.safe_tx.nonce}: {status} '
+                                      f'tx-hash={pipelined_tx.tx_hash.hex() if pipelined_tx.tx_hash else None}'
+                                      f'{" " + pipelined_tx.error if pipelined_tx.error else ""}</{color}>'))
+        return all(pipelined_tx.status == PipelinedTxStatus.SUCCESS for pipelined_tx in pipelined_txs)
+
     def process_command(self, first_command: str, rest_command: List[str]) -> bool:
         if first_command == 'help':
             print_formatted_text('I still cannot help you')
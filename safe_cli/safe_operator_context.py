@@ -0,0 +1,134 @@
+from typing import TYPE_CHECKING, Any, List, Optional, Set
+
+from eth_account.signers.local import LocalAccount
+from web3.contract import Contract
+
+from gnosis.eth import EthereumClient
+from gnosis.eth.contracts import get_safe_contract, get_safe_V1_3_0_contract
+from gnosis.eth.ethereum_client import EthereumNetwork
+from gnosis.safe import Safe
+
+from .api.etherscan import Etherscan
+from .api.gnosis_relay import RelayService
+from .api.gnosis_transaction import TransactionService
+from .bulk_signer import BulkSigner
+from .default_sender_policies import DEFAULT_SENDER_POLICY
+from .json_rpc import JsonRpcBatch
+from .safe_cli_info import SafeCliInfoCache, SafeCliInfoLoader
+from .safe_event_indexer import SafeEventIndexer
+from .safe_store import SafeStore
+from .token_balance_scanner import TokenBalanceScanner
+
+if TYPE_CHECKING:
+    from ens import ENS
+
+try:
+    from functools import cached_property
+except ImportError:
+    from cached_property import cached_property
+
+
+class SafeOperatorContext:
+    """
+    State of a safe-cli session shared by every operator mode (blockchain, tx-service and relay-service):
+    connection to the node, service clients, contracts, SafeCliInfo cache and loaded accounts. Switching modes
+    reuses it, so it doesn't need any RPC call and accounts are kept.
+
+    Dependencies are built on first use, so startup and commands like `info` don't pay for what they don't use
+    """
+    def __init__(self, address: str, node_url: str):
+        self.address = address
+        self.node_url = node_url
+        self.accounts: Set[LocalAccount] = set()
+        self.default_sender: Optional[LocalAccount] = None
+        self.default_sender_policy: str = DEFAULT_SENDER_POLICY
+        self.executed_transactions: List[str] = []
+        self.token_addresses: List[str] = []  # Tokens with balance on the last `balances`, used by the completer
+
+    @cached_property
+    def ethereum_client(self) -> EthereumClient:
+        return EthereumClient(self.node_url)
+
+    @cached_property
+    def json_rpc_batch(self) -> JsonRpcBatch:
+        return JsonRpcBatch(self.node_url)
+
+    @cached_property
+    def ens(self) -> 'ENS':
+        from ens import ENS  # Only needed to resolve names
+        return ENS.fromWeb3(self.ethereum_client.w3)
+
+    @cached_property
+    def network(self) -> EthereumNetwork:
+        return self.ethereum_client.get_network()
+
+    @cached_property
+    def etherscan(self) -> Optional[Etherscan]:
+        return Etherscan.from_network_number(self.network.value)
+
+    @cached_property
+    def safe_relay_service(self) -> Optional[RelayService]:
+        return RelayService.from_network_number(self.network.value)
+
+    @cached_property
+    def safe_tx_service(self) -> Optional[TransactionService]:
+        return TransactionService.from_network_number(self.network.value)
+
+    @cached_property
+    def safe(self) -> Safe:
+        return Safe(self.address, self.ethereum_client)
+
+    @cached_property
+    def safe_contract(self) -> Contract:
+        return get_safe_V1_3_0_contract(self.ethereum_client.w3, address=self.address)
+
+    @cached_property
+    def safe_contract_1_1_0(self) -> Contract:
+        return get_safe_contract(self.ethereum_client.w3, address=self.address)
+
+    @cached_property
+    def ens_domain(self) -> Optional[str]:
+        # FIXME After web3.py fixes the middleware copy
+        if self.network == EthereumNetwork.MAINNET:
+            return self.ens.name(self.address)
+
+    @cached_property
+    def safe_cli_info_loader(self) -> SafeCliInfoLoader:
+        return SafeCliInfoLoader(self.safe, json_rpc_batch=self.json_rpc_batch)
+
+    @cached_property
+    def safe_cli_info_cache(self) -> SafeCliInfoCache:
+        return SafeCliInfoCache(self.safe_cli_info_loader)
+
+    @cached_property
+    def bulk_signer(self) -> BulkSigner:
+        return BulkSigner(self.address, self.ethereum_client, self.safe_cli_info_cache.get().version)
+
+    @cached_property
+    def token_balance_scanner(self) -> TokenBalanceScanner:
+        return TokenBalanceScanner(self.ethereum_client, self.json_rpc_batch)
+
+    @cached_property
+    def safe_event_indexer(self) -> SafeEventIndexer:
+        return SafeEventIndexer(self.ethereum_client, self.json_rpc_batch, self.address)
+
+    @cached_property
+    def safe_store(self) -> Optional[SafeStore]:
+        return SafeStore.get_default()
+
+
+class ContextAttribute:
+    """
+    Operator attribute stored on its `SafeOperatorContext`, so every operator using the same context sees
+    the same value
+    """
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner=None) -> Any:
+        if instance is None:
+            return self
+        return getattr(instance.context, self.name)
+
+    def __set__(self, instance, value: Any):
+        setattr(instance.context, self.name, value)
@@ -6,12 +6,14 @@ from prompt_toolkit import HTML, print_formatted_text
 from gnosis.safe import InvalidInternalTx, SafeOperation, SafeTx
 
 from .safe_operator import SafeOperator, ServiceNotAvailable
+from .safe_operator_context import SafeOperatorContext
 from .utils import yes_or_no_question
 
 
 class SafeRelayOperator(SafeOperator):
-    def __init__(self, address: str, node_url: str, gas_token: Optional[str] = None):
-        super().__init__(address, node_url)
+    def __init__(self, address: str, node_url: str, gas_token: Optional[str] = None,
+                 context: Optional[SafeOperatorContext] = None):
+        super().__init__(address, node_url, context=context)
         self.gas_token = gas_token
         if not self.safe_relay_service:
             raise ServiceNotAvailable(f'Cannot configure relay service for network {self.network.name}')
@@ -0,0 +1,326 @@
+"""
+SQLite database of what safe-cli learns about every Safe, keyed by chain id and Safe address, so sessions don't
+start cold: events and executed Safe txs indexed from the node, tx service transactions (including the queue) and
+metadata of the tokens seen.
+
+Events are synced incrementally from the last indexed block. Hashes of the recently indexed blocks are stored and
+compared with the node on every sync: if they don't match, indexed data is rewound to the last matching block (up
+to `REORG_DEPTH` blocks) and synced again.
+
+Executed tx service transactions don't change, so once all of them are stored only the ones with a higher nonce
+(and the queue) are retrieved again from the service
+"""
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .safe_event_indexer import (BlockHeader, ExecutedSafeTx, SafeEvent,
+                                 SafeEventIndexer)
+from .token_balance_scanner import TokenBalance, TokenMetadata
+from .utils import get_cache_dir
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS sync_state (chain_id INTEGER NOT NULL, safe_address TEXT NOT NULL, '
+    'first_block INTEGER NOT NULL, last_block INTEGER NOT NULL, PRIMARY KEY (chain_id, safe_address))',
+    'CREATE TABLE IF NOT EXISTS blocks (chain_id INTEGER NOT NULL, safe_address TEXT NOT NULL, '
+    'block_number INTEGER NOT NULL, block_hash BLOB NOT NULL, PRIMARY KEY (chain_id, safe_address, block_number))',
+    'CREATE TABLE IF NOT EXISTS events (chain_id INTEGER NOT NULL, safe_address TEXT NOT NULL, '
+    'block_number INTEGER NOT NULL, log_index INTEGER NOT NULL, block_hash BLOB NOT NULL, '
+    'transaction_hash BLOB NOT NULL, name TEXT NOT NULL, args TEXT NOT NULL, '
+    'PRIMARY KEY (chain_id, safe_address, block_number, log_index))',
+    'CREATE TABLE IF NOT EXISTS executed_txs (chain_id INTEGER NOT NULL, safe_address TEXT NOT NULL, '
+    'block_number INTEGER NOT NULL, transaction_hash BLOB NOT NULL, safe_tx_hash BLOB NOT NULL, nonce INTEGER, '
+    'is_successful INTEGER NOT NULL, "to" TEXT, value TEXT, data BLOB, operation INTEGER, '
+    'PRIMARY KEY (chain_id, safe_address, transaction_hash, safe_tx_hash))',
+    'CREATE INDEX IF NOT EXISTS executed_txs_block_number ON executed_txs (chain_id, safe_address, block_number)',
+    'CREATE TABLE IF NOT EXISTS service_txs (chain_id INTEGER NOT NULL, safe_address TEXT NOT NULL, '
+    'safe_tx_hash TEXT NOT NULL, nonce INTEGER NOT NULL, is_executed INTEGER NOT NULL, tx TEXT NOT NULL, '
+    'PRIMARY KEY (chain_id, safe_address, safe_tx_hash))',
+    # Range of nonces with every executed tx service transaction stored
+    'CREATE TABLE IF NOT EXISTS service_sync_state (chain_id INTEGER NOT NULL, safe_address TEXT NOT NULL, '
+    'first_nonce INTEGER NOT NULL, last_nonce INTEGER NOT NULL, PRIMARY KEY (chain_id, safe_address))',
+    'CREATE TABLE IF NOT EXISTS tokens (chain_id INTEGER NOT NULL, safe_address TEXT NOT NULL, '
+    'token_address TEXT NOT NULL, decimals INTEGER NOT NULL, symbol TEXT NOT NULL, name TEXT NOT NULL, '
+    'PRIMARY KEY (chain_id, safe_address, token_address))',
+)
+INDEXED_TABLES = ('blocks', 'events', 'executed_txs')  # Rewound on reorgs
+
+
+def encode_event_args(args: Dict[str, Any]) -> str:
+    # `uint256` don't fit on SQLite integers and `bytes32` are not JSON serializable
+    return json.dumps({name: '0x' + value.hex() if isinstance(value, bytes) else value
+                       for name, value in args.items()})
+
+
+def decode_event_args(args: str) -> Dict[str, Any]:
+    return {name: bytes.fromhex(value[2:]) if isinstance(value, str) and len(value) == 66 else value
+            for name, value in json.loads(args).items()}
+
+
+class SafeStore:
+    DEFAULT_FILENAME = 'safes.sqlite3'
+    REORG_DEPTH = 64  # Blocks
+    _default: Optional['SafeStore'] = None
+
+    def __init__(self, path: str, reorg_depth: int = REORG_DEPTH):
+        self.path = path
+        self.reorg_depth = reorg_depth
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+
+    @classmethod
+    def get_default(cls) -> Optional['SafeStore']:
+        """
+        :return: Shared store on the safe-cli cache dir, `None` if `SAFE_CLI_DISABLE_CACHE` is set or the
+            store cannot be opened
+        """
+        if cls._default is None and not os.environ.get('SAFE_CLI_DISABLE_CACHE'):
+            try:
+                cls._default = cls(os.path.join(get_cache_dir(), cls.DEFAULT_FILENAME))
+            except (OSError, sqlite3.Error):  # Read only filesystem, locked database...
+                return None
+        return cls._default
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def get_sync_state(self, chain_id: int, safe_address: str) -> Optional[Tuple[int, int]]:
+        """
+        :return: First and last indexed blocks, `None` if the Safe was never synced
+        """
+        with self._lock:
+            return self._connection.execute('SELECT first_block, last_block FROM sync_state '
+                                            'WHERE chain_id=? AND safe_address=?',
+                                            (chain_id, safe_address)).fetchone()
+
+    def rewind(self, chain_id: int, safe_address: str, block_number: int) -> None:
+        """
+        Remove indexed data after `block_number`
+        """
+        with self._transaction() as connection:
+            for table in INDEXED_TABLES:
+                connection.execute(f'DELETE FROM {table} WHERE chain_id=? AND safe_address=? AND block_number>?',
+                                   (chain_id, safe_address, block_number))
+            connection.execute('UPDATE sync_state SET last_block=min(last_block, ?) '
+                               'WHERE chain_id=? AND safe_address=?', (block_number, chain_id, safe_address))
+            connection.execute('DELETE FROM sync_state WHERE chain_id=? AND safe_address=? AND last_block<first_block',
+                               (chain_id, safe_address))
+
+    def find_common_block(self, chain_id: int, safe_event_indexer: SafeEventIndexer, last_block: int) -> int:
+        """
+        :return: Last indexed block still on the chain of the node. If none of the recent blocks is, the rewind
+            is bounded to `reorg_depth` blocks
+        """
+        with self._lock:
+            stored_hashes = self._connection.execute(
+                'SELECT block_number, block_hash FROM blocks WHERE chain_id=? AND safe_address=? AND block_number>? '
+                'ORDER BY block_number DESC', (chain_id, safe_event_indexer.safe_address, last_block - self.reorg_depth)
+            ).fetchall()
+        if not stored_hashes:  # Nothing to check
+            return last_block
+        block_headers = safe_event_indexer.get_block_headers([block_number for block_number, _ in stored_hashes])
+        for block_number, block_hash in stored_hashes:
+            if block_number in block_headers and block_headers[block_number].hash == bytes(block_hash):
+                return block_number
+        return last_block - self.reorg_depth
+
+    def sync(self, chain_id: int, safe_event_indexer: SafeEventIndexer, from_block: int = 0) -> None:
+        """
+        Index the events of the Safe up to the current block, from the last indexed block or `from_block` if
+        it's earlier than every indexed block
+
+        :param chain_id:
+        :param safe_event_indexer: Indexer for the Safe
+        :param from_block: First block to index
+        :raises: SafeEventIndexerException
+        """
+        safe_address = safe_event_indexer.safe_address
+        sync_state = self.get_sync_state(chain_id, safe_address)
+        if sync_state:
+            common_block = self.find_common_block(chain_id, safe_event_indexer, sync_state[1])
+            if common_block < sync_state[1]:
+                self.rewind(chain_id, safe_address, common_block)
+                sync_state = self.get_sync_state(chain_id, safe_address)
+
+        head_block_number = safe_event_indexer.ethereum_client.w3.eth.block_number
+        head_block_header = safe_event_indexer.get_block_headers([head_block_number]).get(head_block_number)
+        if sync_state and from_block < sync_state[0]:
+            self.index(chain_id, safe_event_indexer, from_block, sync_state[0] - 1)
+        from_block = sync_state[1] + 1 if sync_state else from_block
+        if from_block <= head_block_number:
+            self.index(chain_id, safe_event_indexer, from_block, head_block_number, head_block_header)
+
+    def index(self, chain_id: int, safe_event_indexer: SafeEventIndexer, from_block: int, to_block: int,
+              to_block_header: Optional[BlockHeader] = None) -> None:
+        """
+        Index the events and executed Safe txs of a range. Sync state is extended to cover it
+
+        :param to_block_header: Header of `to_block`, stored to detect reorgs on next sync
+        """
+        safe_address = safe_event_indexer.safe_address
+        events = safe_event_indexer.scan(from_block, to_block)
+        executed_safe_txs = safe_event_indexer.get_executed_safe_txs(events,
+                                                                     nonce=safe_event_indexer.get_nonce(to_block))
+        block_hashes = {event.block_number: event.block_hash for event in events}
+        if to_block_header:
+            block_hashes[to_block_header.number] = to_block_header.hash
+
+        with self._transaction() as connection:
+            connection.executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)', [
+                (chain_id, safe_address, event.block_number, event.log_index, event.block_hash,
+                 event.transaction_hash, event.name, encode_event_args(event.args))
+                for event in events
+            ])
+            connection.executemany('INSERT OR REPLACE INTO executed_txs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', [
+                (chain_id, safe_address, executed_safe_tx.block_number, executed_safe_tx.transaction_hash,
+                 executed_safe_tx.safe_tx_hash, executed_safe_tx.nonce, executed_safe_tx.is_successful,
+                 executed_safe_tx.to, None if executed_safe_tx.value is None else str(executed_safe_tx.value),
+                 executed_safe_tx.data, executed_safe_tx.operation)
+                for executed_safe_tx in executed_safe_txs
+            ])
+            connection.executemany('INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)', [
+                (chain_id, safe_address, block_number, block_hash) for block_number, block_hash in block_hashes.items()
+            ])
+            connection.execute('INSERT OR IGNORE INTO sync_state VALUES (?, ?, ?, ?)',
+                               (chain_id, safe_address, from_block, to_block))
+            connection.execute('UPDATE sync_state SET first_block=min(first_block, ?), last_block=max(last_block, ?) '
+                               'WHERE chain_id=? AND safe_address=?', (from_block, to_block, chain_id, safe_address))
+            # Only recent blocks can be reorganized, older hashes are not needed anymore
+            connection.execute('DELETE FROM blocks WHERE chain_id=? AND safe_address=? AND block_number<('
+                               'SELECT last_block FROM sync_state WHERE chain_id=? AND safe_address=?) - ?',
+                               (chain_id, safe_address, chain_id, safe_address, self.reorg_depth))
+
+    def get_events(self, chain_id: int, safe_address: str, names: Sequence[str] = (),
+                   from_block: int = 0) -> List[SafeEvent]:
+        """
+        :param names: Event names to return, like `AddedOwner` or `ChangedThreshold`. All of them if empty
+        :param from_block: Ignore events of previous blocks
+        :return: Indexed events, sorted
+        """
+        query = ('SELECT block_number, block_hash, transaction_hash, log_index, name, args FROM events '
+                 'WHERE chain_id=? AND safe_address=? AND block_number>=?')
+        if names:
+            query += f' AND name IN ({",".join("?" * len(names))})'
+        with self._lock:
+            rows = self._connection.execute(query + ' ORDER BY block_number, log_index',
+                                            (chain_id, safe_address, from_block, *names)).fetchall()
+        return [SafeEvent(block_number, bytes(block_hash), bytes(transaction_hash), log_index, name,
+                          decode_event_args(args))
+                for block_number, block_hash, transaction_hash, log_index, name, args in rows]
+
+    def get_executed_safe_txs(self, chain_id: int, safe_address: str, from_block: int = 0) -> List[ExecutedSafeTx]:
+        """
+        :param from_block: Ignore Safe txs executed on previous blocks
+        :return: Indexed executed Safe txs, sorted by block
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT nonce, safe_tx_hash, transaction_hash, block_number, is_successful, "to", value, data, '
+                'operation FROM executed_txs WHERE chain_id=? AND safe_address=? AND block_number>=? '
+                'ORDER BY block_number, nonce',
+                (chain_id, safe_address, from_block)
+            ).fetchall()
+        return [ExecutedSafeTx(nonce, bytes(safe_tx_hash), bytes(transaction_hash), block_number,
+                               bool(is_successful), to, None if value is None else int(value),
+                               None if data is None else bytes(data), operation)
+                for nonce, safe_tx_hash, transaction_hash, block_number, is_successful, to, value, data, operation
+                in rows]
+
+    def save_service_transactions(self, chain_id: int, safe_address: str,
+                                  transactions: Sequence[Dict[str, Any]]) -> None:
+        """
+        :param transactions: Multisig transactions returned by the tx service, executed or queued
+        """
+        with self._transaction() as connection:
+            connection.executemany('INSERT OR REPLACE INTO service_txs VALUES (?, ?, ?, ?, ?, ?)', [
+                (chain_id, safe_address, transaction['safeTxHash'], transaction['nonce'],
+                 bool(transaction['transactionHash']), json.dumps(transaction))
+                for transaction in transactions
+            ])
+
+    def get_service_transactions(self, chain_id: int, safe_address: str, queued: Optional[bool] = None,
+                                 min_nonce: int = 0, max_nonce: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        :param queued: If `True` only not executed transactions are returned, `False` only executed ones
+        :param min_nonce: Ignore transactions with a lower nonce
+        :param max_nonce: Ignore transactions with a higher nonce
+        :return: Stored tx service transactions, sorted by nonce
+        """
+        query = 'SELECT tx FROM service_txs WHERE chain_id=? AND safe_address=? AND nonce>=?'
+        params = [chain_id, safe_address, min_nonce]
+        if queued is not None:
+            query += ' AND is_executed=?'
+            params.append(not queued)
+        if max_nonce is not None:
+            query += ' AND nonce<=?'
+            params.append(max_nonce)
+        with self._lock:
+            return [json.loads(tx) for (tx,) in self._connection.execute(query + ' ORDER BY nonce, rowid', params)]
+
+    def get_service_sync_state(self, chain_id: int, safe_address: str) -> Optional[Tuple[int, int]]:
+        """
+        :return: First and last nonces with every executed transaction stored, `None` if the tx service
+            transactions of the Safe were never fully retrieved. Transactions after the last nonce (the queue
+            included) can change on the service and must be retrieved again
+        """
+        with self._lock:
+            return self._connection.execute('SELECT first_nonce, last_nonce FROM service_sync_state '
+                                            'WHERE chain_id=? AND safe_address=?',
+                                            (chain_id, safe_address)).fetchone()
+
+    def start_service_sync(self, chain_id: int, safe_address: str, min_nonce: int) -> None:
+        """
+        Remove stored tx service transactions from `min_nonce`, as they are going to be retrieved again. Sync
+        state is shrunk to the transactions kept
+        """
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM service_txs WHERE chain_id=? AND safe_address=? AND nonce>=?',
+                               (chain_id, safe_address, min_nonce))
+            connection.execute('UPDATE service_sync_state SET last_nonce=min(last_nonce, ?) '
+                               'WHERE chain_id=? AND safe_address=?', (min_nonce - 1, chain_id, safe_address))
+            connection.execute('DELETE FROM service_sync_state WHERE chain_id=? AND safe_address=? '
+                               'AND first_nonce>?', (chain_id, safe_address, min_nonce))
+
+    def finish_service_sync(self, chain_id: int, safe_address: str, first_nonce: int) -> None:
+        """
+        Mark every executed tx service transaction from `first_nonce` as stored, after retrieving all of them
+        """
+        with self._transaction() as connection:
+            connection.execute('INSERT OR REPLACE INTO service_sync_state '
+                               'SELECT ?, ?, ?, coalesce(max(nonce), ? - 1) FROM service_txs '
+                               'WHERE chain_id=? AND safe_address=? AND nonce>=? AND is_executed',
+                               (chain_id, safe_address, first_nonce, first_nonce, chain_id, safe_address,
+                                first_nonce))
+
+    def save_tokens(self, chain_id: int, safe_address: str, token_balances: Sequence[TokenBalance]) -> None:
+        with self._transaction() as connection:
+            connection.executemany('INSERT OR REPLACE INTO tokens VALUES (?, ?, ?, ?, ?, ?)', [
+                (chain_id, safe_address, token_balance.token_address, token_balance.decimals, token_balance.symbol,
+                 token_balance.name)
+                for token_balance in token_balances if token_balance.token_address
+            ])
+
+    def get_tokens(self, chain_id: int, safe_address: str) -> Dict[str, TokenMetadata]:
+        """
+        :return: Metadata of the tokens seen for the Safe, by token address
+        """
+        with self._lock:
+            rows = self._connection.execute('SELECT token_address, decimals, symbol, name FROM tokens '
+                                            'WHERE chain_id=? AND safe_address=? ORDER BY rowid',
+                                            (chain_id, safe_address)).fetchall()
+        return {token_address: TokenMetadata(decimals, symbol, name) for token_address, decimals, symbol, name in rows}
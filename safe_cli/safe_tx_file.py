@@ -0,0 +1,116 @@
+"""
+JSON files with lists of Safe transactions, used to sign and execute transactions in bulk. Every transaction is
+an object with the fields of the tx service API (`to`, `value`, `data`, `operation`, `safeTxGas`, `baseGas`,
+`gasPrice`, `gasToken`, `refundReceiver` and `nonce`). Only `to` is required. Signed files also include
+`safeTxHash` and `signatures`
+"""
+import json
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from gnosis.eth.constants import NULL_ADDRESS
+
+
+class SafeTxFileException(Exception):
+    pass
+
+
+class SafeTxData(NamedTuple):
+    to: str
+    value: int
+    data: bytes
+    operation: int
+    safe_tx_gas: int
+    base_gas: int
+    gas_price: int
+    gas_token: str
+    refund_receiver: str
+    nonce: Optional[int]
+    signatures: bytes = b''
+
+    @classmethod
+    def from_dict(cls, safe_tx_dict: Dict[str, Any]) -> 'SafeTxData':
+        try:
+            nonce = safe_tx_dict.get('nonce')
+            return cls(Web3.toChecksumAddress(safe_tx_dict['to']),
+                       int(safe_tx_dict.get('value') or 0),
+                       HexBytes(safe_tx_dict.get('data') or b''),
+                       int(safe_tx_dict.get('operation') or 0),
+                       int(safe_tx_dict.get('safeTxGas') or 0),
+                       int(safe_tx_dict.get('baseGas') or 0),
+                       int(safe_tx_dict.get('gasPrice') or 0),
+                       Web3.toChecksumAddress(safe_tx_dict.get('gasToken') or NULL_ADDRESS),
+                       Web3.toChecksumAddress(safe_tx_dict.get('refundReceiver') or NULL_ADDRESS),
+                       None if nonce is None else int(nonce),
+                       HexBytes(safe_tx_dict.get('signatures') or b''))
+        except (KeyError, TypeError, ValueError) as e:
+            raise SafeTxFileException(f'Invalid Safe tx {safe_tx_dict}: {e}') from e
+
+    def to_dict(self, safe_tx_hash: Optional[bytes] = None) -> Dict[str, Any]:
+        safe_tx_dict = {
+            'to': self.to,
+            'value': self.value,
+            'data': HexBytes(self.data).hex() if self.data else None,
+            'operation': self.operation,
+            'safeTxGas': self.safe_tx_gas,
+            'baseGas': self.base_gas,
+            'gasPrice': self.gas_price,
+            'gasToken': self.gas_token,
+            'refundReceiver': self.refund_receiver,
+            'nonce': self.nonce,
+        }
+        if safe_tx_hash:
+            safe_tx_dict['safeTxHash'] = HexBytes(safe_tx_hash).hex()
+        if self.signatures:
+            safe_tx_dict['signatures'] = HexBytes(self.signatures).hex()
+        return safe_tx_dict
+
+
+def read_safe_txs_file(path: str) -> List[SafeTxData]:
+    """
+    :param path: JSON file with a list of Safe transactions
+    :return: Transactions in the same order of the file
+    :raises: SafeTxFileException
+    """
+    try:
+        with open(path) as safe_txs_file:
+            safe_tx_dicts = json.load(safe_txs_file)
+    except (OSError, ValueError) as e:
+        raise SafeTxFileException(f'Cannot read Safe txs from {path}: {e}') from e
+    if not isinstance(safe_tx_dicts, list) or not all(isinstance(element, dict) for element in safe_tx_dicts):
+        raise SafeTxFileException(f'{path} must contain a list of Safe txs')
+    return [SafeTxData.from_dict(safe_tx_dict) for safe_tx_dict in safe_tx_dicts]
+
+
+def write_safe_txs_file(path: str, safe_txs: List[SafeTxData], safe_tx_hashes: Optional[List[bytes]] = None):
+    """
+    :param path:
+    :param safe_txs:
+    :param safe_tx_hashes: If provided, stored as `safeTxHash` for every tx
+    :raises: SafeTxFileException
+    """
+    safe_tx_hashes = safe_tx_hashes or [None] * len(safe_txs)
+    try:
+        with open(path, 'w') as safe_txs_file:
+            json.dump([safe_tx.to_dict(safe_tx_hash) for safe_tx, safe_tx_hash in zip(safe_txs, safe_tx_hashes)],
+                      safe_txs_file, indent=2)
+    except OSError as e:
+        raise SafeTxFileException(f'Cannot write Safe txs to {path}: {e}') from e
+
+
+def assign_nonces(safe_txs: List[SafeTxData], start_nonce: int) -> List[SafeTxData]:
+    """
+    :param safe_txs:
+    :param start_nonce:
+    :return: Txs without nonce get consecutive nonces after `start_nonce` or the previous tx nonce
+    """
+    next_nonce = start_nonce
+    result = []
+    for safe_tx in safe_txs:
+        if safe_tx.nonce is None:
+            safe_tx = safe_tx._replace(nonce=next_nonce)
+        result.append(safe_tx)
+        next_nonce = safe_tx.nonce + 1
+    return result
@@ -1,38 +1,51 @@
-from typing import Optional
+from typing import List, Optional
 
 from hexbytes import HexBytes
 from prompt_toolkit import HTML, print_formatted_text
-from tabulate import tabulate
 
 from gnosis.safe import SafeOperation, SafeTx
 
+from .api.async_gnosis_transaction import AsyncTransactionService
+from .api.async_runner import AsyncRunner
 from .api.base_api import BaseAPIException
 from .safe_operator import (AccountNotLoadedException,
                             NonExistingOwnerException, SafeOperator,
                             ServiceNotAvailable)
-from .utils import yes_or_no_question
+from .safe_operator_context import SafeOperatorContext
+from .safe_tx_file import SafeTxData
+from .utils import print_table, yes_or_no_question
+
+try:
+    from functools import cached_property
+except ImportError:
+    from cached_property import cached_property
 
 
 class SafeTxServiceOperator(SafeOperator):
-    def __init__(self, address: str, node_url: str):
-        super().__init__(address, node_url)
+    def __init__(self, address: str, node_url: str, context: Optional[SafeOperatorContext] = None):
+        super().__init__(address, node_url, context=context)
         if not self.safe_tx_service:
             raise ServiceNotAvailable(f'Cannot configure tx service for network {self.network.name}')
         self.require_all_signatures = False  # It doesn't require all signatures to be present to send a tx
 
+    @cached_property
+    def async_safe_tx_service(self) -> AsyncTransactionService:
+        return AsyncTransactionService(self.network)
+
     def approve_hash(self, hash_to_approve: HexBytes, sender: str) -> bool:
         raise NotImplementedError('Not supported when using tx service')
 
-    def get_delegates(self):
+    def get_delegates(self) -> bool:
         delegates = self.safe_tx_service.get_delegates(self.address)
         headers = ['delegate', 'delegator', 'label']
         rows = []
         for delegate in delegates:
             row = [delegate['delegate'], delegate['delegator'], delegate['label']]
             rows.append(row)
-        print(tabulate(rows, headers=headers))
+        print_table(rows, headers)
+        return True
 
-    def add_delegate(self, delegate_address: str, label: str, signer_address: str):
+    def add_delegate(self, delegate_address: str, label: str, signer_address: str) -> bool:
         signer_account = [account for account in self.accounts if account.address == signer_address]
         if not signer_account:
             raise AccountNotLoadedException(signer_address)
@@ -46,7 +59,7 @@ class SafeTxServiceOperator(SafeOperator):
             except BaseAPIException:
                 return False
 
-    def remove_delegate(self, delegate_address: str, signer_address: str):
+    def remove_delegate(self, delegate_address: str, signer_address: str) -> bool:
         signer_account = [account for account in self.accounts if account.address == signer_address]
         if not signer_account:
             raise AccountNotLoadedException(signer_address)
@@ -73,3 +86,30 @@ class SafeTxServiceOperator(SafeOperator):
                                       f'to Gnosis Safe Transaction service</ansigreen>'))
             return True
         return False
+
+    def process_signed_transactions(self, safe_txs: List[SafeTxData]) -> bool:
+        return self.post_transactions_to_tx_service([self.build_safe_tx(safe_tx) for safe_tx in safe_txs])
+
+    def post_transactions_to_tx_service(self, safe_txs: List[SafeTx]) -> bool:
+        """
+        Send a batch of transactions to the tx service concurrently
+        :param safe_txs:
+        :return: `True` if every transaction was sent
+        """
+        if not yes_or_no_question(f'Do you want to send {len(safe_txs)} txs with nonces '
+                                  f'{[safe_tx.safe_nonce for safe_tx in safe_txs]} to the tx service'):
+            return False
+
+        results = AsyncRunner.get_default().gather(
+            [self.async_safe_tx_service.post_transaction(self.address, safe_tx) for safe_tx in safe_txs],
+            return_exceptions=True
+        )
+        self.safe_tx_service.invalidate_cached_responses(f'/api/v1/safes/{self.address}/')
+        for safe_tx, result in zip(safe_txs, results):
+            if isinstance(result, Exception):
+                print_formatted_text(HTML(f'<ansired>Cannot send tx with safe-tx-hash '
+                                          f'<b>{safe_tx.safe_tx_hash.hex()}</b>: {result}</ansired>'))
+            else:
+                print_formatted_text(HTML(f'<ansigreen>Tx with safe-tx-hash <b>{safe_tx.safe_tx_hash.hex()}</b> '
+                                          f'was sent to Gnosis Safe Transaction service</ansigreen>'))
+        return not any(isinstance(result, Exception) for result in results)
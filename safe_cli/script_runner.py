@@ -0,0 +1,76 @@
+import sys
+from typing import Dict, Iterable
+
+from prompt_toolkit import HTML, print_formatted_text
+
+from .operator_modes import OperatorModes
+from .prompt_parser import PromptParser
+from .safe_operator import SafeOperator
+
+EXIT_SUCCESS = 0
+EXIT_COMMAND_FAILED = 1  # Command reported an error
+EXIT_INVALID_COMMAND = 2  # Unknown command or not valid arguments
+EXIT_UNEXPECTED_ERROR = 3  # Command raised an exception not handled
+
+
+class ScriptRunner:
+    """
+    Run safe-cli commands without prompt, one per line, on the same process so the Safe information and
+    service connections are reused between commands. Empty lines and lines starting with `#` are ignored
+    """
+    def __init__(self, safe_operator: SafeOperator, keep_going: bool = False):
+        """
+        :param safe_operator:
+        :param keep_going: If `True`, keep running commands after one fails
+        """
+        self.operator_modes = OperatorModes(safe_operator)
+        self.keep_going = keep_going
+        self.prompt_parsers: Dict[int, PromptParser] = {}
+        self.prompt_parser = self.get_prompt_parser(safe_operator)
+
+    def get_prompt_parser(self, safe_operator: SafeOperator) -> PromptParser:
+        if id(safe_operator) not in self.prompt_parsers:
+            self.prompt_parsers[id(safe_operator)] = PromptParser(safe_operator)
+        return self.prompt_parsers[id(safe_operator)]
+
+    def run_command(self, command: str) -> int:
+        """
+        :param command:
+        :return: Exit code for the command
+        """
+        if command.split()[0] in OperatorModes.MODES:
+            new_operator = self.operator_modes.parse_operator_mode(command)
+            if not new_operator:
+                return EXIT_COMMAND_FAILED
+            self.prompt_parser = self.get_prompt_parser(new_operator)
+            return EXIT_SUCCESS
+
+        try:
+            result = self.prompt_parser.process_command(command)
+        except SystemExit:  # ArgParse already printed the error
+            return EXIT_INVALID_COMMAND
+        except Exception as e:
+            print_formatted_text(HTML(f'<ansired>Unexpected error: {type(e).__name__}</ansired>'))
+            print(e, file=sys.stderr)
+            return EXIT_UNEXPECTED_ERROR
+        return EXIT_COMMAND_FAILED if result is False else EXIT_SUCCESS
+
+    def run(self, lines: Iterable[str]) -> int:
+        """
+        :param lines: Commands, like the lines of a file or `sys.stdin`
+        :return: Exit code of the first command failing, `EXIT_SUCCESS` if every command succeeded
+        """
+        exit_code = EXIT_SUCCESS
+        for line_number, line in enumerate(lines, start=1):
+            command = line.strip()
+            if not command or command.startswith('#'):
+                continue
+
+            print(f'> {command}')
+            command_exit_code = self.run_command(command)
+            if command_exit_code != EXIT_SUCCESS:
+                print(f'Command on line {line_number} failed with exit code {command_exit_code}', file=sys.stderr)
+                exit_code = exit_code or command_exit_code
+                if not self.keep_going:
+                    break
+        return exit_code
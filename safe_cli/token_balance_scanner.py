@@ -0,0 +1,194 @@
+"""
+On-chain balances of ether and ERC20 tokens, for networks without Transaction Service. `balanceOf`, `decimals`,
+`symbol` and `name` of every token are called at the same block, grouped on chunks of Multicall3 `aggregate3`
+calls sent on one JSON-RPC batch. If Multicall3 is not deployed on the network every call is sent on the batch
+"""
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from eth_abi import decode_abi, decode_single
+from eth_abi.exceptions import DecodingError
+from hexbytes import HexBytes
+from web3 import Web3
+
+from gnosis.eth import EthereumClient
+
+from .batch_transfers import encode_call
+from .json_rpc import JsonRpcBatch, JsonRpcBatchNotSupported, JsonRpcRequest
+
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'  # Same address on every network
+
+
+class TokenBalanceScannerException(Exception):
+    pass
+
+
+class TokenMetadata(NamedTuple):
+    decimals: int
+    symbol: str
+    name: str
+
+
+class TokenBalance(NamedTuple):
+    token_address: Optional[str]  # `None` for ether
+    balance: int
+    decimals: int
+    symbol: str
+    name: str
+
+
+def read_token_addresses_file(path: str) -> List[str]:
+    """
+    :param path: JSON list of addresses, or one address per line (lines starting with `#` are ignored)
+    :return: Checksummed token addresses, without duplicates
+    :raises: TokenBalanceScannerException
+    """
+    try:
+        with open(path) as tokens_file:
+            content = tokens_file.read()
+        if path.endswith('.json'):
+            addresses = json.loads(content)
+        else:
+            addresses = [line.strip() for line in content.splitlines()
+                         if line.strip() and not line.strip().startswith('#')]
+        return list(dict.fromkeys(Web3.toChecksumAddress(address) for address in addresses))
+    except (OSError, TypeError, ValueError) as e:
+        raise TokenBalanceScannerException(f'Cannot read tokens from {path}: {e}') from e
+
+
+def decode_string(data: bytes) -> str:
+    """
+    :param data: Result of `symbol()` or `name()`
+    :return: Decoded string. Some old tokens (like MKR) return `bytes32`
+    """
+    try:
+        return decode_single('string', data)
+    except (DecodingError, UnicodeDecodeError, OverflowError):
+        return data[:32].rstrip(b'\0').decode(errors='replace')
+
+
+class TokenBalanceScanner:
+    CHUNK_SIZE = 400  # Calls on every `aggregate3`, 4 calls for every token
+
+    def __init__(self, ethereum_client: EthereumClient, json_rpc_batch: JsonRpcBatch,
+                 chunk_size: Optional[int] = None):
+        self.ethereum_client = ethereum_client
+        self.json_rpc_batch = json_rpc_batch
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.multicall_deployed: Optional[bool] = None  # Checked on first scan
+
+    def request(self, requests: Sequence[JsonRpcRequest]) -> List[Any]:
+        """
+        :param requests: `eth_getBalance`, `eth_getCode` or `eth_call` requests
+        :return: Results on one JSON-RPC batch if supported, `Exception` for failed requests. Balances are
+            returned as `int` and the rest as `HexBytes`
+        """
+        try:
+            results = self.json_rpc_batch.request(requests, raise_exception=False)
+        except JsonRpcBatchNotSupported:
+            results = []
+            for method, params in requests:
+                block_identifier = int(params[-1], 16)
+                try:
+                    if method == 'eth_getBalance':
+                        results.append(self.ethereum_client.w3.eth.get_balance(params[0], block_identifier))
+                    elif method == 'eth_getCode':
+                        results.append(self.ethereum_client.w3.eth.get_code(params[0], block_identifier))
+                    else:
+                        results.append(self.ethereum_client.w3.eth.call(params[0], block_identifier))
+                except ValueError as e:  # Reverted
+                    results.append(e)
+
+        parsed_results = []
+        for (method, _), result in zip(requests, results):
+            if isinstance(result, Exception):
+                parsed_results.append(result)
+            elif method == 'eth_getBalance':
+                parsed_results.append(int(result, 16) if isinstance(result, str) else result)
+            else:
+                parsed_results.append(HexBytes(result))
+        return parsed_results
+
+    def call_each(self, calls: Sequence[Tuple[str, bytes]], block_identifier: str) -> List[Optional[bytes]]:
+        results = self.request([('eth_call', [{'to': to, 'data': HexBytes(data).hex()}, block_identifier])
+                                for to, data in calls])
+        return [None if isinstance(result, Exception) else bytes(result) for result in results]
+
+    def call(self, calls: Sequence[Tuple[str, bytes]], block_number: int) -> List[Optional[bytes]]:
+        """
+        :param calls: List of contract address and data
+        :param block_number:
+        :return: Return data of every call, `None` if it failed
+        """
+        block_identifier = hex(block_number)
+        if not self.multicall_deployed:
+            return self.call_each(calls, block_identifier)
+
+        chunks = [calls[i:i + self.chunk_size] for i in range(0, len(calls), self.chunk_size)]
+        chunk_results = self.request([
+            ('eth_call', [{'to': MULTICALL3_ADDRESS,
+                           'data': HexBytes(encode_call('aggregate3((address,bool,bytes)[])',
+                                                        ['(address,bool,bytes)[]'],
+                                                        [[(to, True, data) for to, data in chunk]])).hex()},
+                          block_identifier])
+            for chunk in chunks
+        ])
+        results = []
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            try:
+                if isinstance(chunk_result, Exception):
+                    raise chunk_result
+                (call_results,) = decode_abi(['(bool,bytes)[]'], chunk_result)
+                results.extend(return_data if success else None for success, return_data in call_results)
+            except (DecodingError, ValueError):  # Chunk over the gas limit of `eth_call` of the node...
+                results.extend(self.call_each(chunk, block_identifier))
+        return results
+
+    def get_balances(self, address: str, token_addresses: Sequence[str],
+                     token_metadata: Optional[Dict[str, TokenMetadata]] = None) -> List[TokenBalance]:
+        """
+        :param address: Holder of the tokens, like a Safe
+        :param token_addresses:
+        :param token_metadata: Metadata already known by token address, only `balanceOf` is called for them
+        :return: Ether balance and tokens with balance, all at the same block. Contracts not implementing
+            `balanceOf` and `decimals` are ignored
+        """
+        token_metadata = token_metadata or {}
+        block_number = self.ethereum_client.w3.eth.block_number
+        requests = [('eth_getBalance', [address, hex(block_number)])]
+        if self.multicall_deployed is None:
+            requests.append(('eth_getCode', [MULTICALL3_ADDRESS, hex(block_number)]))
+        results = self.request(requests)
+        if isinstance(results[0], Exception):
+            raise TokenBalanceScannerException(f'Cannot get ether balance: {results[0]}')
+        if self.multicall_deployed is None:
+            self.multicall_deployed = not isinstance(results[1], Exception) and bool(results[1])
+
+        calls = []
+        for token_address in token_addresses:
+            calls.append((token_address, encode_call('balanceOf(address)', ['address'], [address])))
+            if token_address not in token_metadata:
+                calls.extend([
+                    (token_address, encode_call('decimals()', [], [])),
+                    (token_address, encode_call('symbol()', [], [])),
+                    (token_address, encode_call('name()', [], [])),
+                ])
+        call_results = iter(self.call(calls, block_number) if calls else [])
+
+        token_balances = [TokenBalance(None, results[0], 18, 'Ξ', 'ETHER')]
+        for token_address in token_addresses:
+            balance_data = next(call_results)
+            metadata = token_metadata.get(token_address)
+            metadata_data = None if metadata else (next(call_results), next(call_results), next(call_results))
+            try:
+                balance = decode_single('uint256', balance_data)
+                if not metadata:
+                    decimals_data, symbol_data, name_data = metadata_data
+                    metadata = TokenMetadata(decode_single('uint8', decimals_data),
+                                             decode_string(symbol_data) if symbol_data else '',
+                                             decode_string(name_data) if name_data else '')
+            except (DecodingError, TypeError):  # Not an ERC20
+                continue
+            if balance:
+                token_balances.append(TokenBalance(token_address, balance, *metadata))
+        return token_balances
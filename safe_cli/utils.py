@@ -1,9 +1,33 @@
+import hashlib
 import os
+from typing import Any, Optional, Sequence
+
+_non_interactive_answer: Optional[bool] = None
+
+
+def set_non_interactive_answer(answer: Optional[bool]):
+    """
+    Answer every `yes_or_no_question` without reading from stdin, used when running scripts
+
+    :param answer: `True` to confirm everything, `False` to reject everything, `None` to ask again
+    """
+    global _non_interactive_answer
+    _non_interactive_answer = answer
+
+
+def is_interactive() -> bool:
+    """
+    :return: `False` when running scripts or daemon commands, where nobody can type an answer or a password
+    """
+    return _non_interactive_answer is None
 
 
 def yes_or_no_question(question: str, default_no: bool = True) -> bool:
     if 'PYTEST_CURRENT_TEST' in os.environ:
         return True  # Ignore confirmations when running tests
+    if _non_interactive_answer is not None:
+        print(question + (' [yes]' if _non_interactive_answer else ' [no]'))
+        return _non_interactive_answer
     choices = ' [y/N]: ' if default_no else ' [Y/n]: '
     default_answer = 'n' if default_no else 'y'
     reply = str(input(question + choices)).lower().strip() or default_answer
@@ -13,3 +37,58 @@ def yes_or_no_question(question: str, default_no: bool = True) -> bool:
         return False
     else:
         return False if default_no else True
+
+
+def get_cache_dir() -> str:
+    """
+    :return: Directory for safe-cli persistent caches. It can be configured with `SAFE_CLI_CACHE_DIR` environment
+        variable, otherwise `$XDG_CACHE_HOME/safe-cli` is used
+    """
+    cache_dir = os.environ.get('SAFE_CLI_CACHE_DIR') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'safe-cli'
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def get_banner(text: str) -> str:
+    """
+    Render `text` with pyfiglet. Rendering is cached on disk, as importing pyfiglet and loading its fonts takes
+    longer than the rest of the startup without network calls
+
+    :param text:
+    :return: Fancy text
+    """
+    try:
+        banner_path = os.path.join(get_cache_dir(), 'banner-' + hashlib.sha1(text.encode()).hexdigest() + '.txt')
+    except OSError:  # Cache dir cannot be created (read only filesystem...), banner is rendered every time
+        import pyfiglet
+        return pyfiglet.figlet_format(text)
+
+    try:
+        with open(banner_path) as banner_file:
+            return banner_file.read()
+    except OSError:
+        pass
+
+    import pyfiglet
+    banner = pyfiglet.figlet_format(text)
+    try:
+        temporary_path = f'{banner_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as banner_file:
+            banner_file.write(banner)
+        os.replace(temporary_path, banner_path)  # Never read a half written banner
+    except OSError:  # Not cached, but banner can still be printed
+        pass
+    return banner
+
+
+def print_table(rows: Sequence[Sequence[Any]], headers: Sequence[str]):
+    """
+    Print rows with tabulate. It's only imported by the commands showing tables
+
+    :param rows:
+    :param headers:
+    """
+    from tabulate import tabulate
+    print(tabulate(rows, headers=headers))
@@ -1,26 +1,19 @@
 import argparse
 import secrets
 import sys
-from binascii import Error
-from typing import List
+from typing import List, Optional
 
-import pyfiglet
-from eth_account import Account
-from eth_account.signers.local import LocalAccount
-from eth_typing import URI
 from hexbytes import HexBytes
-from prompt_toolkit import print_formatted_text
 
-from gnosis.eth import EthereumClient
-from gnosis.eth.constants import NULL_ADDRESS
-from gnosis.eth.contracts import get_safe_V1_3_0_contract
-from gnosis.safe import ProxyFactory
-
-from safe_cli.prompt_parser import check_ethereum_address
+from safe_cli.argparse_validators import check_ethereum_address
 from safe_cli.safe_addresses import (LAST_DEFAULT_CALLBACK_HANDLER,
                                      LAST_PROXY_FACTORY_CONTRACT,
                                      LAST_SAFE_CONTRACT)
-from safe_cli.utils import yes_or_no_question
+
+# Like `safe_cli.py`, web3, eth_account and gnosis-py are imported after parsing the arguments, so `--help` and not
+# valid arguments don't wait for them
+
+SECP256K1_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 
 
 def positive_integer(number: str) -> int:
@@ -32,42 +25,61 @@ def positive_integer(number: str) -> int:
 
 def check_private_key(private_key: str) -> str:
     """
-    Ethereum private key validator for ArgParse
+    Ethereum private key validator for ArgParse, checked without eth_account
     :param private_key: Ethereum Private key
     :return: Ethereum Private key
     """
     try:
-        Account.from_key(private_key)
-    except (ValueError, Error):  # TODO Report `Error` exception as a bug of eth_account
+        key = HexBytes(private_key)
+    except ValueError:
+        key = b''
+    if len(key) != 32 or not 0 < int.from_bytes(key, 'big') < SECP256K1_ORDER:
         raise argparse.ArgumentTypeError(f'{private_key} is not a valid private key')
     return private_key
 
 
-parser = argparse.ArgumentParser()
-parser.add_argument('node_url', help='Ethereum node url')
-parser.add_argument('private_key', help='Deployer private_key', type=check_private_key)
-parser.add_argument('--threshold', help='Number of owners required to execute transactions on the created Safe. It must'
-                                        'be greater than 0 and less or equal than the number of owners',
-                    type=positive_integer, default=1)
-parser.add_argument('--owners', help='Owners. By default it will be just the deployer', nargs='+',
-                    type=check_ethereum_address)
-parser.add_argument('--safe-contract', help='Use a custom Safe master copy',
-                    default=LAST_SAFE_CONTRACT, type=check_ethereum_address)
-parser.add_argument('--proxy-factory', help='Use a custom proxy factory',
-                    default=LAST_PROXY_FACTORY_CONTRACT, type=check_ethereum_address)
-parser.add_argument('--callback-handler',
-                    help='Use a custom fallback handler. It is not required for Safe Master Copies '
-                         'with version < 1.1.0',
-                    default=LAST_DEFAULT_CALLBACK_HANDLER, type=check_ethereum_address)
-parser.add_argument('--salt-nonce',
-                    help='Use a custom nonce for the deployment. Same nonce with same deployment configuration will '
-                         'lead to the same Safe address ',
-                    default=secrets.SystemRandom().randint(0, 2**256 - 1),  # TODO Add support for CPK
-                    type=int)
-
-if __name__ == '__main__':
-    print_formatted_text(pyfiglet.figlet_format('Gnosis Safe Creator'))  # Print fancy text
-    args = parser.parse_args()
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('node_url', help='Ethereum node url')
+    parser.add_argument('private_key', help='Deployer private_key', type=check_private_key)
+    parser.add_argument('--threshold',
+                        help='Number of owners required to execute transactions on the created Safe. It must'
+                             'be greater than 0 and less or equal than the number of owners',
+                        type=positive_integer, default=1)
+    parser.add_argument('--owners', help='Owners. By default it will be just the deployer', nargs='+',
+                        type=check_ethereum_address)
+    parser.add_argument('--safe-contract', help='Use a custom Safe master copy',
+                        default=LAST_SAFE_CONTRACT, type=check_ethereum_address)
+    parser.add_argument('--proxy-factory', help='Use a custom proxy factory',
+                        default=LAST_PROXY_FACTORY_CONTRACT, type=check_ethereum_address)
+    parser.add_argument('--callback-handler',
+                        help='Use a custom fallback handler. It is not required for Safe Master Copies '
+                             'with version < 1.1.0',
+                        default=LAST_DEFAULT_CALLBACK_HANDLER, type=check_ethereum_address)
+    parser.add_argument('--salt-nonce',
+                        help='Use a custom nonce for the deployment. Same nonce with same deployment configuration '
+                             'will lead to the same Safe address ',
+                        default=secrets.SystemRandom().randint(0, 2**256 - 1),  # TODO Add support for CPK
+                        type=int)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from eth_account import Account
+    from eth_account.signers.local import LocalAccount
+    from eth_typing import URI
+    from prompt_toolkit import print_formatted_text
+
+    from gnosis.eth import EthereumClient
+    from gnosis.eth.constants import NULL_ADDRESS
+    from gnosis.eth.contracts import get_safe_V1_3_0_contract
+    from gnosis.safe import ProxyFactory
+
+    from safe_cli.utils import get_banner, yes_or_no_question
+
+    print_formatted_text(get_banner('Gnosis Safe Creator'))  # Print fancy text
     node_url: URI = args.node_url
     account: LocalAccount = Account.from_key(args.private_key)
     owners: List[str] = list(set(args.owners)) if args.owners else [account.address]
@@ -81,7 +93,7 @@ if __name__ == '__main__':
 
     if len(owners) < threshold:
         print_formatted_text('Threshold cannot be bigger than the number of unique owners')
-        sys.exit(1)
+        return 1
 
     safe_contract_address = args.safe_contract
     proxy_factory_address = args.proxy_factory
@@ -91,7 +103,7 @@ if __name__ == '__main__':
     account_balance: int = ethereum_client.get_balance(account.address)
     if not account_balance:
         print_formatted_text('Client does not have any funds')
-        sys.exit(1)
+        return 1
     else:
         ether_account_balance = round(ethereum_client.w3.fromWei(account_balance, 'ether'), 6)
         print_formatted_text(f'Network {ethereum_client.get_network().name} - Sender {account.address} - '
@@ -100,7 +112,7 @@ if __name__ == '__main__':
     if not ethereum_client.w3.eth.getCode(safe_contract_address) \
             or not ethereum_client.w3.eth.getCode(proxy_factory_address):
         print_formatted_text('Network not supported')
-        sys.exit(1)
+        return 1
 
     print_formatted_text(f'Creating new Safe with owners={owners} threshold={threshold} '
                          f'fallback-handler={fallback_handler} salt-nonce={salt_nonce}')
@@ -120,3 +132,8 @@ if __name__ == '__main__':
         print_formatted_text(f'Tx with tx-hash={ethereum_tx_sent.tx_hash.hex()} '
                              f'will create safe={ethereum_tx_sent.contract_address}')
         print_formatted_text(f'Tx paramters={ethereum_tx_sent.tx}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import argparse
+import sys
+from typing import List, Optional
+
+from safe_cli.daemon_client import DaemonClient, DaemonNotAvailable
+
+EXIT_DAEMON_NOT_AVAILABLE = 4  # Next to the `ScriptRunner` exit codes
+EXIT_DAEMON_ALREADY_RUNNING = 5
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Keep safe-cli running on the background and send it commands')
+    parser.add_argument('--socket', type=str, help='Unix socket of the daemon. By default on the safe-cli cache dir')
+    subparsers = parser.add_subparsers(dest='action', required=True)
+
+    parser_serve = subparsers.add_parser('serve', help='Start the daemon')
+    parser_serve.add_argument('node_url', help='Ethereum node url')
+    parser_serve.add_argument('--safe-address', type=str, nargs='*', default=[],
+                              help='Load these Safes on startup instead of on the first command')
+
+    parser_run = subparsers.add_parser('run', help='Run commands on a running daemon')
+    parser_run.add_argument('safe_address', help='Address of Safe to use')
+    parser_run.add_argument('command', nargs=argparse.REMAINDER,
+                            help='Command to run, options of `run` must go before the Safe address. '
+                                 'If not provided, read from `--script`')
+    parser_run.add_argument('--script', type=str, help='Run the commands on this file (or stdin if `-`)')
+    parser_run.add_argument('--yes', action='store_true',
+                            help='Confirm every question. By default they are rejected')
+    parser_run.add_argument('--keep-going', action='store_true', help='Keep running commands after one fails')
+    return parser
+
+
+def serve(socket_path: Optional[str], node_url: str, safe_addresses: List[str]) -> int:
+    # Client doesn't need to import the Safe dependencies
+    from safe_cli.argparse_validators import to_checksummed_ethereum_address
+    from safe_cli.daemon import DaemonAlreadyRunning, SafeCliDaemon
+
+    safe_cli_daemon = SafeCliDaemon(node_url, socket_path=socket_path)
+    for safe_address in safe_addresses:
+        safe_cli_daemon.get_script_runner(to_checksummed_ethereum_address(safe_address))
+    try:
+        safe_cli_daemon.serve_forever()
+    except DaemonAlreadyRunning as e:
+        print(e, file=sys.stderr)
+        return EXIT_DAEMON_ALREADY_RUNNING
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run(socket_path: Optional[str], safe_address: str, commands: List[str], yes: bool, keep_going: bool) -> int:
+    exit_code = 0
+    try:
+        with DaemonClient(socket_path) as daemon_client:
+            for response in daemon_client.send_commands(safe_address, commands, yes=yes):
+                print(response['output'], end='')
+                exit_code = exit_code or response['exit_code']
+                if exit_code and not keep_going:
+                    break
+    except DaemonNotAvailable as e:
+        print(e, file=sys.stderr)
+        return EXIT_DAEMON_NOT_AVAILABLE
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.action == 'serve':
+        return serve(args.socket, args.node_url, args.safe_address)
+
+    if args.command:
+        return run(args.socket, args.safe_address, [' '.join(args.command)], args.yes, args.keep_going)
+    elif args.script == '-':
+        return run(args.socket, args.safe_address, sys.stdin, args.yes, args.keep_going)
+    elif args.script:
+        with open(args.script) as script_file:
+            return run(args.socket, args.safe_address, script_file, args.yes, args.keep_going)
+    build_parser().error('A command or `--script` is required')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import asyncio
+import unittest
+import warnings
+from types import SimpleNamespace
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from gnosis.eth.ethereum_client import EthereumNetwork
+
+from safe_cli.api.async_base_api import AsyncBaseAPI
+from safe_cli.api.async_gnosis_relay import AsyncRelayService
+from safe_cli.api.async_gnosis_transaction import AsyncTransactionService
+from safe_cli.api.async_runner import AsyncRunner
+from safe_cli.api.base_api import BaseAPIException
+from safe_cli.safe_tx_service_operator import SafeTxServiceOperator
+
+SAFE_ADDRESS = '0x7552Ed65a45E27740a15B8D5415E90d8ca64C109'
+
+
+class FakeServiceHandler:
+    """
+    Transaction service failing the first `failures` requests of every path with `503`, and tracking the requests
+    in flight
+    """
+    def __init__(self, failures: int = 0, delay: float = 0):
+        self.failures = failures
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.path_qs))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if len([path for _, path in self.requests if path == request.path_qs]) <= self.failures:
+            return web.Response(status=503)
+        if request.path.endswith('/multisig-transactions/') and request.method == 'GET':
+            page = int(request.query.get('page', 0))
+            return web.json_response({
+                'next': f'/api/v1/safes/{SAFE_ADDRESS}/multisig-transactions/?page={page + 1}' if page < 2 else None,
+                'results': [{'nonce': 8 - page * 3 - i} for i in range(3)],
+            })
+        if request.path.endswith('/estimate/'):
+            return web.json_response({'safeTxGas': '1', 'baseGas': '2', 'gasPrice': '3', 'lastUsedNonce': 4,
+                                      'gasToken': SAFE_ADDRESS, 'refundReceiver': SAFE_ADDRESS})
+        if request.path.endswith('/transactions/'):
+            return web.json_response({'safeTxHash': '0x01', 'txHash': '0x02'}, status=201)
+        return web.json_response({}, status=201)
+
+
+def build_safe_tx(nonce: int) -> SimpleNamespace:
+    return SimpleNamespace(sorted_signers=[], to=SAFE_ADDRESS, value=0, data=b'', operation=0,
+                           gas_token=SAFE_ADDRESS, safe_tx_gas=0, base_gas=0, gas_price=0,
+                           refund_receiver=SAFE_ADDRESS, safe_nonce=nonce, safe_tx_hash=bytes([nonce]) * 32,
+                           signatures=b'')
+
+
+@mock.patch.multiple(AsyncBaseAPI, RETRY_BACKOFF_FACTOR=0, RETRY_BACKOFF_JITTER=0)
+class TestAsyncBaseAPI(unittest.TestCase):
+    def setUp(self) -> None:
+        self.async_runner = AsyncRunner()
+        self.servers = []
+
+    def tearDown(self) -> None:
+        if self.async_runner.is_running:
+            for server in self.servers:
+                self.async_runner.run(server.close())
+        self.async_runner.shutdown()
+
+    def start_server(self, handler: FakeServiceHandler) -> str:
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handler.handle)
+        server = TestServer(app)
+        self.async_runner.run(server.start_server())
+        self.servers.append(server)
+        return str(server.make_url('/'))
+
+    def test_retries(self):
+        handler = FakeServiceHandler(failures=2)
+        transaction_service = AsyncTransactionService(EthereumNetwork.RINKEBY, base_url=self.start_server(handler))
+        self.assertEqual(len(self.async_runner.run(transaction_service.get_transactions(SAFE_ADDRESS))), 9)
+        self.assertEqual(len(handler.requests), 9)  # 3 pages, 3 times each
+
+        # POST is never retried
+        handler.requests.clear()
+        with self.assertRaises(BaseAPIException):
+            self.async_runner.run(transaction_service.post_transaction(SAFE_ADDRESS, build_safe_tx(1)))
+        self.assertEqual(len(handler.requests), 1)
+
+        # Retries are exhausted
+        handler = FakeServiceHandler(failures=5)
+        transaction_service = AsyncTransactionService(EthereumNetwork.RINKEBY, base_url=self.start_server(handler))
+        with mock.patch.object(AsyncBaseAPI, 'RETRIES', 1), self.assertRaises(BaseAPIException):
+            self.async_runner.run(transaction_service.get_balances(SAFE_ADDRESS))
+        self.assertEqual(len(handler.requests), 2)
+
+    def test_relay_service(self):
+        relay_service = AsyncRelayService(EthereumNetwork.RINKEBY, base_url=self.start_server(FakeServiceHandler()))
+        safe_tx = build_safe_tx(1)
+        self.assertEqual(self.async_runner.run(relay_service.get_estimation(SAFE_ADDRESS, safe_tx))['baseGas'], 2)
+        self.assertEqual(self.async_runner.run(relay_service.send_transaction(SAFE_ADDRESS, safe_tx)),
+                         {'safeTxHash': '0x01', 'txHash': '0x02'})
+
+    def test_pagination(self):
+        transaction_service = AsyncTransactionService(EthereumNetwork.RINKEBY,
+                                                      base_url=self.start_server(FakeServiceHandler()))
+        transactions = self.async_runner.run(transaction_service.get_transactions(SAFE_ADDRESS, min_nonce=3))
+        self.assertEqual([transaction['nonce'] for transaction in transactions], [8, 7, 6, 5, 4, 3])
+
+    def test_post_transactions_concurrently(self):
+        handler = FakeServiceHandler(delay=0.05)
+        async_safe_tx_service = AsyncTransactionService(EthereumNetwork.RINKEBY, max_concurrency=4,
+                                                        base_url=self.start_server(handler))
+        safe_tx_service_operator = SimpleNamespace(address=SAFE_ADDRESS, safe_tx_service=mock.MagicMock(),
+                                                   async_safe_tx_service=async_safe_tx_service)
+        with mock.patch('safe_cli.safe_tx_service_operator.yes_or_no_question', return_value=True), \
+                mock.patch.object(AsyncRunner, 'get_default', return_value=self.async_runner):
+            self.assertTrue(SafeTxServiceOperator.post_transactions_to_tx_service(
+                safe_tx_service_operator, [build_safe_tx(nonce) for nonce in range(10)]
+            ))
+        self.assertEqual(len(handler.requests), 10)
+        self.assertEqual(handler.max_in_flight, 4)
+        safe_tx_service_operator.safe_tx_service.invalidate_cached_responses.assert_called_once()
+
+    def test_async_runner(self):
+        async def fail():
+            raise ValueError('Failed')
+
+        async def double(value: int) -> int:
+            await asyncio.sleep(0)
+            return value * 2
+
+        self.assertEqual(self.async_runner.gather([double(i) for i in range(3)]), [0, 2, 4])
+        results = self.async_runner.gather([double(1), fail()], return_exceptions=True)
+        self.assertEqual(results[0], 2)
+        self.assertIsInstance(results[1], ValueError)
+        with self.assertRaises(ValueError):
+            self.async_runner.run(fail())
+
+        # Sessions are closed on shutdown
+        server = self.start_server(FakeServiceHandler())
+        transaction_service = AsyncTransactionService(EthereumNetwork.RINKEBY, base_url=server)
+        self.async_runner.run(transaction_service.get_balances(SAFE_ADDRESS))
+        http_session = transaction_service._http_session
+        self.assertFalse(http_session.closed)
+        self.async_runner.run(self.servers.pop().close())
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            self.async_runner.shutdown()
+            self.async_runner.shutdown()  # Already stopped
+        self.assertTrue(http_session.closed)
+        self.assertFalse(self.async_runner.is_running)
+        self.assertEqual([str(warning.message) for warning in caught_warnings
+                          if 'Unclosed' in str(warning.message)], [])
+
+        # A new default runner is started if the previous one was shut down
+        default_async_runner = AsyncRunner.get_default()
+        default_async_runner.shutdown()
+        self.assertIsNot(AsyncRunner.get_default(), default_async_runner)
+        self.assertTrue(AsyncRunner.get_default().is_running)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from gnosis.eth.ethereum_client import EthereumNetwork
+
+from safe_cli.api.base_api import JitteredRetry
+from safe_cli.api.etherscan import Etherscan
+from safe_cli.api.gnosis_transaction import TransactionService
+
+
+class TestBaseAPI(unittest.TestCase):
+    def test_http_session(self):
+        transaction_service = TransactionService(EthereumNetwork.RINKEBY)
+        self.assertIs(transaction_service.http_session,
+                      TransactionService(EthereumNetwork.RINKEBY).http_session)
+        self.assertIsNot(transaction_service.http_session,
+                         TransactionService(EthereumNetwork.MAINNET).http_session)
+        self.assertIsNot(transaction_service.http_session,
+                         Etherscan(EthereumNetwork.RINKEBY).http_session)
+
+        adapter = transaction_service.http_session.get_adapter(transaction_service.base_url)
+        self.assertIsInstance(adapter.max_retries, JitteredRetry)
+        self.assertEqual(adapter.max_retries.total, TransactionService.RETRIES)
+
+    def test_jittered_retry(self):
+        retry = JitteredRetry(total=3, backoff_factor=1, backoff_jitter=0.5)
+        self.assertEqual(retry.get_backoff_time(), 0)  # No backoff for the first retry
+        retry = retry.increment('GET', '/').increment('GET', '/')
+        self.assertEqual(retry.backoff_jitter, 0.5)
+        self.assertGreaterEqual(retry.get_backoff_time(), 2)
+        self.assertLessEqual(retry.get_backoff_time(), 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
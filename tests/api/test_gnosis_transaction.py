@@ -1,5 +1,13 @@
 import unittest
+from datetime import datetime, timezone
+from unittest import mock
 
+from requests import Response
+
+from gnosis.eth.ethereum_client import EthereumNetwork
+
+from benchmarks.fake_transaction_service import FakeTransactionServiceServer
+from safe_cli.api.base_api import JitteredRetry
 from safe_cli.api.gnosis_transaction import TransactionService
 
 
@@ -41,6 +49,61 @@ class TestTransactionService(unittest.TestCase):
         transactions = self.transaction_service.get_transactions(self.safe_address)
         self.assertIsInstance(transactions, list)
 
+    def test_iter_transactions(self):
+        def build_response(nonces, next_url):
+            response = Response()
+            response.status_code = 200
+            response.json = lambda: {'next': next_url,
+                                     'results': [{'nonce': nonce, 'submissionDate': f'2021-07-{nonce:02d}T10:00:00Z'}
+                                                 for nonce in nonces]}
+            return response
+
+        pages = {
+            f'/api/v1/safes/{self.safe_address}/multisig-transactions/': build_response([10, 9, 8], 'page-2'),
+            'page-2': build_response([7, 6, 5], 'page-3'),
+            'page-3': build_response([4, 3], None),
+        }
+        with mock.patch.object(TransactionService, '_get_request', side_effect=lambda url: pages[url]) as get_mock:
+            transactions = self.transaction_service.iter_transactions(self.safe_address)
+            self.assertEqual(next(transactions)['nonce'], 10)
+            self.assertEqual([transaction['nonce'] for transaction in transactions], [9, 8, 7, 6, 5, 4, 3])
+            self.assertEqual(get_mock.call_count, 3)
+
+            self.assertEqual([transaction['nonce'] for transaction in
+                              self.transaction_service.iter_transactions(self.safe_address, min_nonce=6)],
+                             [10, 9, 8, 7, 6])
+            since = datetime(2021, 7, 9, tzinfo=timezone.utc)
+            self.assertEqual([transaction['nonce'] for transaction in
+                              self.transaction_service.iter_transactions(self.safe_address, since=since)],
+                             [10, 9])
+            self.assertEqual(len(self.transaction_service.get_transactions(self.safe_address)), 8)
+
+            # Pages are truncated on the limit
+            self.assertEqual([[transaction['nonce'] for transaction in transactions] for transactions in
+                              self.transaction_service.iter_transaction_pages(self.safe_address, min_nonce=6)],
+                             [[10, 9, 8], [7, 6]])
+            self.assertEqual(len(list(self.transaction_service.iter_transaction_pages(self.safe_address,
+                                                                                      min_nonce=8))), 1)
+
+    @mock.patch.object(TransactionService, 'CACHE_TTLS', {})  # Don't use the cache
+    def test_fake_transaction_service(self):
+        server = FakeTransactionServiceServer(page_size=7).start()
+        try:
+            transaction_service = TransactionService(EthereumNetwork.RINKEBY, base_url=server.url)
+            transactions = transaction_service.get_transactions(self.safe_address)
+            self.assertEqual([transaction['nonce'] for transaction in transactions], list(reversed(range(50))))
+            self.assertEqual(len(transaction_service.get_balances(self.safe_address)), 11)
+            self.assertEqual(transaction_service.get_delegates(self.safe_address), [])
+
+            # Errors are retried, without waiting for the backoff
+            requests_received = server.requests_received
+            server.error_requests = {requests_received, requests_received + 1}
+            with mock.patch.object(JitteredRetry, 'get_backoff_time', return_value=0):
+                self.assertEqual(len(transaction_service.get_transactions(self.safe_address, min_nonce=40)), 10)
+            self.assertGreaterEqual(server.requests_received, requests_received + 2 + 2)  # 2 pages and 2 retries
+        finally:
+            server.stop()
+
 
 if __name__ == '__main__':
     unittest.main()
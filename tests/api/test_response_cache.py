@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from requests import Response
+
+from gnosis.eth.ethereum_client import EthereumNetwork
+
+from safe_cli.api.gnosis_transaction import TransactionService
+from safe_cli.api.response_cache import ResponseCache
+
+
+def build_response(status_code: int, content: bytes = b'', headers=None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = 'https://safe-transaction.rinkeby.gnosis.io'
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.response_cache = ResponseCache(os.path.join(self.temporary_directory.name, 'cache.sqlite3'),
+                                            max_entries=3)
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def test_response_cache(self):
+        key = self.response_cache.build_key('RINKEBY', '/balances/', {'trusted': False, 'exclude_spam': True})
+        self.assertEqual(key, 'RINKEBY:/balances/?exclude_spam=True&trusted=False')
+        self.assertIsNone(self.response_cache.get(key))
+
+        self.response_cache.set(key, build_response(200, b'[]', {'ETag': 'W/"1"'}))
+        cached_response = self.response_cache.get(key)
+        self.assertEqual(cached_response.etag, 'W/"1"')
+        self.assertIsNone(cached_response.last_modified)
+        self.assertEqual(cached_response.to_response().json(), [])
+
+        # Least recently used entries are evicted
+        for i in range(3):
+            self.response_cache.set(f'RINKEBY:/safes/{i}/', build_response(200, b'{}'))
+            self.response_cache.get(key)
+        self.assertIsNotNone(self.response_cache.get(key))
+        self.assertIsNone(self.response_cache.get('RINKEBY:/safes/0/'))
+        self.assertIsNotNone(self.response_cache.get('RINKEBY:/safes/2/'))
+
+        self.response_cache.invalidate('RINKEBY:/safes/')
+        self.assertIsNone(self.response_cache.get('RINKEBY:/safes/2/'))
+        self.assertIsNotNone(self.response_cache.get(key))
+
+    def test_transaction_service_cache(self):
+        transaction_service = TransactionService(EthereumNetwork.RINKEBY, response_cache=self.response_cache)
+        safe_address = '0x7552Ed65a45E27740a15B8D5415E90d8ca64C109'
+        with mock.patch.object(transaction_service.http_session, 'get',
+                               return_value=build_response(200, b'[]', {'ETag': 'W/"1"'})) as get_mock:
+            self.assertEqual(transaction_service.get_balances(safe_address), [])
+            self.assertEqual(transaction_service.get_balances(safe_address), [])
+            self.assertEqual(get_mock.call_count, 1)
+
+            # Expired, revalidate
+            with mock.patch.dict(TransactionService.CACHE_TTLS, {'/balances/': 0}):
+                get_mock.return_value = build_response(304)
+                self.assertEqual(transaction_service.get_balances(safe_address), [])
+                self.assertEqual(get_mock.call_count, 2)
+                self.assertEqual(get_mock.call_args[1]['headers'], {'If-None-Match': 'W/"1"'})
+
+        with mock.patch.object(transaction_service.http_session, 'delete', return_value=build_response(204)):
+            transaction_service._delete_request(f'/api/v1/safes/{safe_address}/delegates/0x1/', {})
+        cache_key = self.response_cache.build_key('RINKEBY', f'{transaction_service.base_url}/api/v1/safes/'
+                                                             f'{safe_address}/balances/')
+        self.assertIsNone(self.response_cache.get(cache_key))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import argparse
+import subprocess
+import sys
+import unittest
+from datetime import datetime, timezone
+
+from eth_account import Account
+
+from safe_cli.argparse_validators import (check_ethereum_address,
+                                          check_iso_date, check_keccak256_hash,
+                                          to_checksummed_ethereum_address)
+
+
+class TestArgparseValidators(unittest.TestCase):
+    def test_validators(self):
+        address = Account.create().address
+        self.assertEqual(check_ethereum_address(address), address)
+        self.assertEqual(to_checksummed_ethereum_address(address.lower()), address)
+        self.assertEqual(check_keccak256_hash('0x' + '1' * 64), bytes.fromhex('1' * 64))
+        self.assertEqual(check_iso_date('2021-01-01'), datetime(2021, 1, 1, tzinfo=timezone.utc))
+        for validator, value in ((check_ethereum_address, address.lower()), (to_checksummed_ethereum_address, '0x12'),
+                                 (check_keccak256_hash, '0x12'), (check_iso_date, 'aloha')):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                validator(value)
+
+    def test_light_imports(self):
+        # Entry points parse the arguments before importing the Safe dependencies
+        modules = subprocess.run([sys.executable, '-c', 'import sys, safe_cli.argparse_validators; '
+                                                        'print(" ".join(sys.modules))'],
+                                 check=True, capture_output=True, text=True).stdout.split()
+        for heavy_module in ('web3', 'gnosis', 'prompt_toolkit', 'pyfiglet', 'tabulate'):
+            self.assertNotIn(heavy_module, modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
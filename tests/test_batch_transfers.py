@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from eth_abi import encode_single
+from eth_account import Account
+
+from safe_cli.batch_transfers import (BatchTransfersChunker,
+                                      BatchTransfersException, Transfer,
+                                      TransferType, check_balances,
+                                      get_required_amounts,
+                                      read_transfers_file)
+from safe_cli.json_rpc import JsonRpcBatch
+
+
+class TestBatchTransfers(unittest.TestCase):
+    safe_address = '0x7552Ed65a45E27740a15B8D5415E90d8ca64C109'
+    token_address = '0x6810e776880C02933D47DB1b9fc05908e5386b96'
+    nft_address = '0x57f1887a8BF19b14fC0dF6Fd9B2acc9Af147eA85'
+
+    def test_read_transfers_file(self):
+        to = Account.create().address
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'transfers.csv')
+            with open(path, 'w') as transfers_file:
+                transfers_file.write(f'to,amount,token,type\n{to.lower()},5,,\n{to}, 7 ,{self.token_address},\n'
+                                     f'{to},3,{self.nft_address},ERC721\n')
+            self.assertEqual(read_transfers_file(path), [
+                Transfer(to, 5, None, TransferType.ETHER),
+                Transfer(to, 7, self.token_address, TransferType.ERC20),
+                Transfer(to, 3, self.nft_address, TransferType.ERC721),
+            ])
+
+            json_path = os.path.join(directory, 'transfers.json')
+            with open(json_path, 'w') as transfers_file:
+                transfers_file.write(f'[{{"to": "{to}", "amount": 5}}]')
+            self.assertEqual(read_transfers_file(json_path), [Transfer(to, 5, None, TransferType.ETHER)])
+
+            for row in (f'{to},-1,,', f'{to},1,,erc20', f'{to},1,{self.token_address},ether', 'aloha,1,,'):
+                with open(path, 'w') as transfers_file:
+                    transfers_file.write(f'to,amount,token,type\n{row}\n')
+                with self.assertRaises(BatchTransfersException):
+                    read_transfers_file(path)
+
+    def test_get_required_amounts(self):
+        to = Account.create().address
+        transfers = [Transfer(to, 5, None, TransferType.ETHER), Transfer(to, 7, self.token_address, 'erc20'),
+                     Transfer(to, 2, None, TransferType.ETHER), Transfer(to, 3, self.nft_address, 'erc721')]
+        self.assertEqual(get_required_amounts(transfers), {None: 7, self.token_address: 7})
+        with self.assertRaises(BatchTransfersException):
+            get_required_amounts(transfers + [Transfer(to, 3, self.nft_address, 'erc721')])
+
+    def test_check_balances(self):
+        to = Account.create().address
+        transfers = [Transfer(to, 5, None, TransferType.ETHER), Transfer(to, 7, self.token_address, 'erc20'),
+                     Transfer(to, 3, self.nft_address, 'erc721')]
+        json_rpc_batch = mock.MagicMock(spec=JsonRpcBatch)
+        json_rpc_batch.request.return_value = ['0x5', '0x' + encode_single('uint256', 7).hex(),
+                                               '0x' + encode_single('address', self.safe_address).hex()]
+        self.assertEqual(check_balances(mock.MagicMock(), json_rpc_batch, self.safe_address, transfers), [])
+        self.assertEqual(len(json_rpc_batch.request.call_args[0][0]), 3)  # Only one batch
+
+        json_rpc_batch.request.return_value = ['0x4', '0x' + encode_single('uint256', 6).hex(),
+                                               '0x' + encode_single('address', to).hex()]
+        self.assertEqual(len(check_balances(mock.MagicMock(), json_rpc_batch, self.safe_address, transfers)), 3)
+
+    def test_batch_transfers_chunker(self):
+        transfers = [Transfer(Account.create().address, 1, None, TransferType.ETHER) for _ in range(1000)]
+        chunker = BatchTransfersChunker(1000000)
+        chunks = chunker.chunk(self.safe_address, transfers)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 1000)
+        self.assertEqual([multisend_tx.to for chunk in chunks for multisend_tx in chunk],
+                         [transfer.to for transfer in transfers])
+        transfer_gas = chunker.estimate_gas(transfers[0], chunks[0][0])
+        self.assertEqual(len(chunks[0]), 1000000 // transfer_gas)
+
+        with self.assertRaises(BatchTransfersException):
+            BatchTransfersChunker(1000).chunk(self.safe_address, transfers)
+
+
+if __name__ == '__main__':
+    unittest.main()
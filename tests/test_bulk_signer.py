@@ -0,0 +1,93 @@
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from eth_account import Account
+from eth_account._utils.structured_data.hashing import (hash_domain,
+                                                        hash_message)
+from web3 import Web3
+
+from safe_cli.bulk_signer import BulkSigner, get_safe_tx_hash
+from safe_cli.safe_tx_file import SafeTxData
+
+
+class TestBulkSigner(unittest.TestCase):
+    safe_address = '0x7552Ed65a45E27740a15B8D5415E90d8ca64C109'
+
+    def build_safe_txs(self, number: int):
+        return [SafeTxData(Account.create().address, i, b'\x01' * i, 0, 0, 0, 0,
+                           '0x0000000000000000000000000000000000000000',
+                           '0x0000000000000000000000000000000000000000', i) for i in range(number)]
+
+    def test_get_safe_tx_hash(self):
+        safe_tx = self.build_safe_txs(2)[1]
+        structured_data = {
+            'types': {
+                'EIP712Domain': [{'name': 'chainId', 'type': 'uint256'},
+                                 {'name': 'verifyingContract', 'type': 'address'}],
+                'SafeTx': [{'name': 'to', 'type': 'address'}, {'name': 'value', 'type': 'uint256'},
+                           {'name': 'data', 'type': 'bytes'}, {'name': 'operation', 'type': 'uint8'},
+                           {'name': 'safeTxGas', 'type': 'uint256'}, {'name': 'baseGas', 'type': 'uint256'},
+                           {'name': 'gasPrice', 'type': 'uint256'}, {'name': 'gasToken', 'type': 'address'},
+                           {'name': 'refundReceiver', 'type': 'address'}, {'name': 'nonce', 'type': 'uint256'}],
+            },
+            'primaryType': 'SafeTx',
+            'domain': {'chainId': 1, 'verifyingContract': self.safe_address},
+            'message': {'to': safe_tx.to, 'value': safe_tx.value, 'data': safe_tx.data,
+                        'operation': safe_tx.operation, 'safeTxGas': safe_tx.safe_tx_gas,
+                        'baseGas': safe_tx.base_gas, 'gasPrice': safe_tx.gas_price, 'gasToken': safe_tx.gas_token,
+                        'refundReceiver': safe_tx.refund_receiver, 'nonce': safe_tx.nonce},
+        }
+        domain_separator = hash_domain(structured_data)
+        expected_hash = Web3.keccak(b'\x19\x01' + domain_separator + hash_message(structured_data))
+        self.assertEqual(get_safe_tx_hash(domain_separator, safe_tx), expected_hash)
+
+    def test_sign_hashes(self):
+        bulk_signer = BulkSigner(self.safe_address, mock.MagicMock(), '1.3.0')
+        bulk_signer.domain_separator = Web3.keccak(text='domain-separator')
+        accounts = [Account.create() for _ in range(3)]
+        sorted_addresses = sorted(account.address for account in accounts)
+        safe_txs = self.build_safe_txs(5)
+        safe_tx_hashes = bulk_signer.get_safe_tx_hashes(safe_txs)
+        self.assertEqual(len(set(safe_tx_hashes)), 5)
+
+        signatures = bulk_signer.sign_hashes(safe_tx_hashes, accounts)
+        with mock.patch.object(BulkSigner, 'MIN_SIGNATURES_FOR_PROCESSES', 0), \
+                mock.patch.object(BulkSigner, 'CHUNK_SIZE', 2):
+            self.assertEqual(bulk_signer.sign_hashes(safe_tx_hashes, accounts), signatures)
+
+        for safe_tx_hash, safe_tx_signatures in zip(safe_tx_hashes, signatures):
+            self.assertEqual(len(safe_tx_signatures), 65 * 3)
+            signers = [Account.recoverHash(safe_tx_hash, signature=safe_tx_signatures[i:i + 65])
+                       for i in range(0, len(safe_tx_signatures), 65)]
+            self.assertEqual(signers, sorted_addresses)
+
+        self.assertEqual(bulk_signer.sign_hashes(safe_tx_hashes, []), [b''] * 5)
+
+    def test_sign_hashes_with_threads_running(self):
+        # Processes must not be forked, as the CLI has threads running (watchers, async loop...) holding locks
+        bulk_signer = BulkSigner(self.safe_address, mock.MagicMock(), '1.3.0', max_workers=2)
+        accounts = [Account.create() for _ in range(5)]
+        hashes = [bytes(Web3.keccak(i)) for i in range(BulkSigner.MIN_SIGNATURES_FOR_PROCESSES // len(accounts))]
+        lock = threading.Lock()
+        lock.acquire()
+        thread = threading.Thread(target=lock.acquire, daemon=True)  # Blocked while the lock is held
+        thread.start()
+        try:
+            with mock.patch('safe_cli.bulk_signer.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as executor_mock:
+                signatures = bulk_signer.sign_hashes(hashes, accounts)
+            self.assertEqual(executor_mock.call_args[1]['mp_context'].get_start_method(), 'spawn')
+            self.assertTrue(thread.is_alive())
+        finally:
+            lock.release()
+            thread.join()
+
+        sorted_addresses = sorted(account.address for account in accounts)
+        self.assertEqual(len(signatures), len(hashes))
+        self.assertEqual([Account.recoverHash(hashes[-1], signature=signatures[-1][i:i + 65])
+                          for i in range(0, 65 * len(accounts), 65)], sorted_addresses)
+
+
+if __name__ == '__main__':
+    unittest.main()
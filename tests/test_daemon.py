@@ -0,0 +1,98 @@
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from eth_account import Account
+
+from safe_cli.daemon import DaemonAlreadyRunning, SafeCliDaemon, capture_output
+from safe_cli.daemon_client import DaemonClient, DaemonNotAvailable
+from safe_cli.safe_operator import SafeOperator
+from safe_cli.script_runner import (EXIT_COMMAND_FAILED, EXIT_INVALID_COMMAND,
+                                    EXIT_SUCCESS)
+
+
+class TestSafeCliDaemon(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.temp_dir.name, 'safe-cli.sock')
+        self.safe_operators = {}
+
+        def safe_operator_factory(safe_address: str, node_url: str):
+            safe_operator = mock.MagicMock(spec=SafeOperator)
+            safe_operator.get_nonce.side_effect = lambda: print(f'Nonce of {safe_address}')
+            self.safe_operators[safe_address] = safe_operator
+            return safe_operator
+
+        self.safe_cli_daemon = SafeCliDaemon('http://localhost:8545', socket_path=self.socket_path,
+                                             safe_operator_factory=safe_operator_factory)
+        self.server_thread = threading.Thread(target=self.safe_cli_daemon.serve_forever, daemon=True)
+        self.server_thread.start()
+        while not os.path.exists(self.socket_path):
+            pass
+
+    def tearDown(self):
+        self.safe_cli_daemon.shutdown()
+        self.server_thread.join()
+        self.temp_dir.cleanup()
+
+    def test_capture_output(self):
+        with capture_output() as captured:
+            print('Aloha')
+        self.assertEqual(captured['output'], 'Aloha\n')
+
+    def test_daemon(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+        safe_address = Account.create().address
+        other_safe_address = Account.create().address
+        with DaemonClient(self.socket_path) as daemon_client:
+            self.assertEqual(daemon_client.send_command(safe_address.lower(), 'get_nonce'),
+                             {'exit_code': EXIT_SUCCESS, 'output': f'Nonce of {safe_address}\n'})
+            self.assertEqual(daemon_client.send_command(safe_address, 'get_nonce')['exit_code'], EXIT_SUCCESS)
+            self.assertEqual(daemon_client.send_command(other_safe_address, 'get_nonce')['exit_code'],
+                             EXIT_SUCCESS)
+            self.assertEqual(set(self.safe_operators), {safe_address, other_safe_address})  # Operators are reused
+            self.assertEqual(self.safe_operators[safe_address].get_nonce.call_count, 2)
+
+            self.safe_operators[safe_address].change_threshold.return_value = False
+            responses = list(daemon_client.send_commands(safe_address, ['# Comment', '', 'change_threshold 2',
+                                                                        'aloha']))
+            self.assertEqual([response['exit_code'] for response in responses],
+                             [EXIT_COMMAND_FAILED, EXIT_INVALID_COMMAND])
+            self.assertIn('invalid choice', responses[1]['output'])  # Error of ArgParse is captured
+            self.assertEqual(daemon_client.send_command('aloha', 'get_nonce')['exit_code'], EXIT_INVALID_COMMAND)
+
+        # Connection is closed by the client
+        with DaemonClient(self.socket_path) as daemon_client:
+            self.assertEqual(daemon_client.send_command(safe_address, 'get_nonce')['exit_code'], EXIT_SUCCESS)
+
+    def test_daemon_already_running(self):
+        with self.assertRaises(DaemonAlreadyRunning):
+            SafeCliDaemon('http://localhost:8545', socket_path=self.socket_path).serve_forever()
+        with DaemonClient(self.socket_path) as daemon_client:  # Socket of the running daemon was not removed
+            self.assertEqual(daemon_client.send_command(Account.create().address, 'get_nonce')['exit_code'],
+                             EXIT_SUCCESS)
+
+        # Socket of a daemon not running anymore is replaced
+        stale_socket_path = os.path.join(self.temp_dir.name, 'stale.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+            stale_socket.bind(stale_socket_path)
+        safe_cli_daemon = SafeCliDaemon('http://localhost:8545', socket_path=stale_socket_path)
+        server_thread = threading.Thread(target=safe_cli_daemon.serve_forever, daemon=True)
+        server_thread.start()
+        while not safe_cli_daemon.server:
+            pass
+        safe_cli_daemon.shutdown()
+        server_thread.join()
+        self.assertFalse(os.path.exists(stale_socket_path))
+
+    def test_daemon_not_available(self):
+        with self.assertRaises(DaemonNotAvailable):
+            daemon_client = DaemonClient(os.path.join(self.temp_dir.name, 'not-existing.sock'))
+            daemon_client.send_command(Account.create().address, 'get_nonce')
+
+
+if __name__ == '__main__':
+    unittest.main()
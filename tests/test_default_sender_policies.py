@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+
+from eth_account import Account
+
+from safe_cli.default_sender_policies import (AccountStatus, first_funded,
+                                              get_account_statuses,
+                                              highest_balance, lowest_nonce)
+from safe_cli.json_rpc import (JsonRpcBatch, JsonRpcBatchNotSupported,
+                               JsonRpcError)
+
+
+class TestDefaultSenderPolicies(unittest.TestCase):
+    def test_get_account_statuses(self):
+        accounts = [Account.create() for _ in range(3)]
+        json_rpc_batch = mock.MagicMock(spec=JsonRpcBatch)
+        json_rpc_batch.request.return_value = ['0x0', '0x5', '0x10', '0x0', '0x3', '0x1']
+        ethereum_client = mock.MagicMock()
+        account_statuses = get_account_statuses(ethereum_client, json_rpc_batch, accounts)
+        self.assertEqual(account_statuses, [AccountStatus(accounts[0], 0, 5), AccountStatus(accounts[1], 16, 0),
+                                            AccountStatus(accounts[2], 3, 1)])
+        json_rpc_batch.request.assert_called_once()
+        self.assertEqual(len(json_rpc_batch.request.call_args[0][0]), 6)
+        ethereum_client.get_balance.assert_not_called()
+        self.assertEqual(json_rpc_batch.request.call_args[1], {'raise_exception': False})
+
+        # Only the account with a failed request is retrieved again
+        json_rpc_batch.request.return_value = ['0x0', '0x5', JsonRpcError('eth_getBalance', 'Internal error'), '0x0',
+                                               '0x3', '0x1']
+        ethereum_client.get_balance.return_value = 9
+        ethereum_client.w3.eth.get_transaction_count.return_value = 4
+        account_statuses = get_account_statuses(ethereum_client, json_rpc_batch, accounts)
+        self.assertEqual(account_statuses, [AccountStatus(accounts[0], 0, 5), AccountStatus(accounts[1], 9, 4),
+                                            AccountStatus(accounts[2], 3, 1)])
+        ethereum_client.get_balance.assert_called_once_with(accounts[1].address)
+        ethereum_client.get_balance.reset_mock()
+
+        # Fallback to one request per account
+        json_rpc_batch.request.side_effect = JsonRpcBatchNotSupported
+        ethereum_client.get_balance.return_value = 7
+        ethereum_client.w3.eth.get_transaction_count.return_value = 2
+        account_statuses = get_account_statuses(ethereum_client, json_rpc_batch, accounts)
+        self.assertEqual(account_statuses, [AccountStatus(account, 7, 2) for account in accounts])
+        self.assertEqual(ethereum_client.get_balance.call_count, 3)
+
+    def test_policies(self):
+        accounts = [Account.create() for _ in range(4)]
+        account_statuses = [AccountStatus(accounts[0], 0, 0), AccountStatus(accounts[1], 5, 10),
+                            AccountStatus(accounts[2], 20, 3), AccountStatus(accounts[3], 1, 1)]
+        self.assertEqual(first_funded(account_statuses), accounts[1])
+        self.assertEqual(highest_balance(account_statuses), accounts[2])
+        self.assertEqual(lowest_nonce(account_statuses), accounts[3])  # `accounts[0]` has no funds
+
+        not_funded = [AccountStatus(account, 0, 0) for account in accounts]
+        for policy in (first_funded, highest_balance, lowest_nonce):
+            self.assertIsNone(policy(not_funded))
+            self.assertIsNone(policy([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,10 @@
 import unittest
+from unittest import mock
 
 from eth_utils import ValidationError
 
-from safe_cli.ethereum_hd_wallet import (get_account_from_words,
+from safe_cli.ethereum_hd_wallet import (HdWalletDeriver,
+                                         get_account_from_words,
                                          get_address_from_words)
 
 
@@ -51,6 +53,42 @@ class TestEthereumHdWallet(unittest.TestCase):
         for index in range(len(expected)):
             self.assertEqual(get_address_from_words(words, index=index), expected[index])
 
+    def test_hd_wallet_deriver(self):
+        words = 'loan satoshi action taste party limit cat elder powder dress link decline'
+        expected = [
+            '0x9c8a7003407957Adee0e70f3094aDA208FDd4CF1',
+            '0x09A512D5ecfF9492Cb0f50AFF853dFD8B4ec3EB1',
+            '0x58A0494D85E36f7DFc7d3BA56681ab6efDEf0A19',
+            '0xa955FBEFe163C6BeAb64A7E854612639782b797F',
+            '0x38DF5615C090Ca80930986295B9bbFCc36a0Ae7B',
+        ]
+        hd_wallet_deriver = HdWalletDeriver(words)
+        self.assertEqual([account.address for _, account in hd_wallet_deriver.iter_accounts(count=5)], expected)
+        self.assertEqual([hd_path for hd_path, _ in hd_wallet_deriver.iter_accounts(start=3, count=2)],
+                         ["m/44'/60'/0'/0/3", "m/44'/60'/0'/0/4"])
+        self.assertEqual(hd_wallet_deriver.get_account().key, get_account_from_words(words).key)
+
+        custom_path = "m/44'/60'/1'/0/7"
+        custom_account = get_account_from_words(words, hd_path=custom_path)
+        self.assertEqual(hd_wallet_deriver.get_account(custom_path).key, custom_account.key)
+
+        with mock.patch.object(HdWalletDeriver, 'get_account', wraps=hd_wallet_deriver.get_account) as get_account:
+            accounts_found = hd_wallet_deriver.find_accounts([expected[2], expected[0], custom_account.address],
+                                                             hd_paths=[custom_path])
+            self.assertEqual({hd_path: account.address for hd_path, account in accounts_found.items()},
+                             {custom_path: custom_account.address,
+                              "m/44'/60'/0'/0/0": expected[0],
+                              "m/44'/60'/0'/0/2": expected[2]})
+            self.assertEqual(get_account.call_count, 4)  # Stops when every address is found
+
+        self.assertEqual(hd_wallet_deriver.find_accounts([expected[4]], count=4), {})
+
+        with self.assertRaises(ValidationError):
+            HdWalletDeriver('loan satoshi action taste party limit cat elder powder decline')
+
+        with self.assertRaises(ValidationError):
+            hd_wallet_deriver.get_account("44'/60'/0'/0/0")
+
 
 if __name__ == '__main__':
     unittest.main()
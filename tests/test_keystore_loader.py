@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from eth_account import Account
+
+from safe_cli import keystore_loader
+from safe_cli.keystore_loader import get_keystore_paths, load_keystores
+from safe_cli.prompt_parser import PromptParser
+
+
+class TestKeystoreLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.password = 'safe-cli'
+        self.accounts = [Account.create() for _ in range(3)]
+        for i, account in enumerate(self.accounts):
+            keystore = Account.encrypt(account.key, self.password, kdf='pbkdf2', iterations=1000)
+            if i == 2:
+                del keystore['address']  # Address is optional
+            with open(os.path.join(self.temporary_directory.name, f'UTC--{i}--keystore'), 'w') as keystore_file:
+                json.dump(keystore, keystore_file)
+        with open(os.path.join(self.temporary_directory.name, 'not-a-keystore.txt'), 'w') as not_keystore_file:
+            not_keystore_file.write('Not a keystore')
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def test_get_keystore_paths(self):
+        self.assertEqual(len(get_keystore_paths(self.temporary_directory.name)), 4)
+        self.assertEqual(len(get_keystore_paths(os.path.join(self.temporary_directory.name, 'UTC--*'))), 3)
+        self.assertEqual(get_keystore_paths(os.path.join(self.temporary_directory.name, 'missing')), [])
+
+    def test_load_keystores(self):
+        keystore_results = load_keystores(self.temporary_directory.name, self.password)
+        self.assertEqual([keystore_result.address for keystore_result in keystore_results],
+                         [account.address for account in self.accounts])
+        self.assertEqual([keystore_result.key for keystore_result in keystore_results],
+                         [bytes(account.key) for account in self.accounts])
+
+        # Keystores with an address not in `addresses` are not decrypted
+        with mock.patch.object(keystore_loader, 'decrypt_keystores',
+                               wraps=keystore_loader.decrypt_keystores) as decrypt_keystores:
+            keystore_results = load_keystores(self.temporary_directory.name, self.password,
+                                              addresses=[self.accounts[1].address])
+            self.assertEqual(len(decrypt_keystores.call_args[0][0]), 2)  # Keystore without address is decrypted
+        self.assertEqual([keystore_result.address for keystore_result in keystore_results],
+                         [self.accounts[1].address, self.accounts[2].address])
+
+        keystore_results = load_keystores(self.temporary_directory.name, 'wrong-password')
+        self.assertEqual(len(keystore_results), 3)
+        self.assertTrue(all(keystore_result.key is None for keystore_result in keystore_results))
+
+    def test_load_cli_owners_from_keystores_password_env(self):
+        safe_operator = mock.MagicMock()
+        prompt_parser = PromptParser(safe_operator)
+        with mock.patch.dict(os.environ, {'SAFE_CLI_TEST_PASSWORD': self.password}):
+            prompt_parser.process_command(f'load_cli_owners_from_keystores {self.temporary_directory.name} '
+                                          f'--password-env SAFE_CLI_TEST_PASSWORD')
+        safe_operator.load_cli_owners_from_keystores.assert_called_once_with(self.temporary_directory.name,
+                                                                             password=self.password)
+
+        # Password is not silently empty if the variable is not set
+        safe_operator.reset_mock()
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertFalse(prompt_parser.process_command(f'load_cli_owners_from_keystores '
+                                                           f'{self.temporary_directory.name} '
+                                                           f'--password-env SAFE_CLI_TEST_PASSWORD'))
+        safe_operator.load_cli_owners_from_keystores.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
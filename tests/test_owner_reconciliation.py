@@ -0,0 +1,90 @@
+import unittest
+
+from eth_account import Account
+
+from gnosis.eth.constants import SENTINEL_ADDRESS
+
+from safe_cli.owner_reconciliation import (OwnerChange,
+                                           OwnerReconciliationException,
+                                           reconcile_owners)
+
+
+class SafeOwnerManagerMock:
+    """
+    Linked list of owners and checks of `OwnerManager` contract
+    """
+    def __init__(self, owners, threshold):
+        self.owners = list(owners)
+        self.threshold = threshold
+
+    def prev_owner(self, owner):
+        index = self.owners.index(owner)
+        return self.owners[index - 1] if index else SENTINEL_ADDRESS
+
+    def addOwnerWithThreshold(self, owner, threshold):
+        assert owner not in self.owners
+        self.owners.insert(0, owner)
+        self.changeThreshold(threshold)
+
+    def removeOwner(self, prev_owner, owner, threshold):
+        assert len(self.owners) - 1 >= threshold
+        assert self.prev_owner(owner) == prev_owner
+        self.owners.remove(owner)
+        self.changeThreshold(threshold)
+
+    def swapOwner(self, prev_owner, old_owner, new_owner):
+        assert new_owner not in self.owners
+        assert self.prev_owner(old_owner) == prev_owner
+        self.owners[self.owners.index(old_owner)] = new_owner
+
+    def changeThreshold(self, threshold):
+        assert 1 <= threshold <= len(self.owners)
+        self.threshold = threshold
+
+
+class TestOwnerReconciliation(unittest.TestCase):
+    def check_reconcile_owners(self, current_owners, current_threshold, desired_owners, desired_threshold):
+        changes = reconcile_owners(current_owners, current_threshold, desired_owners, desired_threshold)
+        safe_mock = SafeOwnerManagerMock(current_owners, current_threshold)
+        for change in changes:
+            getattr(safe_mock, change.function_name)(*change.args)
+        self.assertEqual(set(safe_mock.owners), set(desired_owners))
+        self.assertEqual(safe_mock.threshold, desired_threshold)
+        return changes
+
+    def test_reconcile_owners(self):
+        owners = [Account.create().address for _ in range(8)]
+        self.assertEqual(self.check_reconcile_owners(owners[:3], 2, owners[:3], 2), [])
+        self.assertEqual(self.check_reconcile_owners(owners[:3], 2, owners[:3], 3),
+                         [OwnerChange('changeThreshold', (3,))])
+        self.assertEqual(self.check_reconcile_owners(owners[:3], 2, list(reversed(owners[:3])), 2), [])
+
+        # Replacing owners only needs swaps
+        changes = self.check_reconcile_owners(owners[:3], 2, [owners[0], owners[3], owners[4]], 2)
+        self.assertEqual([change.function_name for change in changes], ['swapOwner', 'swapOwner'])
+        self.assertEqual(changes[0].args, (owners[0], owners[1], owners[3]))
+        self.assertEqual(changes[1].args, (owners[3], owners[2], owners[4]))
+
+        # Threshold is changed on the last call
+        changes = self.check_reconcile_owners(owners[:2], 1, owners[:5], 4)
+        self.assertEqual([change.function_name for change in changes], ['addOwnerWithThreshold'] * 3)
+        changes = self.check_reconcile_owners(owners[:5], 5, owners[3:4], 1)
+        self.assertEqual([change.function_name for change in changes], ['removeOwner'] * 4)
+        changes = self.check_reconcile_owners(owners[:5], 3, owners[4:8], 4)
+        self.assertEqual([change.function_name for change in changes], ['swapOwner'] * 3 + ['removeOwner'])
+
+        # Removing consecutive owners uses the right `prev_owner` after every removal
+        self.check_reconcile_owners(owners, 8, [owners[0], owners[7]], 2)
+        self.check_reconcile_owners(owners[:4], 4, owners[4:], 1)
+        self.check_reconcile_owners(owners[4:], 1, owners[:2] + owners[6:], 4)
+
+    def test_reconcile_owners_not_valid(self):
+        owners = [Account.create().address for _ in range(3)]
+        for desired_owners, desired_threshold in (([], 1), (owners, 0), (owners, 4), ([owners[0], owners[0]], 1),
+                                                  ([SENTINEL_ADDRESS], 1)):
+            with self.assertRaises(OwnerReconciliationException):
+                reconcile_owners(owners, 1, desired_owners, desired_threshold)
+
+
+if __name__ == '__main__':
+    unittest.main()
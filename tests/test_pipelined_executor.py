@@ -0,0 +1,103 @@
+import unittest
+from unittest import mock
+
+from eth_account import Account
+from hexbytes import HexBytes
+from web3 import Web3
+
+from safe_cli.json_rpc import JsonRpcBatch
+from safe_cli.pipelined_executor import PipelinedExecutor, PipelinedTxStatus
+from safe_cli.safe_tx_file import SafeTxData
+
+
+@mock.patch.object(PipelinedExecutor, 'POLL_INTERVAL', 0)
+class TestPipelinedExecutor(unittest.TestCase):
+    def setUp(self):
+        self.sender = Account.create()
+        self.ethereum_client = mock.MagicMock()
+        self.ethereum_client.w3.eth.send_raw_transaction.side_effect = lambda raw_tx: Web3.keccak(raw_tx)
+        self.json_rpc_batch = mock.MagicMock(spec=JsonRpcBatch)
+        self.safe_contract = mock.MagicMock(address=Account.create().address)
+        self.safe_contract.encodeABI.return_value = '0x6a761202'
+        self.receipts = {}  # Tx hash to status, mined txs
+        self.json_rpc_batch.request.side_effect = lambda requests, raise_exception=True: [
+            {'transactionHash': params[0], 'status': self.receipts[params[0]]} if params[0] in self.receipts
+            else None for _, params in requests
+        ]
+        self.safe_txs = [SafeTxData(Account.create().address, 0, b'', 0, 0, 0, 0,
+                                    '0x0000000000000000000000000000000000000000',
+                                    '0x0000000000000000000000000000000000000000', nonce, b'\x01' * 65)
+                         for nonce in range(3)]
+
+    def build_pipelined_executor(self, on_failure: str) -> PipelinedExecutor:
+        return PipelinedExecutor(self.ethereum_client, self.json_rpc_batch, self.safe_contract, self.sender, 1,
+                                 on_failure=on_failure)
+
+    def test_execute(self):
+        pipelined_executor = self.build_pipelined_executor('stop')
+        self.assertEqual(pipelined_executor.get_gas_limit(self.safe_txs[0], 50000), 50000 + 16 * 4 + 75000)
+
+        def mine_all(raw_tx):
+            tx_hash = Web3.keccak(raw_tx)
+            self.receipts[tx_hash.hex()] = '0x1'
+            return tx_hash
+        self.ethereum_client.w3.eth.send_raw_transaction.side_effect = mine_all
+
+        pipelined_txs = pipelined_executor.execute(self.safe_txs, [100000] * 3, 10, nonce=5)
+        self.assertEqual([pipelined_tx.status for pipelined_tx in pipelined_txs], [PipelinedTxStatus.SUCCESS] * 3)
+        self.assertEqual([pipelined_tx.nonce for pipelined_tx in pipelined_txs], [5, 6, 7])
+        self.assertEqual(self.ethereum_client.w3.eth.send_raw_transaction.call_count, 3)
+        # Every tx was sent before checking receipts, and receipts were checked together
+        self.json_rpc_batch.request.assert_called_once()
+        self.ethereum_client.w3.eth.get_transaction_count.assert_not_called()
+
+    def test_execute_stop(self):
+        pipelined_executor = self.build_pipelined_executor('stop')
+        sent_tx_hashes = []
+
+        def send_raw_transaction(raw_tx):
+            tx_hash = Web3.keccak(raw_tx)
+            sent_tx_hashes.append(tx_hash)
+            if len(sent_tx_hashes) == 2:  # Second tx reverts, third is not mined
+                self.receipts[sent_tx_hashes[0].hex()] = '0x1'
+                self.receipts[tx_hash.hex()] = '0x0'
+            elif len(sent_tx_hashes) == 4:  # Cancel tx for the third one
+                self.receipts[tx_hash.hex()] = '0x1'
+            return tx_hash
+        self.ethereum_client.w3.eth.send_raw_transaction.side_effect = send_raw_transaction
+
+        pipelined_txs = pipelined_executor.execute(self.safe_txs, [100000] * 3, 10, nonce=0)
+        self.assertEqual([pipelined_tx.status for pipelined_tx in pipelined_txs],
+                         [PipelinedTxStatus.SUCCESS, PipelinedTxStatus.FAILED, PipelinedTxStatus.CANCELLED])
+        self.assertEqual(pipelined_txs[2].cancel_tx_hash, sent_tx_hashes[3])
+        self.assertEqual(len(sent_tx_hashes), 4)
+
+    def test_execute_reprice(self):
+        pipelined_executor = self.build_pipelined_executor('reprice')
+        sent_tx_hashes = []
+
+        def send_raw_transaction(raw_tx):
+            tx_hash = Web3.keccak(raw_tx)
+            sent_tx_hashes.append(tx_hash)
+            if len(sent_tx_hashes) == 2:  # Only the repriced tx is mined
+                self.receipts[tx_hash.hex()] = '0x1'
+            return tx_hash
+        self.ethereum_client.w3.eth.send_raw_transaction.side_effect = send_raw_transaction
+
+        with mock.patch.object(PipelinedExecutor, 'REPRICE_TIMEOUT', -1):
+            pipelined_txs = pipelined_executor.execute(self.safe_txs[:1], [100000], 10, nonce=0)
+        self.assertEqual(pipelined_txs[0].status, PipelinedTxStatus.SUCCESS)
+        self.assertEqual(pipelined_txs[0].gas_price, 12)
+        self.assertEqual(pipelined_txs[0].tx_hash, HexBytes(sent_tx_hashes[1]))
+
+    def test_execute_send_error(self):
+        pipelined_executor = self.build_pipelined_executor('stop')
+        self.ethereum_client.w3.eth.send_raw_transaction.side_effect = ValueError('insufficient funds')
+        pipelined_txs = pipelined_executor.execute(self.safe_txs, [100000] * 3, 10, nonce=0)
+        self.assertEqual([pipelined_tx.status for pipelined_tx in pipelined_txs], [PipelinedTxStatus.NOT_SENT] * 3)
+        self.assertEqual(pipelined_txs[0].error, 'insufficient funds')
+        self.assertEqual(self.ethereum_client.w3.eth.send_raw_transaction.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from unittest import mock
+
+from eth_abi import encode_abi
+from eth_account import Account
+from web3 import Web3
+
+from gnosis.eth.constants import SENTINEL_ADDRESS
+from gnosis.safe import Safe
+
+from safe_cli.json_rpc import JsonRpcBatch, JsonRpcBatchNotSupported
+from safe_cli.safe_cli_info import SafeCliInfoCache, SafeCliInfoLoader
+
+from .safe_cli_test_case_mixin import SafeCliTestCaseMixin
+
+
+class TestSafeCliInfoLoader(SafeCliTestCaseMixin, unittest.TestCase):
+    def assert_safe_cli_info(self, safe: Safe, safe_cli_info_loader: SafeCliInfoLoader):
+        safe_info = safe.retrieve_all_info()
+        safe_cli_info = safe_cli_info_loader.load()
+        self.assertEqual(safe_cli_info.address, safe.address)
+        self.assertEqual(safe_cli_info.nonce, safe_info.nonce)
+        self.assertEqual(safe_cli_info.threshold, safe_info.threshold)
+        self.assertEqual(safe_cli_info.owners, safe_info.owners)
+        self.assertEqual(safe_cli_info.master_copy, safe_info.master_copy)
+        self.assertEqual(safe_cli_info.modules, safe_info.modules)
+        self.assertEqual(safe_cli_info.fallback_handler, safe_info.fallback_handler)
+        self.assertEqual(safe_cli_info.guard, safe_info.guard)
+        self.assertEqual(safe_cli_info.version, safe_info.version)
+        self.assertEqual(safe_cli_info.balance_ether,
+                         Web3.fromWei(self.ethereum_client.get_balance(safe.address), 'ether'))
+
+    def test_load(self):
+        safe = Safe(self.deploy_test_safe(initial_funding_wei=Web3.toWei(0.1, 'ether')).safe_address,
+                    self.ethereum_client)
+        safe_cli_info_loader = SafeCliInfoLoader(safe)
+        with mock.patch.object(JsonRpcBatch, 'request', wraps=safe_cli_info_loader.json_rpc_batch.request) as request:
+            self.assert_safe_cli_info(safe, safe_cli_info_loader)
+            self.assertEqual(request.call_count, 1)
+
+        safe_v1_3_0 = self.deploy_test_safe_v1_3_0()
+        self.assert_safe_cli_info(safe_v1_3_0, SafeCliInfoLoader(safe_v1_3_0))
+
+        block_number = self.ethereum_client.current_block_number
+        self.assertEqual(safe_cli_info_loader.load_fields(['nonce', 'threshold'], block_number=block_number),
+                         {'nonce': 0, 'threshold': safe.retrieve_threshold()})
+
+    def test_load_batch_not_supported(self):
+        safe = self.deploy_test_safe_v1_3_0()
+        safe_cli_info_loader = SafeCliInfoLoader(safe)
+        with mock.patch.object(JsonRpcBatch, 'request', side_effect=JsonRpcBatchNotSupported):
+            self.assert_safe_cli_info(safe, safe_cli_info_loader)
+
+        self.assertFalse(JsonRpcBatch('ws://localhost:8546').is_supported)
+        with self.assertRaises(JsonRpcBatchNotSupported):
+            JsonRpcBatch('ws://localhost:8546').request([('eth_blockNumber', [])])
+
+    def test_load_more_modules_than_page(self):
+        modules = [Account.create().address for _ in range(SafeCliInfoLoader.MAX_MODULES + 5)]
+        safe = mock.MagicMock(address=Account.create().address)
+        safe.retrieve_modules.return_value = modules
+        json_rpc_batch = mock.MagicMock(spec=JsonRpcBatch)
+        safe_cli_info_loader = SafeCliInfoLoader(safe, json_rpc_batch)
+        json_rpc_batch.request.return_value = [
+            '0x' + encode_abi(['address[]', 'address'],
+                              [modules[:SafeCliInfoLoader.MAX_MODULES], modules[SafeCliInfoLoader.MAX_MODULES]]).hex()
+        ]
+        self.assertEqual(safe_cli_info_loader.load_fields(['modules'], block_number=1), {'modules': modules})
+        safe.retrieve_modules.assert_called_once_with()
+
+        # Every module fits in the first page
+        safe.retrieve_modules.reset_mock()
+        json_rpc_batch.request.return_value = [
+            '0x' + encode_abi(['address[]', 'address'], [modules[:3], SENTINEL_ADDRESS]).hex()
+        ]
+        self.assertEqual(safe_cli_info_loader.load_fields(['modules'], block_number=1), {'modules': modules[:3]})
+        safe.retrieve_modules.assert_not_called()
+
+    def test_safe_cli_info_cache(self):
+        safe_operator = self.setup_operator()
+        safe_cli_info_cache = SafeCliInfoCache(safe_operator.safe_cli_info_loader, check_interval=0)
+        safe_cli_info = safe_cli_info_cache.get()
+        self.assertEqual(safe_cli_info.block_number, self.ethereum_client.current_block_number)
+        self.assertEqual(safe_cli_info.nonce, 0)
+        self.assertIs(safe_cli_info_cache.get(), safe_cli_info)  # Same block, nothing is reloaded
+
+        self.send_ether(safe_operator.address, 1)
+        with mock.patch.object(SafeCliInfoLoader, 'load_fields',
+                               wraps=safe_operator.safe_cli_info_loader.load_fields) as load_fields:
+            self.assertEqual(safe_cli_info_cache.get().balance_ether, Web3.fromWei(1, 'ether'))
+            self.assertEqual(load_fields.call_args[0][0], {'balance_ether'})
+
+            safe_operator.add_owner(Account.create().address)
+            safe_cli_info = safe_cli_info_cache.get()
+            self.assertEqual(safe_cli_info.block_number, self.ethereum_client.current_block_number)
+            self.assertEqual(safe_cli_info.nonce, 1)
+            self.assertEqual(safe_cli_info.owners, safe_operator.safe.retrieve_owners())
+            self.assertEqual(load_fields.call_args[0][0],
+                             {'balance_ether', 'owners', 'nonce', 'master_copy', 'version'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import threading
+import unittest
+from unittest import mock
+
+from safe_cli.safe_cli_info import SafeCliInfo, SafeCliInfoCache
+from safe_cli.safe_cli_info_watcher import SafeCliInfoWatcher
+
+
+class TestSafeCliInfoWatcher(unittest.TestCase):
+    def test_safe_cli_info_watcher(self):
+        safe_cli_info = SafeCliInfo('0x7552Ed65a45E27740a15B8D5415E90d8ca64C109', 0, 1, [], '', [], '', '', 0,
+                                    '1.3.0', block_number=1)
+        safe_cli_info_cache = mock.MagicMock(spec=SafeCliInfoCache)
+        safe_cli_info_cache.get.return_value = safe_cli_info
+        updated = threading.Event()
+        safe_cli_info_watcher = SafeCliInfoWatcher(safe_cli_info_cache, poll_interval=60,
+                                                   on_update=lambda _: updated.set())
+        self.assertIsNone(safe_cli_info_watcher.snapshot)
+
+        safe_cli_info_watcher.start()
+        self.assertTrue(updated.wait(5))
+        snapshot = safe_cli_info_watcher.snapshot
+        self.assertEqual(snapshot, safe_cli_info)
+        self.assertIsNot(snapshot, safe_cli_info)
+
+        # Changes on the cached object are only seen after the next update
+        updated.clear()
+        safe_cli_info.nonce = 1
+        self.assertEqual(safe_cli_info_watcher.snapshot.nonce, 0)
+        safe_cli_info_watcher.wake_up()
+        self.assertTrue(updated.wait(5))
+        self.assertEqual(safe_cli_info_watcher.snapshot.nonce, 1)
+        self.assertEqual(snapshot.nonce, 0)
+        safe_cli_info_cache.invalidate.assert_called_once()
+
+        # Errors keep the last snapshot
+        safe_cli_info_cache.get.side_effect = IOError
+        self.assertEqual(safe_cli_info_watcher.update().nonce, 1)
+        self.assertIsInstance(safe_cli_info_watcher.last_error, IOError)
+        safe_cli_info_watcher.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+
+from eth_account import Account
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+
+from safe_cli.prompt_parser import build_prompt_parser
+from safe_cli.safe_completer import ArgumentSuggestions, SafeCompleter
+from safe_cli.safe_completer_constants import safe_commands
+
+
+class TestSafeCompleter(unittest.TestCase):
+    def setUp(self):
+        self.owners = sorted((Account.create().address for _ in range(3)), key=str.lower)
+        self.token_addresses = [Account.create().address]
+        self.accounts = {Account.create(), Account.create()}
+        self.safe_completer = SafeCompleter({
+            'owners': ArgumentSuggestions(lambda: self.owners),
+            'token_addresses': ArgumentSuggestions(lambda: self.token_addresses),
+            'accounts': ArgumentSuggestions(lambda: self.accounts, to_text=lambda account: account.address),
+        })
+
+    def get_completions(self, text: str):
+        return [(completion.text, completion.start_position)
+                for completion in self.safe_completer.get_completions(Document(text), CompleteEvent())]
+
+    def test_command_completions(self):
+        self.assertEqual(self.get_completions(''), [(command, 0) for command in safe_commands])
+        for prefix in ('s', 'SEND_', 'load_cli_owners', 'get_'):
+            self.assertEqual(self.get_completions(prefix),
+                             [(command, -len(prefix)) for command in safe_commands
+                              if command.startswith(prefix.lower())])
+        self.assertEqual(self.get_completions('aloha'), [])
+
+    def test_argument_completions(self):
+        self.assertEqual(self.get_completions('remove_owner '), [(owner, 0) for owner in self.owners])
+        self.assertEqual(self.get_completions('remove_owner ' + self.owners[1][:8].lower()), [(self.owners[1], -8)])
+        self.assertEqual(self.get_completions(f'remove_owner {self.owners[1]} '), [])  # Only first argument
+        self.assertEqual(self.get_completions(f'send_erc20 {self.owners[0]} '), [(self.token_addresses[0], 0)])
+        self.assertEqual(self.get_completions('send_erc20 '), [])
+        self.assertEqual(self.get_completions(f'unload_cli_owners {self.owners[0]} '),
+                         [(address, 0) for address in sorted((account.address for account in self.accounts),
+                                                             key=str.lower)])
+        self.assertEqual(self.get_completions('get_owners '), [])
+
+        # Suggestions are updated when cached data changes
+        self.owners = self.owners[:1]
+        self.assertEqual(self.get_completions('remove_owner 0x'), [(self.owners[0], -2)])
+        # Set updated in place keeping its length
+        self.accounts.pop()
+        account = Account.create()
+        self.accounts.add(account)
+        self.assertIn((account.address, 0), self.get_completions('unload_cli_owners '))
+        self.token_addresses[0] = account.address  # List updated in place
+        self.assertEqual(self.get_completions(f'send_erc20 {self.owners[0]} '), [(account.address, 0)])
+        self.accounts.clear()
+        self.assertEqual(self.get_completions('unload_cli_owners '), [])
+
+    def test_argument_completions_with_options(self):
+        self.safe_completer = SafeCompleter(self.safe_completer.argument_suggestions,
+                                            parser=build_prompt_parser(mock.MagicMock()))
+        token_completions = [(self.token_addresses[0], 0)]
+        self.assertEqual(self.get_completions(f'send_erc20 --safe-nonce 5 {self.owners[0]} '), token_completions)
+        self.assertEqual(self.get_completions(f'send_erc20 --safe-nonce=5 {self.owners[0]} '), token_completions)
+        self.assertEqual(self.get_completions(f'send_erc20 --tx-service {self.owners[0]} '), token_completions)
+        self.assertEqual(self.get_completions(f'send_erc20 {self.owners[0]} --safe-nonce '), [])  # Option value
+        self.assertEqual(self.get_completions(f'send_erc20 {self.owners[0]} --safe-nonce 5 '), token_completions)
+        self.assertEqual(self.get_completions('send_erc20 --safe-nonce 5 '), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
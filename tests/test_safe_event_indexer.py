@@ -0,0 +1,133 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from eth_abi import encode_abi, encode_single
+from eth_account import Account
+from hexbytes import HexBytes
+
+from safe_cli import safe_events
+from safe_cli.json_rpc import JsonRpcBatch, JsonRpcBatchNotSupported
+from safe_cli.safe_event_indexer import (EXEC_TRANSACTION_SELECTOR,
+                                         EXEC_TRANSACTION_TYPES,
+                                         ExecutedSafeTx, SafeEventIndexer,
+                                         SafeEventIndexerException,
+                                         decode_safe_event)
+
+
+class FakeNode:
+    """
+    Answer `eth_getLogs` failing for ranges with more than `max_logs` logs, like most providers
+    """
+    def __init__(self, logs, max_logs: int):
+        self.logs = logs
+        self.max_logs = max_logs
+        self.ranges = []
+        self.lock = threading.Lock()
+
+    def get_logs(self, filter_params):
+        with self.lock:
+            self.ranges.append((filter_params['fromBlock'], filter_params['toBlock']))
+        logs = [log for log in self.logs if filter_params['fromBlock'] <= log['blockNumber'] <= filter_params['toBlock']]
+        if len(logs) > self.max_logs:
+            raise ValueError({'code': -32005, 'message': f'query returned more than {self.max_logs} results'})
+        return logs
+
+
+def build_log(block_number: int, log_index: int, topic: bytes, indexed: bytes = b'', data: bytes = b''):
+    topics = [HexBytes(topic)] + [HexBytes(indexed[i:i + 32]) for i in range(0, len(indexed), 32)]
+    return {'blockNumber': block_number, 'blockHash': HexBytes(block_number.to_bytes(32, 'big')),
+            'transactionHash': HexBytes((block_number * 100 + log_index).to_bytes(32, 'big')),
+            'logIndex': log_index, 'topics': topics, 'data': HexBytes(data).hex()}
+
+
+class TestSafeEventIndexer(unittest.TestCase):
+    def setUp(self):
+        self.safe_address = Account.create().address
+        self.ethereum_client = mock.MagicMock()
+        self.json_rpc_batch = mock.MagicMock(spec=JsonRpcBatch)
+        self.safe_event_indexer = SafeEventIndexer(self.ethereum_client, self.json_rpc_batch, self.safe_address,
+                                                   max_workers=3)
+
+    def test_decode_safe_event(self):
+        owner = Account.create().address
+        # `AddedOwner` owner is not indexed on Safe v1.3.0 and indexed on v1.4.1
+        for indexed, data in ((b'', encode_single('address', owner)), (encode_single('address', owner), b'')):
+            event = decode_safe_event(build_log(5, 1, safe_events.ADDED_OWNER_TOPIC, indexed, data))
+            self.assertEqual((event.name, event.args), ('AddedOwner', {'owner': owner}))
+
+        sender = Account.create().address
+        event = decode_safe_event(build_log(5, 2, safe_events.SAFE_RECEIVED_TOPIC, encode_single('address', sender),
+                                            encode_single('uint256', 7)))
+        self.assertEqual(event.args, {'sender': sender, 'value': 7})
+        self.assertIsNone(decode_safe_event(build_log(5, 3, b'\x01' * 32)))
+
+    def test_scan(self):
+        logs = [build_log(block_number, 0, safe_events.CHANGED_THRESHOLD_TOPIC, data=encode_single('uint256', 2))
+                for block_number in range(0, 10000, 7)]
+        fake_node = FakeNode(list(reversed(logs)), max_logs=50)
+        self.ethereum_client.w3.eth.get_logs.side_effect = fake_node.get_logs
+        events = self.safe_event_indexer.scan(0, 9999)
+        self.assertEqual([event.block_number for event in events], list(range(0, 10000, 7)))
+        self.assertLessEqual(self.safe_event_indexer.chunk_size, 2500)  # Adapted to the density of logs
+
+        # Every block scanned once successfully
+        self.assertEqual(len(set(fake_node.ranges)), len(fake_node.ranges))
+
+        self.ethereum_client.w3.eth.get_logs.side_effect = ValueError('Internal error')
+        with self.assertRaises(SafeEventIndexerException):
+            self.safe_event_indexer.scan(0, 10)
+
+        # Other workers stop taking ranges when one fails
+        def get_logs(filter_params):
+            with fake_node.lock:
+                fake_node.ranges.append((filter_params['fromBlock'], filter_params['toBlock']))
+            if filter_params['fromBlock'] == 0:
+                raise ValueError('Internal error')
+            time.sleep(0.01)
+            return []
+
+        fake_node.ranges.clear()
+        self.safe_event_indexer.chunk_size = SafeEventIndexer.INITIAL_CHUNK_SIZE
+        self.ethereum_client.w3.eth.get_logs.side_effect = get_logs
+        with self.assertRaises(SafeEventIndexerException):
+            self.safe_event_indexer.scan(0, 1000000)
+        self.assertLessEqual(len(fake_node.ranges), 10)
+
+    def test_get_executed_safe_txs(self):
+        to = Account.create().address
+        safe_tx_hashes = [bytes([i]) * 32 for i in range(1, 4)]
+        logs = [
+            build_log(10 + i, 0, topic, data=encode_abi(['bytes32', 'uint256'], [safe_tx_hash, 0]))
+            for i, (topic, safe_tx_hash) in enumerate(zip((safe_events.EXECUTION_SUCCESS_TOPIC,
+                                                           safe_events.EXECUTION_FAILURE_TOPIC,
+                                                           safe_events.EXECUTION_SUCCESS_TOPIC), safe_tx_hashes))
+        ]
+        events = [decode_safe_event(log) for log in logs]
+        calldata = EXEC_TRANSACTION_SELECTOR + encode_abi(EXEC_TRANSACTION_TYPES, [
+            to, 5, b'\x12\x34', 0, 0, 0, 0, '0x' + '0' * 40, '0x' + '0' * 40, b''
+        ])
+        transactions = [
+            {'hash': logs[0]['transactionHash'].hex(), 'to': self.safe_address.lower(), 'input': calldata.hex()},
+            {'hash': logs[1]['transactionHash'].hex(), 'to': self.safe_address, 'input': calldata.hex()},
+            {'hash': logs[2]['transactionHash'].hex(), 'to': to, 'input': '0x'},  # Through another contract
+        ]
+        self.json_rpc_batch.request.return_value = transactions
+        expected = [
+            ExecutedSafeTx(7, safe_tx_hashes[0], events[0].transaction_hash, 10, True, to, 5, b'\x12\x34', 0),
+            ExecutedSafeTx(8, safe_tx_hashes[1], events[1].transaction_hash, 11, False, to, 5, b'\x12\x34', 0),
+            ExecutedSafeTx(9, safe_tx_hashes[2], events[2].transaction_hash, 12, True, None, None, None, None),
+        ]
+        self.assertEqual(self.safe_event_indexer.get_executed_safe_txs(events, nonce=10), expected)
+
+        # Without batches
+        self.json_rpc_batch.request.side_effect = JsonRpcBatchNotSupported
+        self.ethereum_client.w3.eth.get_transaction.side_effect = transactions
+        self.assertEqual(self.safe_event_indexer.get_executed_safe_txs(events), [
+            executed_safe_tx._replace(nonce=None) for executed_safe_tx in expected
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from pygments.token import Keyword, Name, Number, Text
+
+from safe_cli.safe_lexer import SafeLexer
+
+
+class TestSafeLexer(unittest.TestCase):
+    def test_get_tokens_unprocessed(self):
+        address = '0x7552Ed65a45E27740a15B8D5415E90d8ca64C109'
+        safe_tx_hash = '0x' + 'ab' * 32
+        safe_lexer = SafeLexer()
+        text = f'approve_hash {safe_tx_hash} {address}\nsend_ether safe.eth 12 0x1234\n'
+        tokens = [(index, token, value) for index, token, value in safe_lexer.get_tokens_unprocessed(text)
+                  if not value.isspace()]
+        self.assertEqual([(token, value) for _, token, value in tokens], [
+            (Name.Builtin, 'approve_hash'), (Keyword.Constant, safe_tx_hash), (Keyword, address),
+            (Name.Builtin, 'send_ether'), (Name.Namespace, 'safe.eth'), (Number, '12'), (Text, '0x1234'),
+        ])
+        self.assertTrue(all(text[index:].startswith(value) for index, _, value in tokens))
+
+        # Lines are memoized
+        self.assertEqual(list(safe_lexer.get_tokens_unprocessed(text)), list(safe_lexer.get_tokens_unprocessed(text)))
+        self.assertEqual(safe_lexer.get_line_tokens.cache_info().misses, 2)
+        self.assertEqual(list(SafeLexer(cache_size=0).get_tokens_unprocessed(text)),
+                         list(safe_lexer.get_tokens_unprocessed(text)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -181,6 +181,24 @@ class SafeCliTestCase(SafeCliTestCaseMixin, unittest.TestCase):
         self.assertTrue(safe_operator.send_ether(random_address, value))
         self.assertEqual(self.ethereum_client.get_balance(random_address), value)
 
+    def test_operator_context(self):
+        safe_operator = self.setup_operator()
+        safe_cli_info = safe_operator.safe_cli_info
+        network = safe_operator.network
+        w3 = safe_operator.ethereum_client.w3
+        with mock.patch.object(w3.provider, 'make_request', side_effect=AssertionError('No RPC calls expected')):
+            other_safe_operator = SafeOperator(safe_operator.address, self.ethereum_node_url,
+                                               context=safe_operator.context)
+            self.assertIs(other_safe_operator.ethereum_client, safe_operator.ethereum_client)
+            self.assertEqual(other_safe_operator.network, network)
+            self.assertIs(other_safe_operator.safe_cli_info, safe_cli_info)
+            self.assertEqual(other_safe_operator.accounts, {self.ethereum_test_account})
+            self.assertEqual(other_safe_operator.default_sender, self.ethereum_test_account)
+
+            other_safe_operator.unload_cli_owners([self.ethereum_test_account.address])
+            self.assertEqual(safe_operator.accounts, set())
+            self.assertIsNone(safe_operator.default_sender)
+
 
 if __name__ == '__main__':
     unittest.main()
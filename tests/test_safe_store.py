@@ -0,0 +1,239 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from eth_abi import encode_abi, encode_single
+from eth_account import Account
+from hexbytes import HexBytes
+from web3 import Web3
+
+from safe_cli import safe_events
+from safe_cli.api.gnosis_transaction import TransactionService
+from safe_cli.json_rpc import JsonRpcBatch
+from safe_cli.safe_event_indexer import SafeEventIndexer
+from safe_cli.safe_operator import SafeOperator
+from safe_cli.safe_operator_context import SafeOperatorContext
+from safe_cli.safe_store import SafeStore
+from safe_cli.token_balance_scanner import TokenBalance, TokenMetadata
+
+
+class FakeChain:
+    """
+    Node with Safe executions at some blocks. Blocks after `fork_block` get different hashes when `fork` is called
+    """
+    def __init__(self, safe_address: str, head: int, executions, thresholds=()):
+        self.safe_address = safe_address
+        self.head = head
+        self.executions = dict(executions)  # Block number to Safe tx hash
+        self.thresholds = dict(thresholds)  # Block number to threshold changed by the Safe tx executed there
+        self.forks = {}  # Block number to fork id
+        self.ranges = []
+
+    def fork(self, fork_block: int, head: int, executions):
+        for block_number in range(fork_block, head + 1):
+            self.forks[block_number] = self.forks.get(block_number, 0) + 1
+        self.executions = {block_number: safe_tx_hash for block_number, safe_tx_hash in self.executions.items()
+                           if block_number < fork_block}
+        self.executions.update(executions)
+        self.head = head
+
+    def get_block_hash(self, block_number: int) -> bytes:
+        return bytes(Web3.keccak(text=f'{block_number}-{self.forks.get(block_number, 0)}'))
+
+    def get_transaction_hash(self, block_number: int) -> bytes:
+        return bytes(Web3.keccak(self.get_block_hash(block_number) + b'tx'))
+
+    def get_logs(self, filter_params):
+        self.ranges.append((filter_params['fromBlock'], filter_params['toBlock']))
+        logs = []
+        for block_number, safe_tx_hash in sorted(self.executions.items()):
+            if filter_params['fromBlock'] <= block_number <= min(filter_params['toBlock'], self.head):
+                log = {'blockNumber': block_number, 'blockHash': HexBytes(self.get_block_hash(block_number)),
+                       'transactionHash': HexBytes(self.get_transaction_hash(block_number))}
+                if block_number in self.thresholds:
+                    logs.append(dict(log, logIndex=0, topics=[HexBytes(safe_events.CHANGED_THRESHOLD_TOPIC)],
+                                     data=encode_abi(['uint256'], [self.thresholds[block_number]]).hex()))
+                logs.append(dict(log, logIndex=1, topics=[HexBytes(safe_events.EXECUTION_SUCCESS_TOPIC)],
+                                 data=encode_abi(['bytes32', 'uint256'], [safe_tx_hash, 0]).hex()))
+        return logs
+
+    def call(self, transaction, block_identifier):
+        return encode_single('uint256', len([block_number for block_number in self.executions
+                                             if block_number <= block_identifier]))
+
+    def request(self, requests, raise_exception=True):
+        results = []
+        for method, params in requests:
+            if method == 'eth_getBlockByNumber':
+                block_number = int(params[0], 16)
+                results.append({'hash': '0x' + self.get_block_hash(block_number).hex(), 'timestamp': hex(block_number)}
+                               if block_number <= self.head else None)
+            else:  # eth_getTransactionByHash
+                results.append({'hash': params[0], 'to': Account.create().address, 'input': '0x'})
+        return results
+
+
+class TestSafeStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.safe_store = SafeStore(os.path.join(self.temporary_directory.name, 'safes.sqlite3'), reorg_depth=20)
+        self.safe_address = Account.create().address
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def build_safe_event_indexer(self, fake_chain: FakeChain) -> SafeEventIndexer:
+        ethereum_client = mock.MagicMock()
+        type(ethereum_client.w3.eth).block_number = mock.PropertyMock(side_effect=lambda: fake_chain.head)
+        ethereum_client.w3.eth.get_logs.side_effect = fake_chain.get_logs
+        ethereum_client.w3.eth.call.side_effect = fake_chain.call
+        json_rpc_batch = mock.MagicMock(spec=JsonRpcBatch)
+        json_rpc_batch.request.side_effect = fake_chain.request
+        return SafeEventIndexer(ethereum_client, json_rpc_batch, self.safe_address, max_workers=2)
+
+    def get_executions(self):
+        return [(executed_safe_tx.nonce, executed_safe_tx.block_number, executed_safe_tx.safe_tx_hash)
+                for executed_safe_tx in self.safe_store.get_executed_safe_txs(1, self.safe_address)]
+
+    def test_sync(self):
+        fake_chain = FakeChain(self.safe_address, 100, {10: b'\x01' * 32, 50: b'\x02' * 32, 95: b'\x03' * 32})
+        safe_event_indexer = self.build_safe_event_indexer(fake_chain)
+        self.safe_store.sync(1, safe_event_indexer, from_block=5)
+        self.assertEqual(self.safe_store.get_sync_state(1, self.safe_address), (5, 100))
+        self.assertEqual(self.get_executions(), [(0, 10, b'\x01' * 32), (1, 50, b'\x02' * 32),
+                                                 (2, 95, b'\x03' * 32)])
+        self.assertEqual(len(self.safe_store.get_events(1, self.safe_address, names=['ExecutionSuccess'])), 3)
+        self.assertEqual(self.safe_store.get_events(1, self.safe_address, names=['AddedOwner']), [])
+        self.assertEqual(self.safe_store.get_executed_safe_txs(5, self.safe_address), [])  # Other chain
+
+        # Only new blocks are scanned
+        fake_chain.executions[110] = b'\x04' * 32
+        fake_chain.head = 120
+        fake_chain.ranges.clear()
+        self.safe_store.sync(1, safe_event_indexer, from_block=5)
+        self.assertEqual(min(from_block for from_block, _ in fake_chain.ranges), 101)
+        self.assertEqual(self.get_executions()[-1], (3, 110, b'\x04' * 32))
+
+        # Reorg of the blocks after the last execution, rewound up to the last block with the same hash
+        fake_chain.fork(115, 125, {118: b'\x05' * 32})
+        fake_chain.ranges.clear()
+        self.safe_store.sync(1, safe_event_indexer, from_block=5)
+        self.assertEqual(min(from_block for from_block, _ in fake_chain.ranges), 111)
+        self.assertEqual(self.safe_store.get_sync_state(1, self.safe_address), (5, 125))
+        self.assertEqual(self.get_executions()[-2:], [(3, 110, b'\x04' * 32), (4, 118, b'\x05' * 32)])
+
+        # Reorg of every stored block is rewound only `reorg_depth` blocks
+        fake_chain.fork(0, 125, {})
+        fake_chain.ranges.clear()
+        self.safe_store.sync(1, safe_event_indexer, from_block=5)
+        self.assertEqual(min(from_block for from_block, _ in fake_chain.ranges), 106)
+        self.assertEqual(self.get_executions()[-1][1], 95)
+
+        # Blocks before the first indexed one are indexed too if requested
+        fake_chain.ranges.clear()
+        self.safe_store.sync(1, safe_event_indexer, from_block=0)
+        self.assertEqual(fake_chain.ranges, [(0, 4)])
+        self.assertEqual(self.safe_store.get_sync_state(1, self.safe_address), (0, 125))
+
+    def test_get_history_from_block(self):
+        fake_chain = FakeChain(self.safe_address, 100, {10: b'\x01' * 32, 50: b'\x02' * 32, 95: b'\x03' * 32},
+                               thresholds={10: 2, 95: 3})
+        context = SafeOperatorContext(self.safe_address, 'http://localhost:8545')
+        context.network = mock.MagicMock(value=1)
+        context.network.name = 'MAINNET'
+        context.safe_tx_service = None
+        context.safe_event_indexer = self.build_safe_event_indexer(fake_chain)
+        for safe_store in (None, self.safe_store):
+            with self.subTest(safe_store=safe_store):
+                context.safe_store = safe_store
+                safe_operator = SafeOperator(self.safe_address, 'http://localhost:8545', context=context)
+                with mock.patch('safe_cli.safe_operator.print_table') as print_table_mock:
+                    self.assertTrue(safe_operator.get_transaction_history(from_block=5))
+                    self.assertTrue(safe_operator.get_transaction_history(from_block=50))
+                rows = print_table_mock.call_args_list[0][0][0]
+                self.assertEqual([row[4] for row in rows], ['0x' + '03' * 32, '0x' + '02' * 32, '0x' + '01' * 32])
+                self.assertEqual([row[6] for row in rows], ['ChangedThreshold: 3', '', 'ChangedThreshold: 2'])
+                # Safe txs executed before `from_block` are not shown, even if they are on the store
+                rows = print_table_mock.call_args_list[1][0][0]
+                self.assertEqual([row[4] for row in rows], ['0x' + '03' * 32, '0x' + '02' * 32])
+
+        self.assertEqual(len(self.safe_store.get_executed_safe_txs(1, self.safe_address, from_block=51)), 1)
+        self.assertEqual(len(self.safe_store.get_events(1, self.safe_address, names=['ChangedThreshold'],
+                                                        from_block=11)), 1)
+
+    def test_service_transactions_sync(self):
+        def build_transaction(nonce: int, executed: bool):
+            return {'safeTxHash': '0x' + f'{nonce:02x}' * 32, 'nonce': nonce, 'to': self.safe_address, 'value': 0,
+                    'transactionHash': '0x' + f'{nonce:02x}' * 32 if executed else None, 'isSuccessful': executed,
+                    'submissionDate': f'2021-07-{nonce + 1:02d}T10:00:00Z'}
+
+        def iter_transaction_pages(safe_address, min_nonce=None, since=None):
+            requested_nonces.append(min_nonce)
+            transactions = [transaction for transaction in service_transactions if transaction['nonce'] >= min_nonce]
+            for i in range(0, len(transactions), 2):
+                yield transactions[i:i + 2]
+
+        def get_nonces(**kwargs):
+            return [transaction['nonce'] for transactions in safe_operator.iter_service_transaction_pages(**kwargs)
+                    for transaction in transactions]
+
+        requested_nonces = []
+        service_transactions = [build_transaction(5, False)] + [build_transaction(nonce, True)
+                                                                for nonce in reversed(range(5))]
+        context = SafeOperatorContext(self.safe_address, 'http://localhost:8545')
+        context.network = mock.MagicMock(value=1)
+        context.safe_store = self.safe_store
+        context.safe_tx_service = mock.MagicMock(parse_date=TransactionService.parse_date)
+        context.safe_tx_service.iter_transaction_pages.side_effect = iter_transaction_pages
+        safe_operator = SafeOperator(self.safe_address, 'http://localhost:8545', context=context)
+        self.assertEqual(get_nonces(), [5, 4, 3, 2, 1, 0])
+        self.assertEqual(self.safe_store.get_service_sync_state(1, self.safe_address), (0, 4))
+
+        # Only transactions after the last executed one are retrieved again
+        service_transactions[0] = build_transaction(5, True)
+        service_transactions.insert(0, build_transaction(6, False))
+        self.assertEqual(get_nonces(), [6, 5, 4, 3, 2, 1, 0])
+        self.assertEqual(self.safe_store.get_service_sync_state(1, self.safe_address), (0, 5))
+        self.assertEqual(get_nonces(min_nonce=3), [6, 5, 4, 3])
+        self.assertEqual(get_nonces(since=datetime(2021, 7, 5, tzinfo=timezone.utc)), [6, 5, 4])
+        self.assertEqual(requested_nonces, [0, 5, 6, 6])
+        self.assertEqual([transaction['isSuccessful']
+                          for transaction in self.safe_store.get_service_transactions(1, self.safe_address)],
+                         [True] * 6 + [False])
+
+        # Transactions not stored are retrieved from the service
+        self.safe_store.start_service_sync(1, self.safe_address, 3)
+        self.assertEqual(self.safe_store.get_service_sync_state(1, self.safe_address), (0, 2))
+        self.safe_store.start_service_sync(1, self.safe_address, 0)
+        self.assertEqual(self.safe_store.get_service_sync_state(1, self.safe_address), (0, -1))
+        with mock.patch('safe_cli.safe_operator.print_table') as print_table_mock:
+            self.assertTrue(safe_operator.get_transaction_history(min_nonce=2))
+        self.assertEqual([row[1:] for row in print_table_mock.call_args[0][0]],
+                         [[self.safe_address, 0, None, '0x' + '06' * 32]]
+                         + [[self.safe_address, 0, '0x' + f'{nonce:02x}' * 32, '0x' + f'{nonce:02x}' * 32]
+                            for nonce in (5, 4, 3, 2)])
+        self.assertEqual(requested_nonces[-1], 2)
+        self.assertEqual(self.safe_store.get_service_sync_state(1, self.safe_address), (2, 5))
+        self.safe_store.start_service_sync(1, self.safe_address, 1)
+        self.assertIsNone(self.safe_store.get_service_sync_state(1, self.safe_address))
+
+    def test_tokens_and_service_transactions(self):
+        token_address = Account.create().address
+        self.safe_store.save_tokens(1, self.safe_address, [TokenBalance(None, 5, 18, 'Ξ', 'ETHER'),
+                                                           TokenBalance(token_address, 3, 6, 'USDC', 'USD Coin')])
+        self.assertEqual(self.safe_store.get_tokens(1, self.safe_address),
+                         {token_address: TokenMetadata(6, 'USDC', 'USD Coin')})
+        self.assertEqual(self.safe_store.get_tokens(1, Account.create().address), {})
+
+        transactions = [{'safeTxHash': '0x' + '01' * 32, 'nonce': 4, 'transactionHash': None},
+                        {'safeTxHash': '0x' + '02' * 32, 'nonce': 3, 'transactionHash': '0x' + '03' * 32}]
+        self.safe_store.save_service_transactions(1, self.safe_address, transactions)
+        self.assertEqual(self.safe_store.get_service_transactions(1, self.safe_address), transactions[::-1])
+        self.assertEqual(self.safe_store.get_service_transactions(1, self.safe_address, queued=True),
+                         transactions[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
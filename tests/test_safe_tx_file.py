@@ -0,0 +1,44 @@
+import json
+import os
+import tempfile
+import unittest
+
+from eth_account import Account
+
+from safe_cli.safe_tx_file import (SafeTxFileException, assign_nonces,
+                                   read_safe_txs_file, write_safe_txs_file)
+
+
+class TestSafeTxFile(unittest.TestCase):
+    def test_safe_tx_file(self):
+        to = Account.create().address
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'txs.json')
+            with open(path, 'w') as safe_txs_file:
+                json.dump([{'to': to.lower(), 'value': '5'}, {'to': to, 'data': '0x12', 'nonce': 10},
+                           {'to': to, 'operation': 1}], safe_txs_file)
+            safe_txs = read_safe_txs_file(path)
+            self.assertEqual(safe_txs[0].to, to)
+            self.assertEqual(safe_txs[0].value, 5)
+            self.assertEqual(safe_txs[1].data, b'\x12')
+            self.assertEqual(safe_txs[2].operation, 1)
+            self.assertEqual([safe_tx.nonce for safe_tx in safe_txs], [None, 10, None])
+            self.assertEqual([safe_tx.nonce for safe_tx in assign_nonces(safe_txs, 4)], [4, 10, 11])
+
+            signed_safe_txs = [safe_tx._replace(signatures=b'\x01' * 65) for safe_tx in assign_nonces(safe_txs, 4)]
+            output_path = os.path.join(directory, 'signed.json')
+            write_safe_txs_file(output_path, signed_safe_txs, [b'\x02' * 32] * 3)
+            self.assertEqual(read_safe_txs_file(output_path), signed_safe_txs)
+            with open(output_path) as output_file:
+                self.assertEqual(json.load(output_file)[0]['safeTxHash'], '0x' + '02' * 32)
+
+            with open(path, 'w') as safe_txs_file:
+                json.dump([{'value': 5}], safe_txs_file)
+            with self.assertRaises(SafeTxFileException):
+                read_safe_txs_file(path)
+            with self.assertRaises(SafeTxFileException):
+                read_safe_txs_file(os.path.join(directory, 'not-existing.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from eth_account import Account
+
+from safe_cli.json_rpc import JsonRpcBatch
+from safe_cli.safe_cli_info import SafeCliInfo
+from safe_cli.safe_operator import NotEnoughSignatures, SafeOperator
+from safe_cli.safe_operator_context import SafeOperatorContext
+from safe_cli.script_runner import (EXIT_COMMAND_FAILED, EXIT_INVALID_COMMAND,
+                                    EXIT_SUCCESS, EXIT_UNEXPECTED_ERROR,
+                                    ScriptRunner)
+from safe_cli.utils import set_non_interactive_answer
+
+
+class TestScriptRunner(unittest.TestCase):
+    def setUp(self):
+        self.safe_operator = mock.MagicMock(spec=SafeOperator)
+        self.address = Account.create().address
+
+    def build_safe_operator(self) -> SafeOperator:
+        """
+        :return: Operator for a Safe with 2 owners, threshold 2 and a module, with the node mocked
+        """
+        owners = [Account.create().address for _ in range(2)]
+        context = SafeOperatorContext(self.address, 'http://localhost:8545')
+        context.safe_cli_info_cache = mock.MagicMock()
+        context.safe_cli_info_cache.get.return_value = SafeCliInfo(
+            self.address, 0, 2, owners, Account.create().address, [Account.create().address], Account.create().address,
+            Account.create().address, 0, '1.3.0'
+        )
+        context.ethereum_client = mock.MagicMock()
+        context.json_rpc_batch = mock.MagicMock(spec=JsonRpcBatch)
+        context.json_rpc_batch.request.return_value = ['0x1', '0x0']  # Balance and nonce
+        context.network = mock.MagicMock(value=4)
+        context.network.name = 'RINKEBY'
+        context.safe_tx_service = None
+        context.safe_store = None
+        context.token_balance_scanner = mock.MagicMock()
+        context.token_balance_scanner.get_balances.return_value = []
+        return SafeOperator(self.address, 'http://localhost:8545', context=context)
+
+    def test_run_command(self):
+        script_runner = ScriptRunner(self.safe_operator)
+        self.assertEqual(script_runner.run_command('get_threshold'), EXIT_SUCCESS)
+        self.safe_operator.get_threshold.assert_called_once_with()
+
+        self.safe_operator.send_ether.return_value = False
+        self.assertEqual(script_runner.run_command(f'send_ether {self.address} 1'), EXIT_COMMAND_FAILED)
+        self.safe_operator.send_ether.side_effect = NotEnoughSignatures(1)  # Handled by `safe_exception`
+        self.assertEqual(script_runner.run_command(f'send_ether {self.address} 1'), EXIT_COMMAND_FAILED)
+        self.safe_operator.send_ether.side_effect = ConnectionError('Node is down')
+        self.assertEqual(script_runner.run_command(f'send_ether {self.address} 1'), EXIT_UNEXPECTED_ERROR)
+
+        self.assertEqual(script_runner.run_command('not_existing_command'), EXIT_INVALID_COMMAND)
+        self.assertEqual(script_runner.run_command('send_ether not-an-address 1'), EXIT_INVALID_COMMAND)
+
+    def test_operator_exit_codes(self):
+        safe_operator = self.build_safe_operator()
+        script_runner = ScriptRunner(safe_operator)
+        module = safe_operator.safe_cli_info.modules[0]
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            for command in ('change_threshold 2',  # Already the threshold
+                            'change_threshold 3',  # More than the owners
+                            f'enable_module {module}',
+                            f'disable_module {self.address}',
+                            'show_cli_owners',
+                            f'unload_cli_owners {self.address}',
+                            'load_cli_owners not-a-key',
+                            'load_cli_owners_from_words not valid words',
+                            f'load_cli_owners_from_keystores {os.path.join(temporary_directory, "missing")}'):
+                with self.subTest(command=command):
+                    self.assertEqual(script_runner.run_command(command), EXIT_COMMAND_FAILED)
+
+        account = Account.create()
+        self.assertEqual(script_runner.run_command(f'load_cli_owners {account.key.hex()} not-a-key'),
+                         EXIT_COMMAND_FAILED)  # Valid keys are loaded anyway
+        self.assertEqual(script_runner.run_command(f'load_cli_owners {account.key.hex()}'), EXIT_SUCCESS)
+        self.assertEqual(script_runner.run_command('show_cli_owners'), EXIT_SUCCESS)
+        self.assertEqual(script_runner.run_command(f'unload_cli_owners {account.address}'), EXIT_SUCCESS)
+        self.assertEqual(script_runner.run_command('balances'), EXIT_SUCCESS)
+
+    def test_password_not_asked(self):
+        script_runner = ScriptRunner(self.build_safe_operator())
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            with open(os.path.join(temporary_directory, 'keystore.json'), 'w') as keystore_file:
+                keystore_file.write('{}')
+            set_non_interactive_answer(True)
+            try:
+                with mock.patch('getpass.getpass') as getpass:
+                    self.assertEqual(script_runner.run_command(f'load_cli_owners_from_keystores {temporary_directory}'),
+                                     EXIT_COMMAND_FAILED)
+                    getpass.assert_not_called()
+            finally:
+                set_non_interactive_answer(None)
+
+    def test_run(self):
+        safe_operator = self.build_safe_operator()
+        script = ['# Comment', '', 'get_nonce', 'change_threshold 2', 'get_owners']
+        with mock.patch.object(SafeOperator, 'get_nonce') as get_nonce, \
+                mock.patch.object(SafeOperator, 'get_owners') as get_owners:
+            self.assertEqual(ScriptRunner(safe_operator).run(script), EXIT_COMMAND_FAILED)
+            get_nonce.assert_called_once_with()
+            get_owners.assert_not_called()  # Script stops on first failure
+
+            self.assertEqual(ScriptRunner(safe_operator, keep_going=True).run(script + ['aloha']),
+                             EXIT_COMMAND_FAILED)
+            get_owners.assert_called_once_with()
+
+            self.assertEqual(ScriptRunner(safe_operator).run(['get_nonce', 'get_owners']), EXIT_SUCCESS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from eth_abi import decode_abi, encode_abi, encode_single
+from eth_account import Account
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+from hexbytes import HexBytes
+
+from safe_cli.json_rpc import JsonRpcBatch, JsonRpcError
+from safe_cli.token_balance_scanner import (MULTICALL3_ADDRESS, TokenBalance,
+                                            TokenBalanceScanner,
+                                            TokenBalanceScannerException,
+                                            TokenMetadata, decode_string,
+                                            read_token_addresses_file)
+
+
+class FakeNode:
+    """
+    Answer `eth_getBalance`, `eth_getCode` and `eth_call` of ERC20 tokens, directly or through Multicall3
+    """
+    def __init__(self, tokens, multicall_deployed: bool):
+        self.tokens = tokens  # Token address to balance, decimals, symbol and name
+        self.multicall_deployed = multicall_deployed
+        self.block_identifiers = set()
+        self.batches = []
+
+    def call_token(self, to: str, data: bytes) -> bytes:
+        if to not in self.tokens:
+            return b''  # Not a contract
+        balance, decimals, symbol, name = self.tokens[to]
+        return {
+            function_signature_to_4byte_selector('balanceOf(address)'): encode_single('uint256', balance),
+            function_signature_to_4byte_selector('decimals()'): encode_single('uint8', decimals),
+            function_signature_to_4byte_selector('symbol()'): encode_single('bytes32', symbol.encode()),
+            function_signature_to_4byte_selector('name()'): encode_single('string', name),
+        }[data[:4]]
+
+    def eth_call(self, to: str, data: bytes) -> bytes:
+        if to != MULTICALL3_ADDRESS:
+            return self.call_token(to, data)
+        (calls,) = decode_abi(['(address,bool,bytes)[]'], data[4:])
+        return encode_abi(['(bool,bytes)[]'], [[(True, self.call_token(to_checksum_address(target), call_data))
+                                                for target, _, call_data in calls]])
+
+    def request(self, requests, raise_exception=True):
+        self.batches.append(requests)
+        results = []
+        for method, params in requests:
+            self.block_identifiers.add(params[-1])
+            if method == 'eth_getBalance':
+                results.append('0x5')
+            elif method == 'eth_getCode':
+                results.append('0x6080' if self.multicall_deployed else '0x')
+            elif params[0]['to'] == MULTICALL3_ADDRESS and not self.multicall_deployed:
+                results.append(JsonRpcError(method, 'Not a contract'))
+            else:
+                results.append('0x' + self.eth_call(params[0]['to'], HexBytes(params[0]['data'])).hex())
+        return results
+
+
+class TestTokenBalanceScanner(unittest.TestCase):
+    def setUp(self):
+        self.safe_address = Account.create().address
+        self.token_addresses = [Account.create().address for _ in range(150)]
+        self.tokens = {token_address: (i, 18 - i % 3, f'TK{i}', f'Token {i}')
+                       for i, token_address in enumerate(self.token_addresses[:100])}  # Rest are not tokens
+        self.ethereum_client = mock.MagicMock()
+        self.ethereum_client.w3.eth.block_number = 10
+
+    def get_balances(self, multicall_deployed: bool, token_metadata=None):
+        fake_node = FakeNode(self.tokens, multicall_deployed)
+        json_rpc_batch = mock.MagicMock(spec=JsonRpcBatch)
+        json_rpc_batch.request.side_effect = fake_node.request
+        token_balance_scanner = TokenBalanceScanner(self.ethereum_client, json_rpc_batch, chunk_size=100)
+        return token_balance_scanner.get_balances(self.safe_address, self.token_addresses,
+                                                  token_metadata=token_metadata), fake_node
+
+    def test_get_balances(self):
+        expected = [TokenBalance(None, 5, 18, 'Ξ', 'ETHER')] + [
+            TokenBalance(token_address, i, 18 - i % 3, f'TK{i}', f'Token {i}')
+            for i, token_address in enumerate(self.token_addresses[1:100], start=1)  # First token has no balance
+        ]
+        token_balances, fake_node = self.get_balances(multicall_deployed=True)
+        self.assertEqual(token_balances, expected)
+        self.assertEqual(fake_node.block_identifiers, {hex(10)})
+        self.assertEqual(len(fake_node.batches), 2)
+        self.assertEqual(len(fake_node.batches[1]), 6)  # 600 calls on chunks of 100
+
+        token_balances, fake_node = self.get_balances(multicall_deployed=False)
+        self.assertEqual(token_balances, expected)
+        self.assertEqual(len(fake_node.batches[1]), 600)
+
+        # Only `balanceOf` is called for tokens with known metadata
+        token_metadata = {token_address: TokenMetadata(*self.tokens[token_address][1:])
+                          for token_address in self.token_addresses[:100]}
+        token_balances, fake_node = self.get_balances(multicall_deployed=False, token_metadata=token_metadata)
+        self.assertEqual(token_balances, expected)
+        self.assertEqual(len(fake_node.batches[1]), 300)
+
+    def test_decode_string(self):
+        self.assertEqual(decode_string(encode_single('string', 'Maker')), 'Maker')
+        self.assertEqual(decode_string(encode_single('bytes32', b'MKR')), 'MKR')
+
+    def test_read_token_addresses_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tokens.txt')
+            with open(path, 'w') as tokens_file:
+                tokens_file.write(f'# Tokens\n{self.token_addresses[0].lower()}\n\n{self.token_addresses[1]}\n'
+                                  f'{self.token_addresses[0]}\n')
+            self.assertEqual(read_token_addresses_file(path), self.token_addresses[:2])
+
+            json_path = os.path.join(directory, 'tokens.json')
+            with open(json_path, 'w') as tokens_file:
+                tokens_file.write(f'["{self.token_addresses[0]}"]')
+            self.assertEqual(read_token_addresses_file(json_path), self.token_addresses[:1])
+
+            with open(path, 'w') as tokens_file:
+                tokens_file.write('aloha\n')
+            with self.assertRaises(TokenBalanceScannerException):
+                read_token_addresses_file(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
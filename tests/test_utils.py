@@ -0,0 +1,33 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pyfiglet
+
+from safe_cli.utils import get_banner
+
+
+class TestUtils(unittest.TestCase):
+    def test_get_banner(self):
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.dict(os.environ, {'SAFE_CLI_CACHE_DIR': cache_dir}):
+            banner = pyfiglet.figlet_format('Safe CLI')
+            self.assertEqual(get_banner('Safe CLI'), banner)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            with mock.patch('pyfiglet.figlet_format') as figlet_format_mock:
+                self.assertEqual(get_banner('Safe CLI'), banner)
+            figlet_format_mock.assert_not_called()  # Read from the cache
+
+    def test_get_banner_unwritable_cache_dir(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            # A file where the cache dir should be, so it cannot be created even running as root
+            not_a_directory = os.path.join(temporary_directory, 'file')
+            open(not_a_directory, 'w').close()
+            cache_dir = os.path.join(not_a_directory, 'safe-cli')
+            with mock.patch.dict(os.environ, {'SAFE_CLI_CACHE_DIR': cache_dir}):
+                self.assertEqual(get_banner('Safe CLI'), pyfiglet.figlet_format('Safe CLI'))
+            self.assertFalse(os.path.exists(cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()